@@ -0,0 +1,222 @@
+"""Cache-Backend in einer lokalen SQLite-Datei, das sich alle Worker teilen.
+
+Die Datei läuft im WAL-Modus: Leser blockieren Schreiber nicht, und jeder
+gunicorn-Worker sieht denselben warmen Cache – ohne Redis oder Memcached.
+
+Einstellungen (``CACHES``)::
+
+    "BACKEND": "cookbook.cache.SQLiteCache",
+    "LOCATION": BASE_DIR / "var" / "cache.sqlite3",
+    "TIMEOUT": 300,
+    "OPTIONS": {"MAX_ENTRIES": 5000, "CULL_FREQUENCY": 3},
+
+Ist ``MAX_ENTRIES`` überschritten, wird der am längsten nicht gelesene Teil
+(``1 / CULL_FREQUENCY``) verworfen (LRU). Ganzzahlen werden unverpackt
+gespeichert, damit ``incr`` eine einzige atomare UPDATE-Anweisung ist.
+"""
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+
+# Lesezugriffe aktualisieren die LRU-Zeit höchstens so oft (Sekunden),
+# damit nicht jedes get() zu einem Schreibzugriff wird
+ACCESS_RESOLUTION = 10
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS cache (
+    key TEXT PRIMARY KEY,
+    value BLOB NOT NULL,
+    expires REAL,
+    accessed REAL NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS cache_accessed ON cache (accessed);
+CREATE INDEX IF NOT EXISTS cache_expires ON cache (expires);
+"""
+
+
+class SQLiteCache(BaseCache):
+    def __init__(self, location, params):
+        super().__init__(params)
+        self.path = Path(location)
+        self._local = threading.local()
+
+    # --- Verbindung ---------------------------------------------------------
+
+    @property
+    def _db(self):
+        # je Thread und Prozess eine eigene Verbindung (nach fork neu öffnen)
+        db = getattr(self._local, "db", None)
+        if db is None or self._local.pid != os.getpid():
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            db = sqlite3.connect(self.path, timeout=30, isolation_level=None, check_same_thread=False)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.executescript(SCHEMA)
+            self._local.db, self._local.pid = db, os.getpid()
+        return db
+
+    def close(self, **kwargs):
+        # die Verbindung bleibt über Requests hinweg offen
+        pass
+
+    # --- Kodierung ----------------------------------------------------------
+
+    @staticmethod
+    def _encode(value):
+        # bool ist auch ein int, soll aber als bool zurückkommen
+        if type(value) is int and -2**63 <= value < 2**63:
+            return value
+        return pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+
+    @staticmethod
+    def _decode(value):
+        return pickle.loads(value) if isinstance(value, bytes) else value
+
+    def _expires(self, timeout):
+        return self.get_backend_timeout(timeout)
+
+    # --- Lesen --------------------------------------------------------------
+
+    def get(self, key, default=None, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        return self._get_many([key]).get(key, default)
+
+    def get_many(self, keys, version=None):
+        keys = {self.make_and_validate_key(key, version=version): key for key in keys}
+        found = self._get_many(list(keys))
+        return {keys[key]: value for key, value in found.items()}
+
+    def _get_many(self, keys):
+        if not keys:
+            return {}
+        now = time.time()
+        placeholders = ",".join("?" * len(keys))
+        rows = self._db.execute(
+            f"SELECT key, value, accessed FROM cache "
+            f"WHERE key IN ({placeholders}) AND (expires IS NULL OR expires > ?)",
+            [*keys, now],
+        ).fetchall()
+        stale = [key for key, value, accessed in rows if accessed < now - ACCESS_RESOLUTION]
+        if stale:
+            self._db.executemany("UPDATE cache SET accessed = ? WHERE key = ?", [(now, key) for key in stale])
+        return {key: self._decode(value) for key, value, accessed in rows}
+
+    def has_key(self, key, version=None):
+        return self._has_key(self.make_and_validate_key(key, version=version))
+
+    def _has_key(self, key):
+        row = self._db.execute(
+            "SELECT 1 FROM cache WHERE key = ? AND (expires IS NULL OR expires > ?)", (key, time.time())
+        ).fetchone()
+        return row is not None
+
+    # --- Schreiben ----------------------------------------------------------
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        self._set_many({key: value}, timeout)
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        data = {self.make_and_validate_key(key, version=version): value for key, value in data.items()}
+        self._set_many(data, timeout)
+        return []
+
+    def _set_many(self, data, timeout):
+        if not data:
+            return
+        now = time.time()
+        expires = self._expires(timeout)
+        rows = [(key, self._encode(value), expires, now) for key, value in data.items()]
+        db = self._db
+        with _transaction(db):
+            db.executemany("INSERT OR REPLACE INTO cache (key, value, expires, accessed) VALUES (?, ?, ?, ?)", rows)
+            self._cull(db, now)
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        now = time.time()
+        db = self._db
+        with _transaction(db):
+            cursor = db.execute(
+                "INSERT INTO cache (key, value, expires, accessed) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (key) DO UPDATE SET value = excluded.value, expires = excluded.expires, "
+                "accessed = excluded.accessed WHERE cache.expires IS NOT NULL AND cache.expires <= ?",
+                (key, self._encode(value), self._expires(timeout), now, now),
+            )
+            added = cursor.rowcount > 0
+            if added:
+                self._cull(db, now)
+        return added
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        now = time.time()
+        cursor = self._db.execute(
+            "UPDATE cache SET expires = ?, accessed = ? WHERE key = ? AND (expires IS NULL OR expires > ?)",
+            (self._expires(timeout), now, key, now),
+        )
+        return cursor.rowcount > 0
+
+    def incr(self, key, delta=1, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        now = time.time()
+        # eine einzige Anweisung: atomar auch zwischen mehreren Prozessen
+        row = self._db.execute(
+            "UPDATE cache SET value = value + ?, accessed = ? "
+            "WHERE key = ? AND typeof(value) = 'integer' AND (expires IS NULL OR expires > ?) "
+            "RETURNING value",
+            (delta, now, key, now),
+        ).fetchone()
+        if row is None:
+            if self._has_key(key):
+                raise TypeError(f"Der Wert für {key!r} ist keine Ganzzahl.")
+            raise ValueError(f"Schlüssel {key!r} nicht gefunden.")
+        return row[0]
+
+    def delete(self, key, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        return self._delete_many([key]) > 0
+
+    def delete_many(self, keys, version=None):
+        self._delete_many([self.make_and_validate_key(key, version=version) for key in keys])
+
+    def _delete_many(self, keys):
+        if not keys:
+            return 0
+        placeholders = ",".join("?" * len(keys))
+        return self._db.execute(f"DELETE FROM cache WHERE key IN ({placeholders})", keys).rowcount
+
+    def clear(self):
+        self._db.execute("DELETE FROM cache")
+
+    # --- Aufräumen ----------------------------------------------------------
+
+    def _cull(self, db, now):
+        db.execute("DELETE FROM cache WHERE expires IS NOT NULL AND expires <= ?", (now,))
+        (count,) = db.execute("SELECT COUNT(*) FROM cache").fetchone()
+        if count <= self._max_entries:
+            return
+        # die am längsten nicht gelesenen Einträge verwerfen
+        remove = count // self._cull_frequency if self._cull_frequency else count
+        db.execute(
+            "DELETE FROM cache WHERE key IN (SELECT key FROM cache ORDER BY accessed LIMIT ?)",
+            (max(remove, count - self._max_entries),),
+        )
+
+
+class _transaction:
+    """Schreibtransaktion, die die Datei sofort sperrt (kein Upgrade-Deadlock)."""
+
+    def __init__(self, db):
+        self.db = db
+
+    def __enter__(self):
+        self.db.execute("BEGIN IMMEDIATE")
+
+    def __exit__(self, exc_type, exc, tb):
+        self.db.execute("ROLLBACK" if exc_type else "COMMIT")
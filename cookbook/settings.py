@@ -49,6 +49,8 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    # komprimiert alles, was die folgenden Middlewares liefern (cookbook/middleware.py)
+    'cookbook.middleware.CompressionMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -89,6 +91,30 @@ DATABASES = {
 }
 
 
+# Cache
+# Eine gemeinsame SQLite-Datei für alle Worker, eine weitere für die Sessions
+# (nur dort, die Datenbank wird pro Anfrage nicht beschrieben; geht die Datei
+# verloren oder wird eine Session verdrängt, muss man sich neu anmelden –
+# MAX_ENTRIES ist deshalb großzügig bemessen)
+
+CACHES = {
+    'default': {
+        'BACKEND': 'cookbook.cache.SQLiteCache',
+        'LOCATION': BASE_DIR / 'var' / 'cache.sqlite3',
+        'OPTIONS': {'MAX_ENTRIES': 5000},
+    },
+    'sessions': {
+        'BACKEND': 'cookbook.cache.SQLiteCache',
+        'LOCATION': BASE_DIR / 'var' / 'sessions.sqlite3',
+        'TIMEOUT': 60 * 60 * 24 * 14,
+        'OPTIONS': {'MAX_ENTRIES': 100000},
+    },
+}
+
+SESSION_ENGINE = 'django.contrib.sessions.backends.cache'
+SESSION_CACHE_ALIAS = 'sessions'
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
 
@@ -124,11 +150,47 @@ USE_TZ = True
 # https://docs.djangoproject.com/en/5.0/howto/static-files/
 
 STATIC_URL = '/static/'
+STATIC_ROOT = BASE_DIR / 'staticfiles'
+
+# collectstatic: Dateinamen mit Hash, .gz/.br daneben, Bildvarianten (cookbook/storage.py)
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': 'cookbook.storage.CompressedManifestStaticFilesStorage',
+    },
+}
+
+# Django liefert STATIC_ROOT selbst aus (ohne nginx davor), siehe cookbook/static.py
+SERVE_STATIC = True
+
+# Hintergrund-Jobs (python manage.py runworker)
+JOB_WORKERS = 2
+JOB_POLL_INTERVAL = 2.0
+
+# Fehlen Dateien aus python manage.py vendor_assets, Bootstrap & Co. vom CDN
+# laden (sonst bleibt es bei den lokalen URLs, siehe recipes/assets.py).
+# Nur zum Ausprobieren ohne vendor_assets einschalten.
+VENDOR_CDN_FALLBACK = False
+
+# Ziel für python manage.py backup / restore
+BACKUP_ROOT = BASE_DIR / 'backups'
+
+# geteilte Index-Snapshots der Worker (z. B. Filter-Index der Übersicht)
+SNAPSHOT_DIR = BASE_DIR / 'var' / 'snapshots'
+
+# Statische Seiten für anonyme Besucher (python manage.py publish, siehe
+# recipes/publish.py); None = aus
+PUBLISH_ROOT = None  # z. B. BASE_DIR / 'var' / 'publish'
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.0/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# Tests mit eigenem Cache und eigenen Snapshots (nicht die Dateien in var/)
+TEST_RUNNER = 'cookbook.testing.TestRunner'
+
 
 
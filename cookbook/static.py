@@ -0,0 +1,66 @@
+"""Auslieferung von STATIC_ROOT durch Django, falls kein nginx davor steht.
+
+Gehashte Dateien (``style.3f2a….css``) bekommen ``Cache-Control: immutable``
+mit einem Jahr Laufzeit; vorkomprimierte Varianten (``.br``, ``.gz``) werden
+je nach ``Accept-Encoding`` direkt ausgeliefert.
+
+Mit nginx entspricht das::
+
+    location /static/ {
+        alias /srv/rezepte/staticfiles/;
+        gzip_static on;
+        brotli_static on;
+        add_header Cache-Control "public, max-age=31536000, immutable";
+    }
+"""
+import mimetypes
+import re
+from pathlib import Path
+
+from django.conf import settings
+from django.http import FileResponse, Http404, HttpResponseNotModified
+from django.utils._os import safe_join
+from django.utils.cache import patch_vary_headers
+from django.utils.http import http_date
+from django.views.static import was_modified_since
+
+from .middleware import accepted_encodings
+
+# Name mit Inhalts-Hash aus ManifestStaticFilesStorage: name.<12 Hex-Zeichen>.ext
+HASHED_NAME = re.compile(r"\.[0-9a-f]{12}\.[^./]+$")
+IMMUTABLE = "public, max-age=31536000, immutable"
+SHORT = "public, max-age=3600"
+
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+
+
+def serve(request, path):
+    root = Path(settings.STATIC_ROOT)
+    try:
+        fullpath = Path(safe_join(root, path))
+    except Exception:
+        raise Http404("Ungültiger Pfad")
+    if not fullpath.is_file():
+        raise Http404("Datei nicht gefunden")
+
+    content_type, _ = mimetypes.guess_type(str(fullpath))
+    accepted = accepted_encodings(request.headers.get("Accept-Encoding", ""))
+    chosen, encoding = fullpath, None
+    for name, suffix in ENCODINGS:
+        candidate = fullpath.with_name(fullpath.name + suffix)
+        if name in accepted and candidate.is_file():
+            chosen, encoding = candidate, name
+            break
+
+    stat = chosen.stat()
+    if not was_modified_since(request.headers.get("If-Modified-Since"), stat.st_mtime):
+        response = HttpResponseNotModified()
+    else:
+        response = FileResponse(chosen.open("rb"), content_type=content_type or "application/octet-stream")
+        response["Content-Length"] = stat.st_size
+        if encoding:
+            response["Content-Encoding"] = encoding
+    response["Last-Modified"] = http_date(stat.st_mtime)
+    response["Cache-Control"] = IMMUTABLE if HASHED_NAME.search(path) else SHORT
+    patch_vary_headers(response, ["Accept-Encoding"])
+    return response
@@ -0,0 +1,59 @@
+"""Storage für collectstatic: Dateinamen mit Hash, vorkomprimiert.
+
+* ``ManifestStaticFilesStorage`` hängt den Inhalts-Hash an jeden Dateinamen
+  (``style.3f2a….css``), die Dateien können also unbegrenzt gecacht werden.
+* Zu jeder Text-Datei entstehen ``.gz`` und – falls das Paket ``brotli``
+  installiert ist – ``.br`` (für nginx ``gzip_static``/``brotli_static``
+  bzw. ``cookbook.static.serve``).
+"""
+import gzip
+from pathlib import PurePosixPath
+
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.files.base import ContentFile
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESS_EXTENSIONS = {".css", ".js", ".svg", ".json", ".txt", ".html", ".map", ".xml", ".ico", ".ttf", ".eot"}
+# Komprimierte Variante nur behalten, wenn sie wirklich kleiner ist
+MIN_SAVING = 0.95
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    def stored_name(self, name):
+        try:
+            return super().stored_name(name)
+        except ValueError:
+            # noch kein collectstatic gelaufen (Entwicklung, Tests): ungehashter Name
+            return name
+
+    def post_process(self, paths, dry_run=False, **options):
+        if dry_run:
+            yield from super().post_process(paths, dry_run=dry_run, **options)
+            return
+
+        hashed = set()
+        for original, processed, done in super().post_process(paths, dry_run=dry_run, **options):
+            if processed and not isinstance(processed, Exception):
+                hashed.add(processed)
+            yield original, processed, done
+
+        for name in sorted(hashed | set(paths)):
+            if PurePosixPath(name).suffix.lower() in COMPRESS_EXTENSIONS:
+                self._compress(name)
+
+    def _compress(self, name):
+        with self.open(name) as handle:
+            data = handle.read()
+        variants = {".gz": gzip.compress(data, compresslevel=9, mtime=0)}
+        if brotli is not None:
+            variants[".br"] = brotli.compress(data, quality=11)
+        for suffix, compressed in variants.items():
+            target = name + suffix
+            if self.exists(target):
+                self.delete(target)
+            if len(compressed) < len(data) * MIN_SAVING:
+                self._save(target, ContentFile(compressed))
@@ -0,0 +1,33 @@
+"""Test-Runner, der die Dateien unter ``var/`` nicht anfasst.
+
+Cache und Sessions (``cookbook.cache.SQLiteCache``) sowie die
+Index-Snapshots (``SNAPSHOT_DIR``) liegen während der Tests in einem
+temporären Verzeichnis – ``cache.clear()`` in einem Test leert also nicht
+den Cache der laufenden Installation.
+"""
+import tempfile
+from pathlib import Path
+
+from django.conf import settings
+from django.test import override_settings
+from django.test.runner import DiscoverRunner
+
+SQLITE_CACHE = "cookbook.cache.SQLiteCache"
+
+
+class TestRunner(DiscoverRunner):
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self._tmp = tempfile.TemporaryDirectory(prefix="cookbook-tests-")
+        tmp = Path(self._tmp.name)
+        caches = {
+            alias: {**config, "LOCATION": tmp / f"{alias}.sqlite3"} if config["BACKEND"] == SQLITE_CACHE else config
+            for alias, config in settings.CACHES.items()
+        }
+        self._settings = override_settings(CACHES=caches, SNAPSHOT_DIR=tmp / "snapshots")
+        self._settings.enable()
+
+    def teardown_test_environment(self, **kwargs):
+        self._settings.disable()
+        self._tmp.cleanup()
+        super().teardown_test_environment(**kwargs)
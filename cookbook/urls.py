@@ -14,12 +14,16 @@ Including another URLconf
     1. Import the include() function: from django.urls import include, path
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
+import re
+
 from django.conf import settings
 from django.conf.urls.static import static
 from django.contrib import admin
-from django.urls import path, include
+from django.urls import path, include, re_path
 from django.views.generic import RedirectView
 
+from cookbook import static as cookbook_static
+
 urlpatterns = [
     path('recipes/', include("recipes.urls")),
     path('admin/', admin.site.urls),
@@ -30,4 +34,10 @@ urlpatterns = [
 
 
 if settings.DEBUG:
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
\ No newline at end of file
+    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+
+# gehashte, vorkomprimierte Dateien aus collectstatic (runserver nutzt im DEBUG die Finder)
+if getattr(settings, "SERVE_STATIC", False) and not settings.DEBUG:
+    urlpatterns += [
+        re_path(rf"^{re.escape(settings.STATIC_URL.lstrip('/'))}(?P<path>.*)$", cookbook_static.serve),
+    ]
\ No newline at end of file
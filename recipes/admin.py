@@ -1,27 +1,124 @@
-from django.contrib import admin
+from django import forms
+from django.contrib import admin, messages
+from django.contrib.admin.helpers import ActionForm
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.db.models import Count
+from django.utils import timezone
+from django.utils.functional import cached_property
 from django.utils.html import format_html
-from .models import Recipe, Label
+from . import facets, publish, suggest
+from .models import Job, Recipe, Label
+from .search import search_recipes
+
+# Obergrenze fürs Zählen gefilterter Listen; darüber wird "10000+" angenommen
+APPROXIMATE_COUNT_LIMIT = 10000
+UNFILTERED_COUNT_TIMEOUT = 300
+
+
+class ApproximateCountPaginator(Paginator):
+    """Vermeidet volle COUNT(*)-Abfragen auf großen Tabellen.
+
+    Ungefilterte Listen verwenden eine für einige Minuten gecachte Anzahl,
+    gefilterte Listen zählen höchstens bis ``APPROXIMATE_COUNT_LIMIT``.
+    """
+
+    @cached_property
+    def count(self):
+        query = self.object_list.query
+        if not query.where:
+            key = f"admin-count:{query.model._meta.db_table}"
+            count = cache.get(key)
+            if count is None:
+                count = self.object_list.count()
+                cache.set(key, count, UNFILTERED_COUNT_TIMEOUT)
+            return count
+        return self.object_list[:APPROXIMATE_COUNT_LIMIT].count()
+
+
+class LabelActionForm(ActionForm):
+    label = forms.ModelChoiceField(queryset=Label.objects.all(), required=False, label="Label")
+
 
 @admin.register(Recipe)
 class RecipeAdmin(admin.ModelAdmin):
-    list_display = ("title", "duration_minutes", "temperature_celsius")
-    search_fields = ("title",)
+    list_display = ("thumbnail", "title", "duration_minutes", "working_time", "cooked_count", "temperature_celsius")
+    list_display_links = ("thumbnail", "title")
+    search_fields = ("title", "ingredients")
     prepopulated_fields = {"slug": ("title",)}
     filter_horizontal = ("labels",)
     readonly_fields = ("image_preview",)
+    paginator = ApproximateCountPaginator
+    show_full_result_count = False
+    action_form = LabelActionForm
+    actions = ("add_label", "remove_label", "reset_cooked_count")
+
+    def thumbnail(self, obj):
+        if obj.image:
+            return format_html('<img src="{}" width="48" height="48" style="object-fit: cover;" loading="lazy" />', obj.thumb_url)
+        return ""
+    thumbnail.short_description = "Bild"
 
     def image_preview(self, obj):
         if obj.image:
-            return format_html('<img src="{}" width="100" />', obj.image.url)
+            return format_html('<img src="{}" width="100" />', obj.thumb_url)
         return ""
     image_preview.short_description = "Vorschau"
 
+    def get_search_results(self, request, queryset, search_term):
+        # FTS-Index statt LIKE über Titel und Zutaten
+        return search_recipes(queryset, search_term), False
+
+    @admin.action(description="Label zu ausgewählten Rezepten hinzufügen")
+    def add_label(self, request, queryset):
+        label = self._selected_label(request)
+        if label is None:
+            return
+        Through = Recipe.labels.through
+        # ein einziges INSERT für alle Rezepte
+        Through.objects.bulk_create(
+            [Through(recipe_id=recipe_id, label_id=label.id) for recipe_id in queryset.values_list("id", flat=True)],
+            ignore_conflicts=True,
+        )
+        updated = queryset.update(updated_at=timezone.now())
+        # Massenänderungen an der Zwischentabelle lösen keine Signale aus
+        facets.invalidate()
+        suggest.invalidate()
+        publish.schedule(queryset.values_list("id", flat=True))
+        self.message_user(request, f"Label „{label}“ bei {updated} Rezepten gesetzt.")
+
+    @admin.action(description="Label von ausgewählten Rezepten entfernen")
+    def remove_label(self, request, queryset):
+        label = self._selected_label(request)
+        if label is None:
+            return
+        Recipe.labels.through.objects.filter(recipe__in=queryset, label=label).delete()
+        updated = queryset.update(updated_at=timezone.now())
+        # Massenänderungen an der Zwischentabelle lösen keine Signale aus
+        facets.invalidate()
+        suggest.invalidate()
+        publish.schedule(queryset.values_list("id", flat=True))
+        self.message_user(request, f"Label „{label}“ bei {updated} Rezepten entfernt.")
+
+    @admin.action(description="Koch-Zähler zurücksetzen")
+    def reset_cooked_count(self, request, queryset):
+        updated = queryset.update(cooked_count=0, updated_at=timezone.now())
+        publish.schedule(queryset.values_list("id", flat=True))
+        self.message_user(request, f"Koch-Zähler bei {updated} Rezepten zurückgesetzt.")
+
+    def _selected_label(self, request):
+        label_id = request.POST.get("label")
+        label = Label.objects.filter(pk=label_id).first() if label_id else None
+        if label is None:
+            self.message_user(request, "Bitte zuerst ein Label auswählen.", level=messages.WARNING)
+        return label
+
     fieldsets = (
         (None, {
             "fields": ("title", "slug", "image", "image_preview")
         }),
         ("Back-/Kochinformationen", {
-            "fields": ("duration_minutes", "temperature_celsius")
+            "fields": ("duration_minutes", "working_time", "temperature_celsius", "cooked_count")
         }),
         ("Labels", {
             "fields": ("labels",)
@@ -36,6 +133,24 @@ class RecipeAdmin(admin.ModelAdmin):
 
 @admin.register(Label)
 class LabelAdmin(admin.ModelAdmin):
-    list_display = ("name", "label_type")
+    list_display = ("name", "label_type", "recipe_count")
     list_filter = ("label_type",)
-    search_fields = ("name",)
\ No newline at end of file
+    search_fields = ("name",)
+    paginator = ApproximateCountPaginator
+    show_full_result_count = False
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(recipe_count=Count("recipe"))
+
+    @admin.display(description="Rezepte", ordering="recipe_count")
+    def recipe_count(self, obj):
+        return obj.recipe_count
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ("id", "name", "status", "attempts", "run_after", "updated_at")
+    list_filter = ("status", "name")
+    search_fields = ("dedupe_key",)
+    readonly_fields = ("created_at", "updated_at")
+    paginator = ApproximateCountPaginator
+    show_full_result_count = False
@@ -0,0 +1,270 @@
+"""Schreibgeschützte JSON-API für Rezepte, Labels und den Wochenplan.
+
+* ``?fields=title,slug,image_thumb`` wählt die gewünschten Felder aus
+* Listen werden über ``?cursor=`` / ``?limit=`` seitenweise geliefert
+* Antworten tragen ein starkes ETag, ``If-None-Match`` liefert 304
+* ``api/export/`` streamt alle (gefilterten) Rezepte als JSON-Array
+* ``api/suggest/?q=`` liefert Vorschläge für das Suchfeld (``recipes.suggest``)
+* ``api/recipes/<slug>/cook/`` und ``api/cook/offline/`` versorgen den
+  Kochmodus offline (``recipes.cook``, ``recipes/sw.js``)
+"""
+import base64
+import hashlib
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Count
+from django.http import HttpResponse, HttpResponseNotModified, JsonResponse
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.views.decorators.http import require_GET
+
+from . import cook
+from . import suggest as suggest_index
+from .models import Label, Recipe, WeeklyPlan, split_lines
+from .streaming import streaming_response
+from .views import DAYS, filter_recipes, requested_week
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 200
+
+
+def _image(recipe, request, name=None):
+    if not recipe.image:
+        return None
+    url = recipe.image_url_for(name) if name else recipe.image.url
+    return request.build_absolute_uri(url)
+
+
+# Feldname → (benötigte Spalten, Wertfunktion)
+RECIPE_FIELDS = {
+    "id": (["id"], lambda r, request: r.id),
+    "slug": (["slug"], lambda r, request: r.slug),
+    "title": (["title"], lambda r, request: r.title),
+    "url": (["slug"], lambda r, request: request.build_absolute_uri(r.get_absolute_url())),
+    "servings": (["servings"], lambda r, request: r.servings),
+    "image": (["image"], lambda r, request: _image(r, request)),
+    "image_thumb": (["image", "renditions"], lambda r, request: _image(r, request, "thumb")),
+    "labels": ([], lambda r, request: [
+        {"id": label.id, "name": label.name, "label_type": label.label_type}
+        for label in r.labels.all()
+    ]),
+    "duration_minutes": (["duration_minutes"], lambda r, request: r.duration_minutes),
+    "working_time": (["working_time"], lambda r, request: r.working_time),
+    "temperature_celsius": (["temperature_celsius"], lambda r, request: r.temperature_celsius),
+    "ingredients": (["ingredients"], lambda r, request: split_lines(r.ingredients)),
+    "steps": (["steps"], lambda r, request: split_lines(r.steps)),
+    "cooked_count": (["cooked_count"], lambda r, request: r.cooked_count),
+    "external_link": (["external_link"], lambda r, request: r.external_link),
+    "updated_at": (["updated_at"], lambda r, request: r.updated_at),
+}
+
+LIST_DEFAULT_FIELDS = ["id", "slug", "title", "url", "image_thumb", "duration_minutes", "working_time", "cooked_count"]
+
+
+class FieldError(ValueError):
+    pass
+
+
+def _selected_fields(request, default):
+    raw = request.GET.get("fields")
+    if not raw:
+        return list(default)
+    fields = [name.strip() for name in raw.split(",") if name.strip()]
+    unknown = [name for name in fields if name not in RECIPE_FIELDS]
+    if unknown:
+        raise FieldError(f"Unbekannte Felder: {', '.join(unknown)}")
+    return fields
+
+
+def _recipe_queryset(fields):
+    columns = {"id"}
+    for name in fields:
+        columns.update(RECIPE_FIELDS[name][0])
+    qs = Recipe.objects.only(*columns)
+    if "labels" in fields:
+        qs = qs.prefetch_related("labels")
+    return qs
+
+
+def _serialize_recipe(recipe, fields, request):
+    return {name: RECIPE_FIELDS[name][1](recipe, request) for name in fields}
+
+
+def _dumps(payload):
+    return json.dumps(payload, cls=DjangoJSONEncoder, ensure_ascii=False, separators=(",", ":"))
+
+
+def _not_modified(request, etag):
+    # schwacher Vergleich: die Komprimierung (cookbook.middleware) macht aus "…" ein W/"…"
+    if_none_match = request.headers.get("If-None-Match", "")
+    tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return etag in tags or if_none_match.strip() == "*"
+
+
+def _json_with_etag(request, payload):
+    body = _dumps(payload).encode()
+    etag = '"%s"' % hashlib.sha256(body).hexdigest()[:32]
+
+    if _not_modified(request, etag):
+        response = HttpResponseNotModified()
+    else:
+        response = HttpResponse(body, content_type="application/json")
+    response["ETag"] = etag
+    return response
+
+
+def _error(message, status=400):
+    return JsonResponse({"error": message}, status=status)
+
+
+def _encode_cursor(last_id):
+    return base64.urlsafe_b64encode(str(last_id).encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor):
+    padded = cursor + "=" * (-len(cursor) % 4)
+    return int(base64.urlsafe_b64decode(padded.encode()).decode())
+
+
+@require_GET
+def recipe_list(request):
+    try:
+        fields = _selected_fields(request, LIST_DEFAULT_FIELDS)
+    except FieldError as exc:
+        return _error(str(exc))
+
+    try:
+        limit = min(max(int(request.GET.get("limit", DEFAULT_LIMIT)), 1), MAX_LIMIT)
+    except ValueError:
+        return _error("Ungültiges limit")
+
+    qs = filter_recipes(_recipe_queryset(fields), request.GET, user=request.user).order_by("id")
+
+    cursor = request.GET.get("cursor")
+    if cursor:
+        try:
+            qs = qs.filter(id__gt=_decode_cursor(cursor))
+        except (ValueError, UnicodeDecodeError):
+            return _error("Ungültiger cursor")
+
+    # ein Element mehr holen, um zu wissen, ob es eine nächste Seite gibt
+    recipes = list(qs[:limit + 1])
+    next_url = None
+    if len(recipes) > limit:
+        recipes = recipes[:limit]
+        params = request.GET.copy()
+        params["cursor"] = _encode_cursor(recipes[-1].id)
+        next_url = request.build_absolute_uri(f"{request.path}?{params.urlencode()}")
+
+    return _json_with_etag(request, {
+        "results": [_serialize_recipe(recipe, fields, request) for recipe in recipes],
+        "next": next_url,
+    })
+
+
+@require_GET
+def recipe_detail(request, slug):
+    try:
+        fields = _selected_fields(request, RECIPE_FIELDS)
+    except FieldError as exc:
+        return _error(str(exc))
+
+    recipe = get_object_or_404(_recipe_queryset(fields), slug=slug)
+    return _json_with_etag(request, _serialize_recipe(recipe, fields, request))
+
+
+@require_GET
+def recipe_export(request):
+    """Streamt alle (gefilterten) Rezepte, ohne die ganze Antwort im Speicher aufzubauen."""
+    try:
+        fields = _selected_fields(request, RECIPE_FIELDS)
+    except FieldError as exc:
+        return _error(str(exc))
+
+    qs = filter_recipes(_recipe_queryset(fields), request.GET, user=request.user).order_by("id")
+
+    def rows():
+        yield "["
+        for index, recipe in enumerate(qs.iterator(chunk_size=500)):
+            yield ("," if index else "") + _dumps(_serialize_recipe(recipe, fields, request))
+        yield "]"
+
+    return streaming_response(request, rows(), content_type="application/json")
+
+
+@require_GET
+def label_list(request):
+    labels = Label.objects.annotate(recipe_count=Count("recipe")).order_by("label_type", "name")
+    return _json_with_etag(request, {
+        "results": [
+            {
+                "id": label.id,
+                "name": label.name,
+                "label_type": label.label_type,
+                "recipe_count": label.recipe_count,
+            }
+            for label in labels
+        ],
+    })
+
+
+@require_GET
+def suggest(request):
+    try:
+        limit = min(max(int(request.GET.get("limit", suggest_index.DEFAULT_LIMIT)), 1), suggest_index.MAX_LIMIT)
+    except ValueError:
+        return _error("limit muss eine Zahl sein")
+    query = request.GET.get("q", "")
+    return JsonResponse({"query": query, "results": suggest_index.suggestions(query, limit)})
+
+
+@require_GET
+def weekly_plan(request):
+    if not request.user.is_authenticated:
+        return _error("Anmeldung erforderlich", status=401)
+
+    week_start = requested_week(request.GET)
+    plan = WeeklyPlan.objects.filter(user=request.user, week_start=week_start).first()
+    entries = plan.entries.select_related("recipe") if plan else []
+
+    days = {day: [] for day in DAYS}
+    for entry in entries:
+        days.setdefault(entry.day, []).append({
+            "id": entry.id,
+            "comment": entry.comment,
+            "recipe": {
+                "id": entry.recipe.id,
+                "slug": entry.recipe.slug,
+                "title": entry.recipe.title,
+                "url": request.build_absolute_uri(reverse("recipes:api_recipe_detail", args=[entry.recipe.slug])),
+            },
+        })
+
+    return _json_with_etag(request, {
+        "week_start": week_start,
+        "days": [{"day": day, "entries": items} for day, items in days.items()],
+    })
+
+
+@require_GET
+def cook_bundle(request, slug):
+    """Bundle für den Kochmodus; das ETag folgt der Rezeptversion, ohne das Bundle zu bauen."""
+    recipe = get_object_or_404(Recipe.objects.only(*cook.BUNDLE_FIELDS), slug=slug)
+    etag = '"%s"' % cook.version(recipe)
+    if _not_modified(request, etag):
+        response = HttpResponseNotModified()
+    else:
+        response = HttpResponse(_dumps(cook.bundle(recipe)), content_type="application/json")
+    response["ETag"] = etag
+    # immer nachfragen: der Service Worker hält die Kopie für offline
+    response["Cache-Control"] = "no-cache"
+    return response
+
+
+@require_GET
+def cook_offline(request):
+    """Bundles, Kochseiten und Bilder des aktuellen Wochenplans für den Service Worker."""
+    if not request.user.is_authenticated:
+        return _error("Anmeldung erforderlich", status=401)
+    return _json_with_etag(request, {"recipes": cook.offline_entries(request.user)})
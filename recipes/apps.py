@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class RecipesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'recipes'
+
+    def ready(self):
+        # registriert die Hintergrund-Jobs, Signal-Handler und Systemprüfungen
+        from . import checks, signals, tasks  # noqa: F401
@@ -0,0 +1,53 @@
+"""Fremdbibliotheken (Bootstrap, Icons, Tom Select) als lokale Kopie.
+
+``python manage.py vendor_assets`` lädt die hier festgelegten Versionen nach
+``recipes/static/vendor/``; danach laufen die Seiten ohne Internetzugang
+(Küchen-WLAN). Fehlt eine Datei, meldet das die Systemprüfung
+(``recipes.checks``). Nur mit ``VENDOR_CDN_FALLBACK`` (Standard: aus)
+verweist ``{% vendor_static %}`` dann auf das CDN, sonst bleibt es bei der
+lokalen URL – die fehlende Datei fällt also auf, statt still vom CDN zu kommen.
+"""
+from functools import lru_cache
+from pathlib import Path
+
+from django.conf import settings
+from django.templatetags.static import static
+
+CDN = "https://cdn.jsdelivr.net/npm/"
+VENDOR_DIR = Path(__file__).resolve().parent / "static" / "vendor"
+
+# Pfad unter static/vendor/ → Quelle auf dem CDN (Versionen fest)
+VENDOR_ASSETS = {
+    "bootstrap/bootstrap.min.css": "bootstrap@5.3.3/dist/css/bootstrap.min.css",
+    "bootstrap/bootstrap.bundle.min.js": "bootstrap@5.3.3/dist/js/bootstrap.bundle.min.js",
+    "bootstrap-icons/bootstrap-icons.min.css": "bootstrap-icons@1.11.3/font/bootstrap-icons.min.css",
+    "bootstrap-icons/fonts/bootstrap-icons.woff2": "bootstrap-icons@1.11.3/font/fonts/bootstrap-icons.woff2",
+    "bootstrap-icons/fonts/bootstrap-icons.woff": "bootstrap-icons@1.11.3/font/fonts/bootstrap-icons.woff",
+    "tom-select/tom-select.bootstrap5.min.css": "tom-select@2.2.2/dist/css/tom-select.bootstrap5.min.css",
+    "tom-select/tom-select.complete.min.js": "tom-select@2.2.2/dist/js/tom-select.complete.min.js",
+}
+
+
+def cdn_url(name):
+    return CDN + VENDOR_ASSETS[name]
+
+
+@lru_cache(maxsize=None)
+def is_vendored(name):
+    return (VENDOR_DIR / name).exists()
+
+
+def missing():
+    return [name for name in VENDOR_ASSETS if not is_vendored(name)]
+
+
+def cdn_fallback():
+    return getattr(settings, "VENDOR_CDN_FALLBACK", False)
+
+
+def vendor_url(name):
+    if name not in VENDOR_ASSETS:
+        raise KeyError(f"Unbekannte Fremdbibliothek: {name}")
+    if is_vendored(name) or not cdn_fallback():
+        return static(f"vendor/{name}")
+    return cdn_url(name)
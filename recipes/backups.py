@@ -0,0 +1,218 @@
+"""Online-Sicherung von Datenbank und Medien (siehe ``backup``/``restore``).
+
+Aufbau von ``BACKUP_ROOT``::
+
+    objects/ab/ab12...        Mediendateien, abgelegt nach SHA-256 (nur einmal gespeichert)
+    snapshots/<zeitstempel>/
+        db.sqlite3            Kopie der Datenbank über die SQLite-Backup-API
+        manifest.json         Prüfsummen von Datenbank und allen Mediendateien
+"""
+import hashlib
+import json
+import os
+import shutil
+import sqlite3
+from pathlib import Path
+from urllib.parse import quote
+
+from django.conf import settings
+from django.utils import timezone
+
+MANIFEST_NAME = "manifest.json"
+DATABASE_NAME = "db.sqlite3"
+CHUNK_SIZE = 1024 * 1024
+
+
+def backup_root():
+    return Path(getattr(settings, "BACKUP_ROOT", settings.BASE_DIR / "backups"))
+
+
+def sha256_file(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        for chunk in iter(lambda: handle.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def object_path(root, digest):
+    return root / "objects" / digest[:2] / digest
+
+
+def object_intact(path, entry, verify=True):
+    """Stimmen Größe und (mit ``verify``) Prüfsumme der Datei mit dem Manifest-Eintrag überein?"""
+    try:
+        size = path.stat().st_size
+    except FileNotFoundError:
+        return False
+    if size != entry["size"]:
+        return False
+    return not verify or sha256_file(path) == entry["sha256"]
+
+
+def snapshots(root):
+    """Alle vollständigen Snapshots, älteste zuerst."""
+    directory = root / "snapshots"
+    if not directory.exists():
+        return []
+    return sorted(
+        path for path in directory.iterdir()
+        if not path.name.endswith(".partial") and (path / MANIFEST_NAME).exists()
+    )
+
+
+def load_manifest(snapshot):
+    with open(snapshot / MANIFEST_NAME, encoding="utf-8") as handle:
+        return json.load(handle)
+
+
+def _atomic_copy(source, target):
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp = target.with_name(target.name + ".tmp")
+    shutil.copy2(source, tmp)
+    os.replace(tmp, target)
+
+
+def copy_database(source, target, pages=256, sleep=0.005):
+    """Kopiert eine SQLite-Datenbank im laufenden Betrieb.
+
+    Die Backup-API kopiert jeweils ``pages`` Seiten und gibt die Sperre
+    dazwischen frei, Schreiber werden also nie lange blockiert.
+    """
+    # "?", "#" und "%" im Pfad gehören sonst zur URI
+    source_conn = sqlite3.connect(f"file:{quote(str(source))}?mode=ro", uri=True)
+    target_conn = sqlite3.connect(target)
+    try:
+        source_conn.backup(target_conn, pages=pages, sleep=sleep)
+    finally:
+        target_conn.close()
+        source_conn.close()
+
+
+def scan_media(media_root, previous):
+    """Liefert ``{relativer Pfad: {sha256, size, mtime_ns}}`` aller Mediendateien.
+
+    Unveränderte Dateien (gleiche Größe und mtime wie im letzten Manifest)
+    werden nicht erneut gelesen.
+    """
+    entries = {}
+    media_root = Path(media_root)
+    if not media_root.exists():
+        return entries
+    for path in sorted(media_root.rglob("*")):
+        if not path.is_file():
+            continue
+        relative = path.relative_to(media_root).as_posix()
+        stat = path.stat()
+        known = previous.get(relative)
+        if known and known["size"] == stat.st_size and known["mtime_ns"] == stat.st_mtime_ns:
+            digest = known["sha256"]
+        else:
+            digest = sha256_file(path)
+        entries[relative] = {"sha256": digest, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+    return entries
+
+
+def create_snapshot(root, database, media_root, pages=256, sleep=0.005, verify=False):
+    """Legt einen neuen Snapshot an und liefert ``(pfad, anzahl neu kopierter Medien)``.
+
+    Vorhandene Objekte werden nur kopiert, wenn ihre Größe nicht stimmt; mit
+    ``verify`` wird zusätzlich die Prüfsumme jedes Objekts nachgerechnet.
+    """
+    # Reste abgebrochener Läufe
+    for leftover in (root / "snapshots").glob("*.partial"):
+        shutil.rmtree(leftover)
+
+    existing = snapshots(root)
+    previous = load_manifest(existing[-1])["media"] if existing else {}
+
+    name = timezone.now().strftime("%Y-%m-%dT%H-%M-%S-%f")
+    snapshot = root / "snapshots" / name
+    partial = snapshot.with_name(name + ".partial")
+    partial.mkdir(parents=True)
+
+    copy_database(database, partial / DATABASE_NAME, pages=pages, sleep=sleep)
+
+    media = scan_media(media_root, previous)
+    copied = 0
+    for relative, entry in media.items():
+        target = object_path(root, entry["sha256"])
+        # beschädigte Objekte (abgeschnitten, verändert) neu kopieren, statt
+        # sie in jedem weiteren Snapshot zu übernehmen
+        if not object_intact(target, entry, verify=verify):
+            _atomic_copy(Path(media_root) / relative, target)
+            copied += 1
+
+    manifest = {
+        "created": timezone.now().isoformat(),
+        "database": {
+            "file": DATABASE_NAME,
+            "sha256": sha256_file(partial / DATABASE_NAME),
+            "size": (partial / DATABASE_NAME).stat().st_size,
+        },
+        "media": media,
+    }
+    with open(partial / MANIFEST_NAME, "w", encoding="utf-8") as handle:
+        json.dump(manifest, handle, indent=1, sort_keys=True)
+
+    # erst ein vollständiger Snapshot bekommt seinen endgültigen Namen
+    os.replace(partial, snapshot)
+    return snapshot, copied
+
+
+def prune(root, keep):
+    """Behält die neuesten ``keep`` Snapshots und löscht nicht mehr benötigte Objekte."""
+    existing = snapshots(root)
+    for snapshot in existing[:-keep] if keep else []:
+        shutil.rmtree(snapshot)
+
+    referenced = set()
+    for snapshot in snapshots(root):
+        referenced.update(entry["sha256"] for entry in load_manifest(snapshot)["media"].values())
+
+    removed = 0
+    objects = root / "objects"
+    if objects.exists():
+        for path in objects.rglob("*"):
+            if path.is_file() and path.name not in referenced:
+                path.unlink()
+                removed += 1
+    return removed
+
+
+def verify_snapshot(root, snapshot):
+    """Prüft alle Prüfsummen eines Snapshots und liefert eine Liste der Fehler."""
+    manifest = load_manifest(snapshot)
+    errors = []
+
+    database = snapshot / manifest["database"]["file"]
+    if not database.exists():
+        errors.append(f"Datenbank fehlt: {database}")
+    elif sha256_file(database) != manifest["database"]["sha256"]:
+        errors.append(f"Prüfsumme der Datenbank stimmt nicht: {database}")
+
+    for relative, entry in manifest["media"].items():
+        path = object_path(root, entry["sha256"])
+        if not path.exists():
+            errors.append(f"Objekt fehlt für {relative}")
+        elif sha256_file(path) != entry["sha256"]:
+            errors.append(f"Prüfsumme stimmt nicht für {relative}")
+    return errors
+
+
+def restore_snapshot(root, snapshot, database, media_root, pages=256, sleep=0.005):
+    """Spielt Datenbank und Medien zurück; liefert die Anzahl zurückkopierter Medien."""
+    manifest = load_manifest(snapshot)
+
+    # Backup-API in die laufende Datenbank: bestehende Verbindungen sehen danach den neuen Stand
+    copy_database(snapshot / manifest["database"]["file"], database, pages=pages, sleep=sleep)
+
+    restored = 0
+    media_root = Path(media_root)
+    for relative, entry in manifest["media"].items():
+        target = media_root / relative
+        if object_intact(target, entry):
+            continue
+        _atomic_copy(object_path(root, entry["sha256"]), target)
+        restored += 1
+    return restored
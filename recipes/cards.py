@@ -0,0 +1,65 @@
+"""Gecachte Rezeptkarten für die Übersicht.
+
+Jede Karte wird einmal pro Rezeptversion (``updated_at``) gerendert und im
+Cache abgelegt. Alle Karten einer Seite werden mit einem einzigen
+``get_many`` geholt; nur fehlende Karten werden gerendert und per
+``set_many`` nachgelegt. Der Query-String der Filter gehört nicht ins
+Fragment und wird erst beim Ausliefern eingesetzt.
+
+Für die gestreamte Übersicht (``recipes.streaming``) liefert ``iter_cards``
+die Karten blockweise, während das Queryset noch gelesen wird.
+"""
+from django.core.cache import cache
+from django.template.loader import render_to_string
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+
+CARD_TEMPLATE = "recipes/recipe_card.html"
+CARD_CACHE_TIMEOUT = 60 * 60 * 24 * 7
+# Karten pro Block beim Streamen (ein get_many je Block)
+STREAM_BATCH = 50
+# Platzhalter für den Query-String in den Links. Enthält "<": Titel, Zutaten
+# usw. werden escaped und können ihn daher nie enthalten.
+QUERY_PLACEHOLDER = "<!--query-->"
+
+
+def card_cache_key(recipe):
+    return f"recipe-card:v2:{recipe.pk}:{recipe.updated_at.timestamp()}"
+
+
+def render_card(recipe):
+    return render_to_string(CARD_TEMPLATE, {
+        "recipe": recipe,
+        "query_placeholder": mark_safe(QUERY_PLACEHOLDER),
+    })
+
+
+def render_cards(recipes, query_string=""):
+    """Liefert das HTML aller Karten in der Reihenfolge von ``recipes``."""
+    recipes = list(recipes)
+    keys = [card_cache_key(recipe) for recipe in recipes]
+
+    fragments = cache.get_many(keys)
+    missing = {
+        key: render_card(recipe)
+        for key, recipe in zip(keys, recipes)
+        if key not in fragments
+    }
+    if missing:
+        cache.set_many(missing, CARD_CACHE_TIMEOUT)
+        fragments.update(missing)
+
+    query = escape(query_string)
+    return [mark_safe(fragments[key].replace(QUERY_PLACEHOLDER, query)) for key in keys]
+
+
+def iter_cards(recipes, query_string="", batch_size=STREAM_BATCH):
+    """Wie ``render_cards``, aber je ``batch_size`` Rezepte ein HTML-Block."""
+    batch = []
+    for recipe in recipes.iterator(chunk_size=batch_size):
+        batch.append(recipe)
+        if len(batch) == batch_size:
+            yield "".join(render_cards(batch, query_string))
+            batch = []
+    if batch:
+        yield "".join(render_cards(batch, query_string))
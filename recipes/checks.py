@@ -0,0 +1,30 @@
+"""Systemprüfungen (``python manage.py check``, ``runserver``, ``migrate``)."""
+from django.core import checks
+
+from . import assets
+
+
+def _missing_assets(level, hint):
+    missing = assets.missing()
+    if not missing:
+        return []
+    return [level(
+        f"{len(missing)} Fremdbibliotheken fehlen in {assets.VENDOR_DIR}: {', '.join(missing)}",
+        hint=hint,
+        obj="recipes.assets",
+        id="recipes.W001" if level is checks.Warning else "recipes.E001",
+    )]
+
+
+@checks.register(checks.Tags.staticfiles)
+def vendor_assets_check(app_configs, **kwargs):
+    if assets.cdn_fallback():
+        hint = "Sie werden vom CDN geladen. 'python manage.py vendor_assets' ausführen."
+    else:
+        hint = "Die Seiten laden sie ohne CDN nicht. 'python manage.py vendor_assets' ausführen."
+    return _missing_assets(checks.Warning, hint)
+
+
+@checks.register(checks.Tags.staticfiles, deploy=True)
+def vendor_assets_deploy_check(app_configs, **kwargs):
+    return _missing_assets(checks.Error, "Vor dem Ausrollen 'python manage.py vendor_assets' ausführen.")
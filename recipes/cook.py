@@ -0,0 +1,118 @@
+"""Kompakte Daten für den Kochmodus, auch offline (Küchen-WLAN).
+
+``bundle(recipe)`` enthält alles, was ``recipe_cook.html`` zum Anzeigen und
+Umrechnen der Portionen braucht: Zutaten bereits zerlegt in Menge und Rest,
+Schritte als Liste, Basisportionen und die große Bildgröße. Die Kochseite
+bettet das Bundle ein, ``api/recipes/<slug>/cook/`` liefert es einzeln mit
+einem ETag aus der Rezeptversion.
+
+Der Service Worker (``recipes/sw.js``) legt für jedes Rezept im aktuellen
+Wochenplan Bundle, Kochseite und Bild im Browser ab; die Liste dazu kommt
+aus ``api/cook/offline/`` (``offline_entries``).
+"""
+import hashlib
+import re
+
+from django.templatetags.static import static
+from django.urls import reverse
+
+from .assets import vendor_url
+from .models import Recipe, WeeklyPlanEntry, current_week_start, split_lines
+
+# Spalten, die Bundle und Version brauchen
+BUNDLE_FIELDS = (
+    "id", "slug", "title", "servings", "ingredients", "steps", "updated_at",
+    "duration_minutes", "working_time", "temperature_celsius",
+    "image", "renditions", "image_width", "image_height", "image_placeholder",
+)
+
+# Dateien, die die Kochseite ohne Netz braucht (Schriftarten etc. legt der
+# Service Worker beim ersten Laden ab)
+SHELL_VENDOR_ASSETS = (
+    "bootstrap/bootstrap.min.css",
+    "bootstrap/bootstrap.bundle.min.js",
+    "bootstrap-icons/bootstrap-icons.min.css",
+)
+SHELL_STATIC = ("recipes/style.css",)
+
+# "200 g Nudeln", "1/2 TL Salz", "1,5 l Wasser" – wie bisher im JS der Kochseite
+AMOUNT = re.compile(r"^([\d.,/]+)\s*(.*)$")
+
+
+def parse_amount(line):
+    """``"1/2 TL Salz"`` → ``(0.5, "TL Salz")``; ohne Mengenangabe ``(None, line)``."""
+    match = AMOUNT.match(line)
+    if not match:
+        return None, line
+    raw, rest = match.groups()
+    try:
+        if "/" in raw:
+            numerator, denominator = raw.split("/", 1)
+            amount = float(numerator.replace(",", ".")) / float(denominator.replace(",", "."))
+        else:
+            amount = float(raw.replace(",", "."))
+    except (ValueError, ZeroDivisionError):
+        return None, line
+    return amount, rest
+
+
+def version(recipe):
+    """Ändert sich mit dem Rezept und mit fertig berechneten Bildgrößen."""
+    # updated_at setzen auch build_renditions (neue Bildgrößen) und der
+    # Gekocht-Zähler; die Bild-URL hängt zusätzlich von MEDIA_URL/Storage ab
+    source = f"{recipe.pk}:{recipe.updated_at.isoformat()}:{recipe.large_url}"
+    return hashlib.sha256(source.encode()).hexdigest()[:16]
+
+
+def bundle(recipe):
+    ingredients = []
+    for line in split_lines(recipe.ingredients):
+        amount, rest = parse_amount(line)
+        ingredients.append({"text": line, "amount": amount, "rest": rest})
+
+    image = None
+    if recipe.image:
+        width, height = recipe.large_size
+        image = {
+            "url": recipe.large_url,
+            "width": width,
+            "height": height,
+            "placeholder": recipe.image_placeholder,
+        }
+
+    return {
+        "id": recipe.id,
+        "slug": recipe.slug,
+        "version": version(recipe),
+        "title": recipe.title,
+        "servings": recipe.servings or 1,
+        "ingredients": ingredients,
+        "steps": split_lines(recipe.steps),
+        "duration_minutes": recipe.duration_minutes,
+        "working_time": recipe.working_time,
+        "temperature_celsius": recipe.temperature_celsius,
+        "image": image,
+        "url": reverse("recipes:cook", kwargs={"slug": recipe.slug}),
+    }
+
+
+def offline_entries(user, week_start=None):
+    """Was der Service Worker für den Wochenplan ablegen soll, je Rezept einmal."""
+    week_start = week_start or current_week_start()
+    planned = WeeklyPlanEntry.objects.filter(plan__user=user, plan__week_start=week_start).values("recipe_id")
+    recipes = Recipe.objects.filter(pk__in=planned).only("id", "slug", "updated_at", "image", "renditions").order_by("title")
+
+    entries = []
+    for recipe in recipes:
+        entries.append({
+            "slug": recipe.slug,
+            "version": version(recipe),
+            "bundle": reverse("recipes:api_cook_bundle", kwargs={"slug": recipe.slug}),
+            "page": reverse("recipes:cook", kwargs={"slug": recipe.slug}),
+            "image": recipe.large_url or None,
+        })
+    return entries
+
+
+def shell_urls():
+    return [vendor_url(name) for name in SHELL_VENDOR_ASSETS] + [static(name) for name in SHELL_STATIC]
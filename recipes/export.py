@@ -0,0 +1,127 @@
+"""Export der Rezeptsammlung als ZIP mit statischen HTML-Seiten und Bildern.
+
+Das Archiv wird stückweise erzeugt: ``iter_zip`` liefert die Bytes, sobald
+sie geschrieben sind, und hält nie mehr als einen Block Rezepte und eine
+Bilddatei im Speicher. So kann die View direkt in eine
+``StreamingHttpResponse`` schreiben.
+"""
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import PurePosixPath
+
+from django.core.files.storage import default_storage
+from django.template.loader import render_to_string
+from django.utils import timezone
+
+from .models import split_lines
+
+# Rezepte pro Block: so viele Seiten werden gleichzeitig gerendert und gehalten
+BATCH_SIZE = 64
+EXPORT_WORKERS = 4
+CHUNK_SIZE = 256 * 1024
+
+
+class StreamSink:
+    """Schreibziel ohne ``seek``/``tell``: ``zipfile`` schreibt dann streamingfähig
+    (Größen und Prüfsummen stehen im Data Descriptor hinter jeder Datei)."""
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def pop(self):
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def recipe_filename(recipe):
+    return f"rezepte/{recipe.slug}.html"
+
+
+def image_files(recipe):
+    """``{größe: (pfad im Speicher, pfad im Archiv)}`` der exportierten Bilder."""
+    if not recipe.image:
+        return {}
+    files = {}
+    for name in ("thumb", "large"):
+        path = None if recipe.renditions_outdated() else recipe.renditions.get(name)
+        if path:
+            files[name] = (path, f"bilder/{recipe.slug}-{name}{PurePosixPath(path).suffix}")
+        else:
+            # ohne Renditions wird nur das Original einmal exportiert
+            path = recipe.image.name
+            files[name] = (path, f"bilder/{recipe.slug}{PurePosixPath(path).suffix}")
+    return files
+
+
+def render_recipe_page(recipe):
+    image = image_files(recipe).get("large")
+    return render_to_string("recipes/export/recipe.html", {
+        "recipe": recipe,
+        "labels": recipe.labels.all(),
+        "ingredients": split_lines(recipe.ingredients),
+        "steps": split_lines(recipe.steps),
+        "image": f"../{image[1]}" if image else "",
+    })
+
+
+def _batches(queryset, size):
+    batch = []
+    for recipe in queryset.prefetch_related("labels").iterator(chunk_size=size):
+        batch.append(recipe)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _write_file(archive, sink, source, arcname):
+    """Kopiert eine Mediendatei blockweise ins Archiv (Bilder sind bereits komprimiert)."""
+    info = zipfile.ZipInfo(arcname, date_time=timezone.localtime().timetuple()[:6])
+    info.compress_type = zipfile.ZIP_STORED
+    with default_storage.open(source, "rb") as handle, archive.open(info, "w", force_zip64=True) as target:
+        for chunk in iter(lambda: handle.read(CHUNK_SIZE), b""):
+            target.write(chunk)
+            yield sink.pop()
+    yield sink.pop()
+
+
+def iter_zip(queryset, workers=EXPORT_WORKERS, batch_size=BATCH_SIZE):
+    """Erzeugt das ZIP-Archiv für ``queryset`` und liefert es in Stücken."""
+    sink = StreamSink()
+    entries = []
+    with zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_DEFLATED) as archive, \
+            ThreadPoolExecutor(max_workers=workers) as pool:
+        for batch in _batches(queryset, batch_size):
+            # die Seiten eines Blocks werden parallel gerendert; die Daten sind
+            # bereits geladen, die Worker greifen nicht auf die Datenbank zu
+            for recipe, page in zip(batch, pool.map(render_recipe_page, batch)):
+                archive.writestr(recipe_filename(recipe), page)
+                yield sink.pop()
+
+                images = image_files(recipe)
+                for source, arcname in sorted(set(images.values())):
+                    if default_storage.exists(source):
+                        yield from _write_file(archive, sink, source, arcname)
+
+                thumb = images.get("thumb")
+                entries.append({
+                    "title": recipe.title,
+                    "href": recipe_filename(recipe),
+                    "thumb": thumb[1] if thumb else "",
+                    "duration_minutes": recipe.duration_minutes,
+                })
+
+        archive.writestr("index.html", render_to_string("recipes/export/index.html", {
+            "entries": entries,
+            "created": timezone.localtime(),
+        }))
+    yield sink.pop()
@@ -0,0 +1,169 @@
+"""Bitmap-Index für die Label- und Dauer-Filter der Übersicht.
+
+Alle Rezepte werden dicht durchnummeriert; pro Label und pro Dauer-Stufe
+gibt es eine Bitmenge (Python-``int``). Filter werden per AND/OR auf diesen
+Mengen beantwortet, die Datenbank sieht danach nur noch ein ``pk__in`` –
+ohne JOINs über ``recipe_labels`` und ohne DISTINCT.
+
+Der Index wird über ``recipes.snapshots`` zwischen Workern geteilt und über
+Signale (``recipes/signals.py``) bei Änderungen invalidiert.
+"""
+from bisect import bisect_right
+
+from .models import Label, Recipe
+from .snapshots import SnapshotStore
+
+# Obergrenzen der Dauer-Stufen in Minuten (kumulativ: "≤ Stufe")
+DURATION_BUCKETS = (10, 15, 20, 30, 45, 60, 90, 120, 180, 240, 360, 720, 1440)
+
+# Ab dieser Größe wird die kleinere Komplementmenge per exclude() übergeben,
+# damit SQLite nicht an der Obergrenze für Parameter scheitert
+MAX_IN_LIST = 10000
+
+
+def _bits(bitset):
+    """Positionen aller gesetzten Bits."""
+    while bitset:
+        low = bitset & -bitset
+        yield low.bit_length() - 1
+        bitset ^= low
+
+
+class DurationIndex:
+    def __init__(self):
+        self.values = []
+        self.known = 0
+        self.buckets = [0] * len(DURATION_BUCKETS)
+
+    def add(self, position, minutes):
+        self.values.append(minutes)
+        if minutes is None:
+            return
+        bit = 1 << position
+        self.known |= bit
+        for index in range(bisect_right(DURATION_BUCKETS, minutes - 1), len(DURATION_BUCKETS)):
+            self.buckets[index] |= bit
+
+    def at_most(self, limit):
+        """Bitmenge aller Rezepte mit Dauer ≤ ``limit``."""
+        if limit < 0:
+            return 0
+        index = bisect_right(DURATION_BUCKETS, limit) - 1
+        base = self.buckets[index] if index >= 0 else 0
+        if index >= 0 and DURATION_BUCKETS[index] == limit:
+            return base
+        # Rezepte zwischen Stufengrenze und limit einzeln prüfen
+        upper = self.buckets[index + 1] if index + 1 < len(DURATION_BUCKETS) else self.known
+        for position in _bits(upper & ~base):
+            if self.values[position] <= limit:
+                base |= 1 << position
+        return base
+
+
+class FacetIndex:
+    def __init__(self, recipes, memberships, label_types):
+        self.pks = []
+        self.all = 0
+        self.duration = DurationIndex()
+        self.working = DurationIndex()
+        positions = {}
+        for pk, duration, working in recipes:
+            position = len(self.pks)
+            positions[pk] = position
+            self.pks.append(pk)
+            self.all |= 1 << position
+            self.duration.add(position, duration)
+            self.working.add(position, working)
+
+        self.label_types = label_types
+        self.labels = dict.fromkeys(label_types, 0)
+        for recipe_id, label_id in memberships:
+            if recipe_id in positions and label_id in self.labels:
+                self.labels[label_id] |= 1 << positions[recipe_id]
+
+    @classmethod
+    def build(cls):
+        recipes = Recipe.objects.order_by("id").values_list("id", "duration_minutes", "working_time")
+        memberships = Recipe.labels.through.objects.values_list("recipe_id", "label_id")
+        label_types = dict(Label.objects.values_list("id", "label_type"))
+        return cls(recipes, memberships, label_types)
+
+    def _labels(self, ids, label_type):
+        """ODER über alle ausgewählten Labels des passenden Typs."""
+        result = 0
+        for label_id in ids:
+            if self.label_types.get(label_id) == label_type:
+                result |= self.labels[label_id]
+        return result
+
+    def match(self, category_ids=(), event_ids=(), max_duration=None, max_working=None):
+        result = self.all
+        if category_ids:
+            result &= self._labels(category_ids, Label.CATEGORY)
+        if event_ids:
+            result &= self._labels(event_ids, Label.EVENT)
+        if max_duration is not None:
+            result &= self.duration.at_most(max_duration)
+        if max_working is not None:
+            result &= self.working.at_most(max_working)
+        return result
+
+    def pk_list(self, bitset):
+        return [self.pks[position] for position in _bits(bitset)]
+
+
+store = SnapshotStore("facets", FacetIndex.build)
+
+
+def invalidate():
+    store.invalidate()
+
+
+def _int_or_none(value):
+    try:
+        return int(value) if value not in (None, "") else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _int_list(values):
+    return [number for number in map(_int_or_none, values) if number is not None]
+
+
+def apply(qs, params):
+    """Wendet Label- und Dauer-Filter aus ``params`` über den Bitmap-Index an."""
+    category_ids = _int_list(params.getlist("category_labels"))
+    event_ids = _int_list(params.getlist("event_labels"))
+    max_duration = _int_or_none(params.get("max_duration"))
+    max_working = _int_or_none(params.get("max_working_duration"))
+
+    # ausgewählte, aber ungültige Labels filtern alles weg (wie zuvor der JOIN)
+    no_valid_labels = (
+        (params.getlist("category_labels") and not category_ids)
+        or (params.getlist("event_labels") and not event_ids)
+    )
+    if no_valid_labels:
+        return qs.none()
+    if not (category_ids or event_ids or max_duration is not None or max_working is not None):
+        return qs
+
+    index = store.get()
+    matched = index.match(category_ids, event_ids, max_duration, max_working)
+    count = matched.bit_count()
+    if count <= MAX_IN_LIST:
+        return qs.filter(pk__in=index.pk_list(matched))
+
+    rest = index.all & ~matched
+    if rest.bit_count() <= MAX_IN_LIST:
+        return qs.exclude(pk__in=index.pk_list(rest))
+
+    # sehr große Mengen auf beiden Seiten: klassisch über die Datenbank filtern
+    if category_ids:
+        qs = qs.filter(labels__id__in=category_ids, labels__label_type=Label.CATEGORY)
+    if event_ids:
+        qs = qs.filter(labels__id__in=event_ids, labels__label_type=Label.EVENT)
+    if max_duration is not None:
+        qs = qs.filter(duration_minutes__lte=max_duration)
+    if max_working is not None:
+        qs = qs.filter(working_time__lte=max_working)
+    return qs.distinct()
@@ -0,0 +1,221 @@
+"""Kleine, dauerhafte Job-Warteschlange in der bestehenden Datenbank.
+
+Jobs werden mit ``@job`` registriert und mit ``<funktion>.enqueue(...)``
+eingereiht. Abgearbeitet werden sie vom Management-Command ``runworker``.
+
+Laufende Jobs melden sich regelmäßig (``updated_at``), damit
+``requeue_stale`` nur Jobs abgestürzter Worker wieder einreiht. Erledigte
+Jobs werden nach ``DONE_RETENTION`` gelöscht.
+"""
+import logging
+import threading
+import traceback
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.db import IntegrityError, close_old_connections, connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+_registry = {}
+
+# Wartezeit vor dem nächsten Versuch: 30 s, 2 min, 8 min, ...
+RETRY_BASE_SECONDS = 30
+# so oft aktualisiert ein laufender Job updated_at; deutlich unter STALE_AFTER
+HEARTBEAT_SECONDS = 60
+STALE_AFTER = timedelta(minutes=30)
+# erledigte Jobs so lange für die Statusseite behalten
+DONE_RETENTION = timedelta(days=7)
+PURGE_INTERVAL = timedelta(hours=1)
+
+
+class JobFunction:
+    def __init__(self, func, name, max_attempts, dedupe=None):
+        self.func = func
+        self.name = name
+        self.max_attempts = max_attempts
+        self.dedupe = dedupe
+
+    def __call__(self, **payload):
+        return self.func(**payload)
+
+    def enqueue(self, dedupe_key=None, run_after=None, **payload):
+        return enqueue(self.name, dedupe_key=dedupe_key, run_after=run_after, **payload)
+
+
+def job(name, max_attempts=3, dedupe=None):
+    """Registriert eine Funktion als Hintergrund-Job.
+
+    ``dedupe`` ist eine Funktion, die aus dem Payload den Dedup-Schlüssel bildet.
+    """
+    def decorator(func):
+        job_function = JobFunction(func, name, max_attempts, dedupe)
+        _registry[name] = job_function
+        return job_function
+    return decorator
+
+
+def enqueue(name, dedupe_key=None, run_after=None, **payload):
+    """Reiht einen Job ein. Wartet schon ein Job mit gleichem Schlüssel, wird dieser zurückgegeben."""
+    job_function = _registry[name]
+    if dedupe_key is None and job_function.dedupe is not None:
+        dedupe_key = job_function.dedupe(**payload)
+
+    if dedupe_key:
+        existing = Job.objects.filter(dedupe_key=dedupe_key, status=Job.QUEUED).first()
+        if existing is not None:
+            return existing
+
+    try:
+        with transaction.atomic():
+            return Job.objects.create(
+                name=name,
+                payload=payload,
+                dedupe_key=dedupe_key or None,
+                max_attempts=job_function.max_attempts,
+                run_after=run_after or timezone.now(),
+            )
+    except IntegrityError:
+        # gleichzeitig von einem anderen Prozess eingereiht
+        return Job.objects.get(dedupe_key=dedupe_key, status=Job.QUEUED)
+
+
+def claim_next():
+    """Übernimmt den nächsten fälligen Job; sicher bei mehreren Workern."""
+    candidates = (
+        Job.objects.filter(status=Job.QUEUED, run_after__lte=timezone.now())
+        .order_by("run_after", "id")
+        .values_list("id", flat=True)[:10]
+    )
+    for job_id in candidates:
+        claimed = Job.objects.filter(id=job_id, status=Job.QUEUED).update(
+            status=Job.RUNNING,
+            attempts=F("attempts") + 1,
+            updated_at=timezone.now(),
+        )
+        if claimed:
+            return Job.objects.get(id=job_id)
+    return None
+
+
+def beat(job_id):
+    """Meldet einen laufenden Job als lebendig."""
+    return Job.objects.filter(id=job_id, status=Job.RUNNING).update(updated_at=timezone.now())
+
+
+@contextmanager
+def heartbeat(job_id, interval=HEARTBEAT_SECONDS):
+    stop = threading.Event()
+
+    def run():
+        try:
+            while not stop.wait(interval):
+                beat(job_id)
+        finally:
+            # eigene Verbindung des Threads
+            connection.close()
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        stop.set()
+        thread.join()
+
+
+def run_job(job_obj):
+    job_function = _registry.get(job_obj.name)
+    try:
+        if job_function is None:
+            raise LookupError(f"Unbekannter Job: {job_obj.name}")
+        with heartbeat(job_obj.id):
+            job_function(**job_obj.payload)
+    except Exception:
+        logger.exception("Job %s (%s) fehlgeschlagen", job_obj.pk, job_obj.name)
+        _retry_or_fail(job_obj, traceback.format_exc())
+        return False
+
+    Job.objects.filter(id=job_obj.id).update(status=Job.DONE, last_error="", updated_at=timezone.now())
+    return True
+
+
+def _retry_or_fail(job_obj, error):
+    if job_obj.attempts >= job_obj.max_attempts:
+        Job.objects.filter(id=job_obj.id).update(
+            status=Job.FAILED, last_error=error, updated_at=timezone.now()
+        )
+        return
+
+    delay = timedelta(seconds=RETRY_BASE_SECONDS * 4 ** (job_obj.attempts - 1))
+    try:
+        with transaction.atomic():
+            Job.objects.filter(id=job_obj.id).update(
+                status=Job.QUEUED,
+                run_after=timezone.now() + delay,
+                last_error=error,
+                updated_at=timezone.now(),
+            )
+    except IntegrityError:
+        # inzwischen wartet schon ein neuerer Job mit demselben Schlüssel, der
+        # die Arbeit übernimmt; der Fehler bleibt in der Liste sichtbar
+        Job.objects.filter(id=job_obj.id).update(
+            status=Job.FAILED, last_error=error, updated_at=timezone.now()
+        )
+
+
+def requeue_stale(older_than=STALE_AFTER):
+    """Gibt Jobs frei, deren Worker abgestürzt ist (kein Heartbeat mehr)."""
+    stale = Job.objects.filter(status=Job.RUNNING, updated_at__lt=timezone.now() - older_than)
+    count = 0
+    for job_obj in stale:
+        try:
+            with transaction.atomic():
+                count += Job.objects.filter(id=job_obj.id).update(
+                    status=Job.QUEUED, updated_at=timezone.now()
+                )
+        except IntegrityError:
+            # nicht fertig geworden; ein wartender Job mit demselben Schlüssel übernimmt
+            Job.objects.filter(id=job_obj.id).update(
+                status=Job.FAILED, last_error="Worker abgebrochen", updated_at=timezone.now()
+            )
+    return count
+
+
+def purge_done(older_than=DONE_RETENTION):
+    """Löscht erledigte Jobs; fehlgeschlagene bleiben zur Ansicht stehen."""
+    deleted, _ = Job.objects.filter(status=Job.DONE, updated_at__lt=timezone.now() - older_than).delete()
+    return deleted
+
+
+def run_pending(limit=None):
+    """Arbeitet fällige Jobs synchron ab (z. B. für Backfills). Liefert die Anzahl."""
+    count = 0
+    while limit is None or count < limit:
+        job_obj = claim_next()
+        if job_obj is None:
+            break
+        run_job(job_obj)
+        count += 1
+    return count
+
+
+def work(stop_event=None, poll_interval=2.0):
+    """Worker-Schleife: holt Jobs, bis ``stop_event`` gesetzt ist."""
+    stop_event = stop_event or threading.Event()
+    last_purge = None
+    while not stop_event.is_set():
+        close_old_connections()
+        job_obj = claim_next()
+        if job_obj is None:
+            # Leerlauf: ab und zu aufräumen
+            if last_purge is None or timezone.now() - last_purge > PURGE_INTERVAL:
+                purge_done()
+                last_purge = timezone.now()
+            stop_event.wait(poll_interval)
+            continue
+        run_job(job_obj)
@@ -0,0 +1,385 @@
+"""Lastgenerator für ``python manage.py loadtest``.
+
+Simulierte Benutzer rufen die WSGI- bzw. ASGI-Anwendung direkt im Prozess
+auf (kein Webserver, keine externen Dienste) und durchlaufen eine typische
+Mischung aus Übersicht mit Filtern, Detailseite, Kochmodus, „Gekocht“ und
+Wochenplan-Bearbeitung.
+
+Geschrieben wird nur in eine Kopie der Datenbank (``scratch_database``), die
+danach gelöscht wird; die Anmeldung des Testbenutzers wird am Ende wieder
+abgemeldet.
+"""
+import asyncio
+import math
+import random
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from io import BytesIO
+from pathlib import Path
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.signals import got_request_exception
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test import Client
+from django.utils.crypto import get_random_string
+
+from .models import Label, Recipe
+from .snapshots import snapshot_dir as current_snapshot_dir
+
+ENDPOINT_HEADER = "X-Loadtest-Endpoint"
+# Woche weit in der Zukunft, damit Testeinträge keine geplanten Wochen berühren
+SCRATCH_WEEK = "2099-01-05"
+
+# Endpunkt → Gewicht in der Benutzermischung
+DEFAULT_MIX = {
+    "index": 25,
+    "index_filtered": 15,
+    "detail": 25,
+    "cook": 15,
+    "cooked": 8,
+    "weekly_plan": 7,
+    "weekly_plan_edit": 5,
+}
+AUTH_ENDPOINTS = {"cooked", "weekly_plan", "weekly_plan_edit"}
+
+
+class Stats:
+    """Sammelt Latenzen und Fehler pro Endpunkt (thread-sicher)."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.lock_errors = defaultdict(int)
+
+    def record(self, endpoint, seconds, ok):
+        with self.lock:
+            self.latencies[endpoint].append(seconds)
+            if not ok:
+                self.errors[endpoint] += 1
+
+    def record_lock_error(self, endpoint):
+        with self.lock:
+            self.lock_errors[endpoint] += 1
+
+    def as_dict(self):
+        return {
+            "latencies": dict(self.latencies),
+            "errors": dict(self.errors),
+            "lock_errors": dict(self.lock_errors),
+        }
+
+    def merge(self, data):
+        for endpoint, values in data["latencies"].items():
+            self.latencies[endpoint].extend(values)
+        for endpoint, count in data["errors"].items():
+            self.errors[endpoint] += count
+        for endpoint, count in data["lock_errors"].items():
+            self.lock_errors[endpoint] += count
+
+
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return 0.0
+    # Nearest-Rank: kleinster Wert, unter dem mindestens p % liegen
+    index = max(0, min(len(sorted_values) - 1, math.ceil(p / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def format_report(stats, duration):
+    lines = [
+        f"{'Endpunkt':<18}{'Anfragen':>9}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+        f"{'Fehler':>8}{'Locks':>7}"
+    ]
+    total = 0
+    for endpoint in sorted(stats.latencies):
+        values = sorted(stats.latencies[endpoint])
+        total += len(values)
+        lines.append(
+            f"{endpoint:<18}{len(values):>9}{len(values) / duration:>9.1f}"
+            f"{percentile(values, 50) * 1000:>9.1f}{percentile(values, 95) * 1000:>9.1f}"
+            f"{percentile(values, 99) * 1000:>9.1f}"
+            f"{stats.errors.get(endpoint, 0):>8}{stats.lock_errors.get(endpoint, 0):>7}"
+        )
+    lines.append(f"Gesamt: {total} Anfragen, {total / duration:.1f} req/s")
+    return "\n".join(lines)
+
+
+def load_corpus():
+    """Liest einmalig die Daten, aus denen die Anfragen gebaut werden."""
+    corpus = {
+        "slugs": list(Recipe.objects.values_list("slug", flat=True)),
+        "recipe_ids": list(Recipe.objects.values_list("id", flat=True)),
+        "label_ids": list(Label.objects.values_list("id", "label_type")),
+        "words": sorted({
+            word for title in Recipe.objects.values_list("title", flat=True)
+            for word in title.split() if len(word) > 3
+        }),
+    }
+    if not corpus["slugs"]:
+        raise ValueError("Keine Rezepte vorhanden – der Lasttest braucht Daten.")
+    return corpus
+
+
+class Scenario:
+    """Erzeugt zufällige Anfragen aus der Benutzermischung."""
+
+    def __init__(self, corpus, mix, authenticated, seed=None):
+        self.rng = random.Random(seed)
+        self.slugs = corpus["slugs"]
+        self.recipe_ids = corpus["recipe_ids"]
+        self.label_ids = corpus["label_ids"]
+        self.words = corpus["words"]
+        self.mix = {
+            endpoint: weight for endpoint, weight in mix.items()
+            if authenticated or endpoint not in AUTH_ENDPOINTS
+        }
+
+    def next_actions(self):
+        """Liefert eine Liste von (Endpunkt, Methode, Pfad, Query, Formulardaten)."""
+        endpoint = self.rng.choices(list(self.mix), weights=list(self.mix.values()))[0]
+        slug = self.rng.choice(self.slugs)
+
+        if endpoint == "index":
+            return [(endpoint, "GET", "/recipes/", {}, None)]
+        if endpoint == "index_filtered":
+            params = {"sort": self.rng.choice(["title", "duration", "cooked"])}
+            if self.words and self.rng.random() < 0.5:
+                params["q"] = self.rng.choice(self.words)[:4]
+            if self.rng.random() < 0.5:
+                params["max_duration"] = self.rng.choice([20, 30, 45, 60, 90])
+            if self.label_ids and self.rng.random() < 0.7:
+                label_id, label_type = self.rng.choice(self.label_ids)
+                params[f"{label_type}_labels"] = label_id
+            return [(endpoint, "GET", "/recipes/", params, None)]
+        if endpoint == "detail":
+            return [(endpoint, "GET", f"/recipes/{slug}/", {}, None)]
+        if endpoint == "cook":
+            return [(endpoint, "GET", f"/recipes/{slug}/cook/", {"servings": self.rng.randint(1, 6)}, None)]
+        if endpoint == "cooked":
+            # Zähler erhöhen und gleich wieder zurücksetzen
+            return [
+                (endpoint, "POST", f"/recipes/{slug}/", {}, {"cooked": "1"}),
+                (endpoint, "POST", f"/recipes/{slug}/", {}, {"undo_cooked": "1"}),
+            ]
+        if endpoint == "weekly_plan":
+            return [(endpoint, "GET", "/recipes/weekly-plan/", {}, None)]
+        if endpoint == "weekly_plan_edit":
+            day = self.rng.choice(["Montag", "Dienstag", "Mittwoch", "Donnerstag", "Freitag"])
+            recipe_id = self.rng.choice(self.recipe_ids)
+            return [
+                (endpoint, "GET", "/recipes/weekly-plan/",
+                 {"action": "add", "recipe_id": recipe_id, "day": day, "week": SCRATCH_WEEK}, None),
+                (endpoint, "GET", "/recipes/weekly-plan/", {"action": "clear", "week": SCRATCH_WEEK}, None),
+            ]
+        raise ValueError(endpoint)
+
+
+def use_database(path, snapshot_dir, reconnect=True):
+    """Leitet die Verbindungen (und die Index-Snapshots) auf die Kopie um."""
+    connection = connections[DEFAULT_DB_ALIAS]
+    if reconnect:
+        connection.close()
+    connection.settings_dict["NAME"] = str(path)
+    settings.SNAPSHOT_DIR = snapshot_dir
+
+
+@contextmanager
+def scratch_database():
+    """Kopie der Datenbank für die Dauer des Lasttests; liefert ``(pfad, snapshot_dir)``."""
+    connection = connections[DEFAULT_DB_ALIAS]
+    if connection.vendor != "sqlite":
+        raise ValueError("Der Lasttest unterstützt nur SQLite.")
+    original = (connection.settings_dict["NAME"], current_snapshot_dir())
+    # eine In-Memory-Datenbank (Tests) verschwindet beim Schließen: dann bleibt
+    # die Verbindung dieses Threads offen, nur neue Threads nutzen die Kopie
+    reconnect = not connection.is_in_memory_db()
+    with tempfile.TemporaryDirectory(prefix="loadtest-") as tmp:
+        path, snapshot_dir = Path(tmp) / "db.sqlite3", Path(tmp) / "snapshots"
+        connection.ensure_connection()
+        target = sqlite3.connect(path)
+        try:
+            # über die offene Verbindung, klappt auch mit In-Memory-Datenbanken
+            connection.connection.backup(target)
+        finally:
+            target.close()
+        use_database(path, snapshot_dir, reconnect)
+        try:
+            yield path, snapshot_dir
+        finally:
+            use_database(*original, reconnect)
+
+
+@contextmanager
+def logged_in(username):
+    """Sitzung für ``username``: liefert ``(Cookie-Header, CSRF-Token)`` und meldet danach ab."""
+    csrf_secret = get_random_string(32)
+    cookies = {"csrftoken": csrf_secret}
+    client = Client()
+    if username:
+        client.force_login(get_user_model().objects.get(username=username))
+        for name, morsel in client.cookies.items():
+            cookies[name] = morsel.value
+    try:
+        yield "; ".join(f"{name}={value}" for name, value in cookies.items()), csrf_secret
+    finally:
+        if username:
+            # Sitzung nicht im Sessions-Cache liegen lassen
+            client.logout()
+
+
+def _build_environ(method, path, query, form, cookie_header, csrf_token, endpoint):
+    body = urlencode(form).encode() if form else b""
+    return {
+        "REQUEST_METHOD": method,
+        "PATH_INFO": path,
+        "QUERY_STRING": urlencode(query),
+        "SERVER_NAME": "loadtest",
+        "SERVER_PORT": "80",
+        "SERVER_PROTOCOL": "HTTP/1.1",
+        "REMOTE_ADDR": "127.0.0.1",
+        "CONTENT_TYPE": "application/x-www-form-urlencoded",
+        "CONTENT_LENGTH": str(len(body)),
+        "HTTP_COOKIE": cookie_header,
+        "HTTP_X_CSRFTOKEN": csrf_token,
+        "HTTP_" + ENDPOINT_HEADER.upper().replace("-", "_"): endpoint,
+        "wsgi.version": (1, 0),
+        "wsgi.url_scheme": "http",
+        "wsgi.input": BytesIO(body),
+        "wsgi.errors": sys.stderr,
+        "wsgi.multithread": True,
+        "wsgi.multiprocess": True,
+        "wsgi.run_once": False,
+    }
+
+
+def _track_lock_errors(stats):
+    def receiver(sender, request=None, **kwargs):
+        exc = sys.exc_info()[1]
+        if exc is not None and "database is locked" in str(exc):
+            endpoint = request.headers.get(ENDPOINT_HEADER, "?") if request is not None else "?"
+            stats.record_lock_error(endpoint)
+    got_request_exception.connect(receiver, weak=False)
+    return receiver
+
+
+def run_wsgi(application, users, duration, username, mix, seed=None, think_time=0.0):
+    """Startet ``users`` Threads gegen eine WSGI-Anwendung und liefert die Statistik als dict."""
+    stats = Stats()
+    corpus = load_corpus()
+
+    def user_loop(index):
+        scenario = Scenario(corpus, mix, authenticated=bool(username), seed=None if seed is None else seed + index)
+        try:
+            while time.monotonic() < deadline:
+                for endpoint, method, path, query, form in scenario.next_actions():
+                    status = []
+                    started = time.perf_counter()
+                    try:
+                        result = application(
+                            _build_environ(method, path, query, form, cookie_header, csrf_token, endpoint),
+                            lambda s, headers, exc_info=None: status.append(s),
+                        )
+                        try:
+                            for _ in result:
+                                pass
+                        finally:
+                            if hasattr(result, "close"):
+                                result.close()
+                        ok = bool(status) and int(status[0].split()[0]) < 500
+                    except Exception:
+                        ok = False
+                    stats.record(endpoint, time.perf_counter() - started, ok)
+                if think_time:
+                    time.sleep(scenario.rng.uniform(0, 2 * think_time))
+        finally:
+            connections.close_all()
+
+    receiver = _track_lock_errors(stats)
+    with logged_in(username) as (cookie_header, csrf_token):
+        deadline = time.monotonic() + duration
+        threads = [threading.Thread(target=user_loop, args=(index,)) for index in range(users)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    got_request_exception.disconnect(receiver)
+    return stats.as_dict()
+
+
+def run_asgi(application, users, duration, username, mix, seed=None, think_time=0.0):
+    """Wie ``run_wsgi``, aber mit ``users`` Koroutinen gegen eine ASGI-Anwendung."""
+    stats = Stats()
+    # Daten vorab laden: im Event-Loop sind keine synchronen DB-Zugriffe erlaubt
+    corpus = load_corpus()
+    scenarios = [
+        Scenario(corpus, mix, authenticated=bool(username), seed=None if seed is None else seed + index)
+        for index in range(users)
+    ]
+
+    async def call(endpoint, method, path, query, form):
+        body = urlencode(form).encode() if form else b""
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": method,
+            "scheme": "http",
+            "path": path,
+            "raw_path": path.encode(),
+            "query_string": urlencode(query).encode(),
+            "root_path": "",
+            "headers": [
+                (b"host", b"loadtest"),
+                (b"cookie", cookie_header.encode()),
+                (b"x-csrftoken", csrf_token.encode()),
+                (b"content-type", b"application/x-www-form-urlencoded"),
+                (b"content-length", str(len(body)).encode()),
+                (ENDPOINT_HEADER.lower().encode(), endpoint.encode()),
+            ],
+            "client": ("127.0.0.1", 0),
+            "server": ("loadtest", 80),
+        }
+        messages = [{"type": "http.request", "body": body, "more_body": False}]
+        status = []
+
+        async def receive():
+            if messages:
+                return messages.pop(0)
+            await asyncio.sleep(3600)
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            if message["type"] == "http.response.start":
+                status.append(message["status"])
+
+        await application(scope, receive, send)
+        return bool(status) and status[0] < 500
+
+    async def user_loop(scenario, deadline):
+        while time.monotonic() < deadline:
+            for action in scenario.next_actions():
+                started = time.perf_counter()
+                try:
+                    ok = await call(*action)
+                except Exception:
+                    ok = False
+                stats.record(action[0], time.perf_counter() - started, ok)
+            await asyncio.sleep(scenario.rng.uniform(0, 2 * think_time) if think_time else 0)
+
+    async def main():
+        deadline = time.monotonic() + duration
+        await asyncio.gather(*(user_loop(scenario, deadline) for scenario in scenarios))
+
+    receiver = _track_lock_errors(stats)
+    with logged_in(username) as (cookie_header, csrf_token):
+        asyncio.run(main())
+    got_request_exception.disconnect(receiver)
+    return stats.as_dict()
@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+
+from recipes.models import Recipe
+from recipes.tasks import build_renditions
+
+
+class Command(BaseCommand):
+    help = (
+        "Ergänzt Bildabmessungen, Platzhalter und Bildgrößen für Rezepte, deren "
+        "Bild vor dieser Funktion hochgeladen wurde. Standardmäßig als Jobs für "
+        "runworker, mit --now direkt."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--now", action="store_true", help="Direkt ausführen statt Jobs einzureihen")
+        parser.add_argument("--all", action="store_true", help="Auch Rezepte mit vollständigen Angaben neu berechnen")
+
+    def handle(self, *args, **options):
+        qs = Recipe.objects.exclude(Q(image="") | Q(image__isnull=True))
+        if not options["all"]:
+            qs = qs.filter(
+                Q(image_width__isnull=True) | Q(image_placeholder__isnull=True) | ~Q(renditions__has_key="sizes")
+            )
+
+        count = 0
+        for recipe_id in qs.values_list("id", flat=True).iterator():
+            if options["now"]:
+                try:
+                    build_renditions(recipe_id=recipe_id)
+                except OSError as exc:
+                    self.stderr.write(f"Rezept {recipe_id}: {exc}")
+                    continue
+            else:
+                build_renditions.enqueue(recipe_id=recipe_id)
+            count += 1
+
+        action = "aktualisiert" if options["now"] else "als Jobs eingereiht"
+        self.stdout.write(self.style.SUCCESS(f"{count} Rezepte {action}."))
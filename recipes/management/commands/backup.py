@@ -0,0 +1,60 @@
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from recipes import backups
+
+
+class Command(BaseCommand):
+    help = (
+        "Sichert Datenbank und Medien im laufenden Betrieb. Die Datenbank wird "
+        "schrittweise über die SQLite-Backup-API kopiert, Medien nur, wenn sie neu "
+        "oder geändert sind."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dest", help="Zielverzeichnis (Standard: BACKUP_ROOT)")
+        parser.add_argument(
+            "--pages", type=int, default=256,
+            help="Seiten pro Kopierschritt; dazwischen können andere Prozesse schreiben",
+        )
+        parser.add_argument(
+            "--sleep", type=float, default=0.005,
+            help="Pause in Sekunden zwischen den Kopierschritten",
+        )
+        parser.add_argument(
+            "--verify", action="store_true",
+            help="Prüfsummen aller vorhandenen Objekte nachrechnen (sonst nur die Größe)",
+        )
+        parser.add_argument(
+            "--keep", type=int, default=0,
+            help="Nur die neuesten N Snapshots behalten (0 = alle)",
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor != "sqlite":
+            raise CommandError("Online-Backups werden nur für SQLite unterstützt.")
+
+        root = backups.backup_root() if not options["dest"] else Path(options["dest"])
+        started = time.monotonic()
+        snapshot, copied = backups.create_snapshot(
+            root,
+            database=connection.settings_dict["NAME"],
+            media_root=settings.MEDIA_ROOT,
+            pages=options["pages"],
+            sleep=options["sleep"],
+            verify=options["verify"],
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Snapshot {snapshot.name} erstellt ({copied} neue Mediendateien, "
+                f"{time.monotonic() - started:.1f} s)."
+            )
+        )
+
+        if options["keep"]:
+            removed = backups.prune(root, options["keep"])
+            self.stdout.write(f"Alte Snapshots entfernt, {removed} Objekte gelöscht.")
@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand
+from django.http import QueryDict
+
+from recipes import export
+from recipes.models import Recipe
+from recipes.views import filter_recipes
+
+
+class Command(BaseCommand):
+    help = (
+        "Exportiert alle Rezepte (oder eine gefilterte Auswahl) als ZIP mit "
+        "statischen HTML-Seiten, Übersicht und Bildern."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("output", help="Zieldatei, z. B. rezepte.zip")
+        parser.add_argument(
+            "--filter", default="",
+            help='Filter wie in der Übersicht, z. B. "max_duration=30&category_labels=3"',
+        )
+        parser.add_argument(
+            "--workers", type=int, default=export.EXPORT_WORKERS,
+            help="Threads zum Rendern der Seiten",
+        )
+
+    def handle(self, *args, **options):
+        qs = filter_recipes(Recipe.objects.order_by("title"), QueryDict(options["filter"]))
+        size = 0
+        with open(options["output"], "wb") as handle:
+            for chunk in export.iter_zip(qs, workers=options["workers"]):
+                handle.write(chunk)
+                size += len(chunk)
+        self.stdout.write(self.style.SUCCESS(
+            f"{qs.count()} Rezepte nach {options['output']} exportiert ({size / 1024 / 1024:.1f} MB)."
+        ))
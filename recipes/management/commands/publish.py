@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from recipes import publish
+
+
+class Command(BaseCommand):
+    help = (
+        "Rendert Übersicht, Detail- und Kochansichten als statisches HTML nach "
+        "PUBLISH_ROOT (inkl. manifest.json). Danach halten Jobs die Seiten aktuell."
+    )
+
+    def handle(self, *args, **options):
+        root = publish.publish_root()
+        if root is None:
+            raise CommandError("PUBLISH_ROOT ist nicht gesetzt.")
+        count = publish.publish_all()
+        self.stdout.write(self.style.SUCCESS(f"{count} Seiten nach {root} veröffentlicht."))
@@ -0,0 +1,77 @@
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from recipes import backups, facets, publish, suggest
+
+
+class Command(BaseCommand):
+    help = "Stellt einen mit 'backup' erstellten Snapshot nach Prüfung aller Prüfsummen wieder her."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "snapshot", nargs="?", default="latest",
+            help="Name des Snapshots (Standard: der neueste)",
+        )
+        parser.add_argument("--dest", help="Backup-Verzeichnis (Standard: BACKUP_ROOT)")
+        parser.add_argument(
+            "--verify-only", action="store_true",
+            help="Nur Prüfsummen kontrollieren, nichts zurückspielen",
+        )
+        parser.add_argument(
+            "--noinput", "--no-input", action="store_false", dest="interactive",
+            help="Keine Rückfrage vor dem Überschreiben",
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor != "sqlite":
+            raise CommandError("Wiederherstellung wird nur für SQLite unterstützt.")
+
+        root = backups.backup_root() if not options["dest"] else Path(options["dest"])
+        available = backups.snapshots(root)
+        if not available:
+            raise CommandError(f"Keine Snapshots in {root} gefunden.")
+
+        if options["snapshot"] == "latest":
+            snapshot = available[-1]
+        else:
+            snapshot = root / "snapshots" / options["snapshot"]
+            if snapshot not in available:
+                raise CommandError(f"Snapshot {options['snapshot']} nicht gefunden.")
+
+        errors = backups.verify_snapshot(root, snapshot)
+        if errors:
+            for error in errors:
+                self.stderr.write(error)
+            raise CommandError(f"Snapshot {snapshot.name} ist beschädigt, es wurde nichts verändert.")
+        self.stdout.write(f"Snapshot {snapshot.name}: alle Prüfsummen in Ordnung.")
+
+        if options["verify_only"]:
+            return
+
+        if options["interactive"]:
+            answer = input(
+                "Datenbank und Medien werden mit dem Snapshot überschrieben. "
+                "Fortfahren? Tippe 'yes': "
+            )
+            if answer != "yes":
+                raise CommandError("Abgebrochen.")
+
+        connection.close()
+        restored = backups.restore_snapshot(
+            root, snapshot,
+            database=connection.settings_dict["NAME"],
+            media_root=settings.MEDIA_ROOT,
+        )
+        # die Signale sehen das Zurückspielen nicht: Indizes und
+        # veröffentlichte Seiten gehören sonst noch zum alten Stand
+        facets.invalidate()
+        suggest.invalidate()
+        if publish.enabled():
+            count = publish.publish_all()
+            self.stdout.write(f"{count} Seiten neu veröffentlicht.")
+        self.stdout.write(self.style.SUCCESS(
+            f"Snapshot {snapshot.name} wiederhergestellt ({restored} Mediendateien zurückkopiert)."
+        ))
@@ -0,0 +1,105 @@
+import multiprocessing
+import signal
+import threading
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from recipes import jobs
+from recipes.processes import setup_child
+
+
+def _process_main(poll_interval):
+    setup_child()
+    stop_event = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *args: stop_event.set())
+    jobs.work(stop_event, poll_interval)
+
+
+class Command(BaseCommand):
+    help = "Arbeitet die Hintergrund-Jobs aus der Datenbank-Warteschlange ab."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers", type=int,
+            default=getattr(settings, "JOB_WORKERS", 2),
+            help="Anzahl paralleler Worker",
+        )
+        parser.add_argument(
+            "--processes", action="store_true",
+            help="Prozesse statt Threads verwenden (für CPU-lastige Jobs)",
+        )
+        parser.add_argument(
+            "--poll-interval", type=float,
+            default=getattr(settings, "JOB_POLL_INTERVAL", 2.0),
+            help="Wartezeit in Sekunden, wenn keine Jobs anstehen",
+        )
+        parser.add_argument(
+            "--once", action="store_true",
+            help="Nur alle fälligen Jobs abarbeiten und dann beenden",
+        )
+
+    def handle(self, *args, **options):
+        requeued = jobs.requeue_stale()
+        if requeued:
+            self.stdout.write(f"{requeued} hängengebliebene Jobs wieder eingereiht.")
+        purged = jobs.purge_done()
+        if purged:
+            self.stdout.write(f"{purged} erledigte Jobs gelöscht.")
+
+        if options["once"]:
+            count = jobs.run_pending()
+            self.stdout.write(self.style.SUCCESS(f"{count} Jobs abgearbeitet."))
+            return
+
+        workers = max(1, options["workers"])
+        poll_interval = options["poll_interval"]
+        kind = "Prozesse" if options["processes"] else "Threads"
+        self.stdout.write(f"Starte {workers} Worker ({kind}), Abbruch mit Strg+C.")
+
+        if options["processes"]:
+            self._run_processes(workers, poll_interval)
+        else:
+            self._run_threads(workers, poll_interval)
+
+    def _run_threads(self, workers, poll_interval):
+        stop_event = threading.Event()
+
+        def run():
+            try:
+                jobs.work(stop_event, poll_interval)
+            finally:
+                connections.close_all()
+
+        threads = [threading.Thread(target=run, daemon=True) for _ in range(workers)]
+        for thread in threads:
+            thread.start()
+        try:
+            while any(thread.is_alive() for thread in threads):
+                for thread in threads:
+                    thread.join(timeout=1)
+        except KeyboardInterrupt:
+            self.stdout.write("Beende Worker ...")
+            stop_event.set()
+            for thread in threads:
+                thread.join()
+
+    def _run_processes(self, workers, poll_interval):
+        # Verbindungen nicht in die Kind-Prozesse vererben
+        connections.close_all()
+        processes = [
+            multiprocessing.Process(target=_process_main, args=(poll_interval,))
+            for _ in range(workers)
+        ]
+        for process in processes:
+            process.start()
+        try:
+            for process in processes:
+                process.join()
+        except KeyboardInterrupt:
+            self.stdout.write("Beende Worker ...")
+            for process in processes:
+                process.terminate()
+            for process in processes:
+                process.join()
@@ -0,0 +1,42 @@
+import urllib.request
+
+from django.core.management.base import BaseCommand, CommandError
+
+from recipes import assets
+
+
+class Command(BaseCommand):
+    help = (
+        "Lädt Bootstrap, Bootstrap Icons und Tom Select in den festgelegten "
+        "Versionen nach recipes/static/vendor/, damit die Seiten ohne CDN laufen."
+    )
+    # die Systemprüfung meldet gerade die fehlenden Dateien, die hier geladen werden
+    requires_system_checks = []
+
+    def add_arguments(self, parser):
+        parser.add_argument("--force", action="store_true", help="Vorhandene Dateien erneut herunterladen")
+        parser.add_argument("--timeout", type=float, default=30, help="Timeout pro Datei in Sekunden")
+
+    def handle(self, *args, **options):
+        failed = []
+        for name in assets.VENDOR_ASSETS:
+            target = assets.VENDOR_DIR / name
+            if target.exists() and not options["force"]:
+                self.stdout.write(f"  {name} vorhanden")
+                continue
+            url = assets.cdn_url(name)
+            try:
+                with urllib.request.urlopen(url, timeout=options["timeout"]) as response:
+                    data = response.read()
+            except OSError as exc:
+                failed.append(name)
+                self.stderr.write(f"  {name}: {exc}")
+                continue
+            target.parent.mkdir(parents=True, exist_ok=True)
+            target.write_bytes(data)
+            self.stdout.write(f"  {name} ({len(data) / 1024:.0f} KB)")
+
+        assets.is_vendored.cache_clear()
+        if failed:
+            raise CommandError(f"{len(failed)} Dateien konnten nicht geladen werden.")
+        self.stdout.write(self.style.SUCCESS("Alle Fremdbibliotheken liegen lokal vor."))
@@ -0,0 +1,60 @@
+# Generated by Django 6.0 on 2026-10-19 10:17
+
+import datetime
+
+import django.db.models.deletion
+import recipes.models
+from django.conf import settings
+from django.db import migrations, models
+
+
+def assign_legacy_plan(apps, schema_editor):
+    # Der bisherige globale Plan (week_start 2000-01-01) gehört niemandem.
+    # Er wird dem ersten Admin (sonst dem ersten Benutzer) als aktuelle Woche übergeben.
+    WeeklyPlan = apps.get_model("recipes", "WeeklyPlan")
+    User = apps.get_model(*settings.AUTH_USER_MODEL.split("."))
+    owner = (
+        User.objects.filter(is_superuser=True).order_by("id").first()
+        or User.objects.order_by("id").first()
+    )
+    if owner is None:
+        return
+    plan = (
+        WeeklyPlan.objects.filter(user__isnull=True, week_start=datetime.date(2000, 1, 1)).first()
+        or WeeklyPlan.objects.filter(user__isnull=True).order_by("-id").first()
+    )
+    if plan is None:
+        return
+    plan.user = owner
+    plan.week_start = recipes.models.current_week_start()
+    plan.save(update_fields=["user", "week_start"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0009_weeklyplanentry_comment'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='weeklyplan',
+            options={'ordering': ['-week_start']},
+        ),
+        migrations.AddField(
+            model_name='weeklyplan',
+            name='user',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='weekly_plans', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AlterField(
+            model_name='weeklyplan',
+            name='week_start',
+            field=models.DateField(default=recipes.models.current_week_start),
+        ),
+        migrations.RunPython(assign_legacy_plan, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='weeklyplan',
+            constraint=models.UniqueConstraint(fields=('user', 'week_start'), name='weeklyplan_unique_user_week'),
+        ),
+    ]
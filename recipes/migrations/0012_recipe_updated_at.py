@@ -0,0 +1,18 @@
+# Generated by Django 6.0 on 2026-10-19 10:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0011_recipe_renditions_job'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='recipe',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, help_text='Zuletzt geändert (dient auch als Cache-Version)'),
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 6.0 on 2026-10-19 10:23
+
+from django.db import migrations, models
+
+import recipes.search
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0012_recipe_updated_at'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='label',
+            name='name',
+            field=models.CharField(db_index=True, max_length=100),
+        ),
+        migrations.AlterField(
+            model_name='recipe',
+            name='cooked_count',
+            field=models.PositiveIntegerField(db_index=True, default=0, help_text='So oft wurde das Rezept schon gekocht'),
+        ),
+        migrations.AlterField(
+            model_name='recipe',
+            name='duration_minutes',
+            field=models.PositiveIntegerField(blank=True, db_index=True, help_text='Gesamtdauer des Rezepts in Minuten', null=True),
+        ),
+        migrations.AlterField(
+            model_name='recipe',
+            name='title',
+            field=models.CharField(db_index=True, help_text='Titel', max_length=200),
+        ),
+        migrations.AlterField(
+            model_name='recipe',
+            name='working_time',
+            field=models.PositiveIntegerField(blank=True, db_index=True, help_text='Arbeitsdauer des Rezepts in Minuten', null=True),
+        ),
+        # nach den AlterFields, da SQLite dabei die Tabelle neu aufbaut
+        migrations.RunPython(recipes.search.install_fts, recipes.search.uninstall_fts),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 6.0 on 2026-10-19 16:40
+
+from django.db import migrations
+
+import recipes.search
+
+
+def use_trigram(apps, schema_editor):
+    recipes.search.uninstall_fts(apps, schema_editor)
+    recipes.search.install_fts(apps, schema_editor, tokenizer="trigram")
+
+
+def use_unicode61(apps, schema_editor):
+    recipes.search.uninstall_fts(apps, schema_editor)
+    recipes.search.install_fts(apps, schema_editor, tokenizer="unicode61 remove_diacritics 2")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0014_recipe_image_dimensions'),
+    ]
+
+    operations = [
+        migrations.RunPython(use_trigram, use_unicode61),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 6.0 on 2026-10-19 18:05
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def delete_ownerless_plans(apps, schema_editor):
+    # Pläne ohne Benutzer (0010 übernimmt nur den alten globalen Plan) sieht
+    # niemand mehr; für die Eindeutigkeit (user, week_start) zählen sie nicht
+    WeeklyPlan = apps.get_model("recipes", "WeeklyPlan")
+    WeeklyPlan.objects.filter(user__isnull=True).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0015_recipe_fts_trigram'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(delete_ownerless_plans, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='weeklyplan',
+            name='user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='weekly_plans', to=settings.AUTH_USER_MODEL),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 6.0 on 2026-10-19 11:19
+
+import recipes.models
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('recipes', '0016_weeklyplan_user_required'),
+    ]
+
+    # Nur der Modellzustand ändert sich. Ein AlterField würde die Tabelle unter
+    # SQLite neu anlegen und dabei die Trigger der Volltextsuche verwerfen.
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AlterField(
+                    model_name='recipe',
+                    name='image',
+                    field=recipes.models.RecipeImageField(blank=True, height_field='image_height', help_text='Hauptbild', null=True, upload_to='recipes/', width_field='image_width'),
+                ),
+            ],
+        ),
+    ]
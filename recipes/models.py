@@ -1,12 +1,29 @@
-from django.db import models
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db import models, transaction
 from django.urls import reverse
 from django.utils.text import slugify
 from django.utils import timezone
 
+class RecipeImageField(models.ImageField):
+    """``ImageField``, das Breite und Höhe nur beim Zuweisen eines Bilds liest.
+
+    Django öffnet sonst bei jedem Laden eines Rezepts ohne Abmessungen (Bilder
+    von vor ``backfill_images``) die Bilddatei – in Listen für jedes Rezept.
+    """
+
+    def update_dimension_fields(self, instance, force=False, *args, **kwargs):
+        if force:
+            super().update_dimension_fields(instance, force, *args, **kwargs)
+
+
 # Rezeptmodell
 class Recipe(models.Model):
     title = models.CharField(
         max_length=200,
+        db_index=True,
         help_text="Titel"
     )
     slug = models.SlugField(
@@ -18,8 +35,10 @@ class Recipe(models.Model):
         null=True,
         blank=True,
     )
-    image = models.ImageField(
+    image = RecipeImageField(
         upload_to='recipes/',
+        width_field='image_width',
+        height_field='image_height',
         blank=True,
         null=True,
         help_text="Hauptbild"
@@ -32,11 +51,13 @@ class Recipe(models.Model):
     duration_minutes = models.PositiveIntegerField(
         null=True,
         blank=True,
+        db_index=True,
         help_text="Gesamtdauer des Rezepts in Minuten"
     )
     working_time = models.PositiveIntegerField(
         null=True,
         blank=True,
+        db_index=True,
         help_text="Arbeitsdauer des Rezepts in Minuten"
     )
     temperature_celsius = models.PositiveIntegerField(
@@ -58,6 +79,7 @@ class Recipe(models.Model):
     )
     cooked_count = models.PositiveIntegerField(
         default=0,
+        db_index=True,
         help_text="So oft wurde das Rezept schon gekocht"
     )
     external_link = models.URLField(
@@ -65,6 +87,34 @@ class Recipe(models.Model):
         null=True,
         help_text="Fügen Sie einen externen Link hinzu."
     )  # Neues Feld für den externen Link
+    renditions = models.JSONField(
+        default=dict,
+        blank=True,
+        editable=False,
+        help_text="Im Hintergrund erzeugte Bildgrößen"
+    )
+    image_width = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        editable=False,
+        help_text="Breite des Hauptbilds in Pixeln"
+    )
+    image_height = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        editable=False,
+        help_text="Höhe des Hauptbilds in Pixeln"
+    )
+    image_placeholder = models.TextField(
+        null=True,
+        blank=True,
+        editable=False,
+        help_text="Unscharfe Mini-Vorschau (Data-URI), bis das Bild geladen ist"
+    )
+    updated_at = models.DateTimeField(
+        auto_now=True,
+        help_text="Zuletzt geändert (dient auch als Cache-Version)"
+    )
 
     def save(self, *args, **kwargs):
         if not self.slug:
@@ -75,8 +125,54 @@ class Recipe(models.Model):
                 counter += 1
                 slug = f"{base_slug}-{counter}"
             self.slug = slug
+        # Breite und Höhe setzt das Bildfeld beim Hochladen (der Job korrigiert
+        # sie bei EXIF-Drehung); der Platzhalter gehört zum alten Bild
+        if self.renditions_outdated() and kwargs.get("update_fields") is None:
+            self.image_placeholder = None
         super().save(*args, **kwargs)
 
+        # Bildgrößen nicht im Request erzeugen, sondern als Job einreihen
+        if self.renditions_outdated():
+            from .tasks import build_renditions
+            transaction.on_commit(lambda: build_renditions.enqueue(recipe_id=self.pk))
+
+    def renditions_outdated(self):
+        return bool(self.image) and self.renditions.get("source") != self.image.name
+
+    def image_url_for(self, name):
+        """URL einer Bildgröße (z. B. ``thumb``), sonst das Originalbild."""
+        if not self.image:
+            return ""
+        path = None if self.renditions_outdated() else self.renditions.get(name)
+        if path:
+            return default_storage.url(path)
+        return self.image.url
+
+    def image_size_for(self, name):
+        """``(breite, höhe)`` passend zu ``image_url_for(name)``, sonst ``(None, None)``."""
+        if not self.image:
+            return None, None
+        size = None if self.renditions_outdated() else self.renditions.get("sizes", {}).get(name)
+        if size and self.renditions.get(name):
+            return tuple(size)
+        return self.image_width, self.image_height
+
+    @property
+    def thumb_url(self):
+        return self.image_url_for("thumb")
+
+    @property
+    def thumb_size(self):
+        return self.image_size_for("thumb")
+
+    @property
+    def large_url(self):
+        return self.image_url_for("large")
+
+    @property
+    def large_size(self):
+        return self.image_size_for("large")
+
     def get_absolute_url(self):
         return reverse("recipes:detail", kwargs={"slug": self.slug})
 
@@ -93,19 +189,92 @@ class Label(models.Model):
         (CATEGORY, "Kategorie"),
     ]
 
-    name = models.CharField(max_length=100)
+    name = models.CharField(max_length=100, db_index=True)
     label_type = models.CharField(max_length=20, choices=LABEL_TYPES)
 
     def __str__(self):
         return self.name
 
+def split_lines(text):
+    """Zutaten/Schritte: eine pro Zeile, ohne Leerzeilen."""
+    return [line.strip() for line in (text or "").splitlines() if line.strip()]
+
+
+def week_start_for(day):
+    """Liefert den Montag der Woche, in der ``day`` liegt."""
+    return day - timedelta(days=day.weekday())
+
+
+def current_week_start():
+    return week_start_for(timezone.localdate())
+
+
+class WeeklyPlanQuerySet(models.QuerySet):
+    def recent(self, user, weeks=8, until=None):
+        """Pläne der letzten ``weeks`` Wochen (inkl. der Woche von ``until``).
+
+        Läuft als Bereichsabfrage über den (user, week_start)-Index.
+        """
+        until = week_start_for(until or timezone.localdate())
+        since = until - timedelta(weeks=weeks - 1)
+        return self.filter(user=user, week_start__range=(since, until))
+
+
 # Wochenplanmodell
 class WeeklyPlan(models.Model):
-    week_start = models.DateField(default=timezone.now)
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        related_name="weekly_plans",
+        on_delete=models.CASCADE,
+    )
+    week_start = models.DateField(default=current_week_start)
+
+    objects = WeeklyPlanQuerySet.as_manager()
+
+    class Meta:
+        ordering = ["-week_start"]
+        constraints = [
+            # eindeutiger Index, deckt auch die Bereichsabfragen über week_start ab
+            models.UniqueConstraint(
+                fields=["user", "week_start"],
+                name="weeklyplan_unique_user_week",
+            ),
+        ]
+
+    @classmethod
+    def find(cls, user, week_start):
+        """Plan der Woche oder ``None`` – zum Anzeigen, legt nichts an."""
+        return cls.objects.filter(user=user, week_start=week_start_for(week_start)).first()
+
+    @classmethod
+    def for_week(cls, user, week_start):
+        """Plan der Woche, bei Bedarf neu angelegt – nur beim Eintragen verwenden."""
+        plan, _ = cls.objects.get_or_create(user=user, week_start=week_start_for(week_start))
+        return plan
+
+    def copy_entries_from(self, other):
+        """Übernimmt alle Einträge eines anderen Plans (z. B. der Vorwoche).
+
+        Schon vorhandene Einträge (gleicher Tag, gleiches Rezept) werden
+        übersprungen – ein doppelter Klick oder Reload verdoppelt nichts.
+        """
+        existing = set(self.entries.values_list("day", "recipe_id"))
+        WeeklyPlanEntry.objects.bulk_create([
+            WeeklyPlanEntry(plan=self, day=entry.day, recipe_id=entry.recipe_id, comment=entry.comment)
+            for entry in other.entries.all()
+            if (entry.day, entry.recipe_id) not in existing
+        ])
 
     def __str__(self):
         return f"Wochenplan ab {self.week_start}"
 
+
+def recently_planned_recipe_ids(user, weeks=8, until=None):
+    """IDs aller Rezepte, die in den letzten ``weeks`` Wochen eingeplant waren."""
+    return WeeklyPlanEntry.objects.filter(
+        plan__in=WeeklyPlan.objects.recent(user, weeks=weeks, until=until)
+    ).values_list("recipe_id", flat=True).distinct()
+
 # Wochentage für den Plan
 DAY_CHOICES = [
     ('Monday', 'Montag'),
@@ -128,4 +297,47 @@ class WeeklyPlanEntry(models.Model):
         ordering = ['day', 'id']  # damit die Einträge in Tagesreihenfolge angezeigt werden
 
     def __str__(self):
-        return f"{self.day}: {self.recipe.title}"
\ No newline at end of file
+        return f"{self.day}: {self.recipe.title}"
+
+
+# Hintergrund-Jobs (siehe recipes/jobs.py)
+class Job(models.Model):
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+    STATUSES = [
+        (QUEUED, "Wartend"),
+        (RUNNING, "Läuft"),
+        (DONE, "Erledigt"),
+        (FAILED, "Fehlgeschlagen"),
+    ]
+
+    name = models.CharField(max_length=100)
+    payload = models.JSONField(default=dict, blank=True)
+    dedupe_key = models.CharField(max_length=200, null=True, blank=True)
+    status = models.CharField(max_length=10, choices=STATUSES, default=QUEUED)
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=3)
+    run_after = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["-id"]
+        indexes = [
+            models.Index(fields=["status", "run_after"], name="job_status_run_after"),
+        ]
+        constraints = [
+            # pro Schlüssel höchstens ein wartender Job
+            models.UniqueConstraint(
+                fields=["dedupe_key"],
+                condition=models.Q(status="queued"),
+                name="job_unique_queued_dedupe_key",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.name} ({self.get_status_display()})"
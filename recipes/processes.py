@@ -0,0 +1,9 @@
+"""Gemeinsamer Start für Kind-Prozesse (``runworker --processes``, ``loadtest --processes``)."""
+import django
+from django.db import connections
+
+
+def setup_child():
+    # Django ggf. initialisieren (spawn) und eigene Verbindungen aufbauen
+    django.setup()
+    connections.close_all()
@@ -0,0 +1,210 @@
+"""Veröffentlichung der öffentlichen Seiten als statisches HTML.
+
+Ist ``PUBLISH_ROOT`` gesetzt, werden die Übersicht (ohne Filter) sowie
+Detail- und Kochansicht jedes Rezepts so gerendert, wie ein nicht
+angemeldeter Besucher sie sieht, und unter ihrem URL-Pfad abgelegt::
+
+    PUBLISH_ROOT/recipes/index.html
+    PUBLISH_ROOT/recipes/<slug>/index.html
+    PUBLISH_ROOT/recipes/<slug>/cook/index.html
+    PUBLISH_ROOT/manifest.json
+
+Jede Datei liegt zusätzlich als ``.gz`` daneben (``gzip_static``). Ändert
+sich ein Rezept oder Label, rendern Jobs nur die betroffenen Seiten neu
+(siehe ``recipes/signals.py``); ``python manage.py publish`` erzeugt alles.
+
+nginx liefert die Dateien nur an Anfragen ohne Query-String und ohne
+Session-Cookie aus, alles andere geht weiter an Django::
+
+    map "$cookie_sessionid$args" $published {
+        ""      /publish;
+        default /-;
+    }
+    location /recipes/ {
+        root /srv/rezepte/var;
+        gzip_static on;
+        try_files $published$uri/index.html @django;
+    }
+"""
+import fcntl
+import gzip
+import hashlib
+import json
+import os
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+from django.conf import settings
+from django.core.handlers.base import BaseHandler
+from django.db import transaction
+from django.test import RequestFactory
+from django.urls import reverse
+from django.utils import timezone
+
+MANIFEST_NAME = "manifest.json"
+INDEX = "index"
+
+_lock = threading.Lock()
+_handler = None
+
+
+def publish_root():
+    root = getattr(settings, "PUBLISH_ROOT", None)
+    return Path(root) if root else None
+
+
+def enabled():
+    return publish_root() is not None
+
+
+def recipe_paths(recipe):
+    return [
+        reverse("recipes:detail", kwargs={"slug": recipe.slug}),
+        reverse("recipes:cook", kwargs={"slug": recipe.slug}),
+    ]
+
+
+def file_for(root, url_path):
+    return root / url_path.strip("/") / "index.html"
+
+
+def _publish_host():
+    hosts = [host for host in settings.ALLOWED_HOSTS if host != "*" and not host.startswith(".")]
+    return getattr(settings, "PUBLISH_HOST", None) or (hosts[0] if hosts else "localhost")
+
+
+def render_anonymous(url_path):
+    """Rendert ``url_path`` mit allen Middlewares als nicht angemeldeter Besucher."""
+    global _handler
+    if _handler is None:
+        handler = BaseHandler()
+        handler.load_middleware()
+        _handler = handler
+    request = RequestFactory(SERVER_NAME=_publish_host()).get(url_path)
+    response = _handler.get_response(request)
+    if response.status_code != 200:
+        return None
+    # Übersicht und Wochenplan werden gestreamt (recipes/streaming.py)
+    return response.getvalue()
+
+
+def _write(path, content):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    for target, data in ((path, content), (path.with_name(path.name + ".gz"), gzip.compress(content, 9))):
+        tmp = target.with_name(target.name + ".tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, target)
+
+
+def _remove(path):
+    for target in (path, path.with_name(path.name + ".gz")):
+        if target.exists():
+            target.unlink()
+    # leere Verzeichnisse (z. B. nach Slug-Änderung) aufräumen
+    for parent in (path.parent, path.parent.parent):
+        try:
+            parent.rmdir()
+        except OSError:
+            break
+
+
+@contextmanager
+def _manifest(root):
+    """Liest das Manifest unter einer Datei-Sperre und schreibt es danach zurück."""
+    root.mkdir(parents=True, exist_ok=True)
+    with _lock, open(root / ".lock", "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        path = root / MANIFEST_NAME
+        try:
+            manifest = json.loads(path.read_text(encoding="utf-8"))
+        except (FileNotFoundError, ValueError):
+            manifest = {"pages": {}}
+        yield manifest
+        manifest["updated"] = timezone.now().isoformat()
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_text(json.dumps(manifest, indent=1, sort_keys=True), encoding="utf-8")
+        os.replace(tmp, path)
+
+
+def _publish_pages(root, manifest, owner, url_paths):
+    """Rendert ``url_paths`` für ``owner`` (Rezept-ID oder ``index``) und entfernt ältere Seiten."""
+    pages = manifest["pages"]
+    for url_path, entry in list(pages.items()):
+        if entry["owner"] == owner and url_path not in url_paths:
+            _remove(root / entry["file"])
+            del pages[url_path]
+
+    for url_path in url_paths:
+        content = render_anonymous(url_path)
+        target = file_for(root, url_path)
+        if content is None:
+            _remove(target)
+            pages.pop(url_path, None)
+            continue
+        digest = hashlib.sha256(content).hexdigest()
+        previous = pages.get(url_path)
+        # unveränderte Seiten nicht neu schreiben: kein gzip, Datei und mtime bleiben
+        if not (previous and previous["sha256"] == digest and target.exists()):
+            _write(target, content)
+        pages[url_path] = {
+            "file": target.relative_to(root).as_posix(),
+            "owner": owner,
+            "sha256": digest,
+            "size": len(content),
+        }
+
+
+def schedule(recipe_ids=(), index=True):
+    """Reiht nach dem Commit Jobs für die betroffenen Seiten ein (mehrfache Änderungen werden zusammengefasst)."""
+    if not enabled():
+        return
+    from . import tasks
+
+    recipe_ids = set(recipe_ids)
+
+    def enqueue():
+        for recipe_id in recipe_ids:
+            tasks.publish_recipe.enqueue(recipe_id=recipe_id)
+        if index:
+            tasks.publish_index.enqueue()
+
+    transaction.on_commit(enqueue)
+
+
+def publish_recipe(recipe_id):
+    """Veröffentlicht Detail- und Kochansicht eines Rezepts neu (oder entfernt sie)."""
+    from .models import Recipe
+
+    root = publish_root()
+    if root is None:
+        return
+    recipe = Recipe.objects.filter(pk=recipe_id).only("id", "slug").first()
+    with _manifest(root) as manifest:
+        _publish_pages(root, manifest, recipe_id, recipe_paths(recipe) if recipe else [])
+
+
+def publish_index():
+    root = publish_root()
+    if root is None:
+        return
+    with _manifest(root) as manifest:
+        _publish_pages(root, manifest, INDEX, [reverse("recipes:index")])
+
+
+def publish_all():
+    """Alle Seiten neu erzeugen; liefert die Anzahl veröffentlichter Seiten."""
+    from .models import Recipe
+
+    root = publish_root()
+    if root is None:
+        return 0
+    recipe_ids = list(Recipe.objects.values_list("id", flat=True))
+    with _manifest(root) as manifest:
+        # Seiten gelöschter Rezepte entfernen
+        for owner in {entry["owner"] for entry in manifest["pages"].values()} - {INDEX, *recipe_ids}:
+            _publish_pages(root, manifest, owner, [])
+        _publish_pages(root, manifest, INDEX, [reverse("recipes:index")])
+        for recipe in Recipe.objects.only("id", "slug").iterator():
+            _publish_pages(root, manifest, recipe.id, recipe_paths(recipe))
+        return len(manifest["pages"])
@@ -0,0 +1,65 @@
+"""Verkleinerte Bildvarianten (Renditions) der Rezeptbilder."""
+import base64
+from io import BytesIO
+from pathlib import PurePosixPath
+
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image, ImageOps
+
+# Name → maximale Breite in Pixeln
+RENDITION_WIDTHS = {
+    "thumb": 480,
+    "large": 1280,
+}
+
+# Breite des unscharfen Platzhalters (LQIP), der inline im HTML steht
+PLACEHOLDER_WIDTH = 16
+
+
+def rendition_path(image_name, name):
+    # ganzer Name samt Endung: foo.jpg und foo.png dürfen sich nicht überschreiben
+    return f"renditions/{name}/{PurePosixPath(image_name).as_posix()}.webp"
+
+
+def placeholder_data_uri(image):
+    """Winzige WebP-Vorschau als Data-URI (wenige hundert Bytes)."""
+    small = image.copy()
+    small.thumbnail((PLACEHOLDER_WIDTH, PLACEHOLDER_WIDTH * 4))
+    buffer = BytesIO()
+    small.save(buffer, "WEBP", quality=30)
+    return "data:image/webp;base64," + base64.b64encode(buffer.getvalue()).decode("ascii")
+
+
+def build_renditions(image_file):
+    """Erzeugt alle Bildgrößen.
+
+    Liefert ``(renditions, details)``: ``{name: pfad}`` inkl. ``source`` und
+    ``sizes`` sowie Abmessungen und Platzhalter des Originals als Feldwerte
+    für ``Recipe``.
+    """
+    result = {"source": image_file.name, "sizes": {}}
+    with image_file.open("rb"), Image.open(image_file) as original:
+        # Abmessungen nach dem Drehen laut EXIF, so wie das Bild angezeigt wird
+        original = ImageOps.exif_transpose(original)
+        if original.mode not in ("RGB", "RGBA"):
+            original = original.convert("RGB")
+
+        details = {
+            "image_width": original.width,
+            "image_height": original.height,
+            "image_placeholder": placeholder_data_uri(original),
+        }
+
+        for name, width in RENDITION_WIDTHS.items():
+            image = original.copy()
+            image.thumbnail((width, width * 4))
+            buffer = BytesIO()
+            image.save(buffer, "WEBP", quality=80, method=4)
+
+            path = rendition_path(image_file.name, name)
+            if default_storage.exists(path):
+                default_storage.delete(path)
+            result[name] = default_storage.save(path, ContentFile(buffer.getvalue()))
+            result["sizes"][name] = [image.width, image.height]
+    return result, details
@@ -0,0 +1,107 @@
+"""Volltextsuche über Titel und Zutaten.
+
+Auf SQLite wird die FTS5-Tabelle ``recipes_recipe_fts`` benutzt, die per
+Migration angelegt und über Trigger aktuell gehalten wird. Sie nutzt den
+``trigram``-Tokenizer, findet also wie ``icontains`` Teilwörter – wichtig
+für zusammengesetzte Wörter ("knödel" in "Semmelknödel"). Wörter unter drei
+Zeichen, andere Datenbanken und SQLite ohne Trigram (vor 3.34) fallen auf
+``icontains`` zurück.
+"""
+import re
+
+from django.db import OperationalError, connection
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+FTS_TABLE = "recipes_recipe_fts"
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+# kürzere Wörter kann der Trigram-Index nicht suchen
+MIN_FTS_TOKEN = 3
+TOKENIZER = "trigram"
+
+# Hinweis: SQLite baut die Tabelle bei vielen AlterField/AddField-Migrationen
+# neu auf und verwirft dabei die Trigger. Solche Migrationen müssen danach
+# ``install_fts`` erneut ausführen (siehe 0013_recipe_search_indexes).
+FTS_SQL = [
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        title, ingredients,
+        content='recipes_recipe', content_rowid='id',
+        tokenize='{{tokenizer}}'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON recipes_recipe BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, title, ingredients) VALUES (new.id, new.title, new.ingredients);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON recipes_recipe BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, ingredients)
+        VALUES ('delete', old.id, old.title, old.ingredients);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF title, ingredients ON recipes_recipe BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, ingredients)
+        VALUES ('delete', old.id, old.title, old.ingredients);
+        INSERT INTO {FTS_TABLE}(rowid, title, ingredients) VALUES (new.id, new.title, new.ingredients);
+    END""",
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')",
+]
+
+_available = {}
+
+
+def install_fts(apps, schema_editor, tokenizer=TOKENIZER):
+    """Legt FTS-Tabelle und Trigger an (idempotent) und baut den Index neu auf."""
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    try:
+        schema_editor.execute(FTS_SQL[0].format(tokenizer=tokenizer))
+    except OperationalError:
+        # SQLite ohne FTS5 bzw. ohne diesen Tokenizer: Suche per icontains
+        return
+    for statement in FTS_SQL[1:]:
+        schema_editor.execute(statement)
+
+
+def uninstall_fts(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    for suffix in ("ai", "ad", "au"):
+        schema_editor.execute(f"DROP TRIGGER IF EXISTS {FTS_TABLE}_{suffix}")
+    schema_editor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+
+
+def fts_available():
+    if connection.vendor != "sqlite":
+        return False
+    name = connection.settings_dict["NAME"]
+    if name not in _available:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s", [FTS_TABLE])
+            _available[name] = cursor.fetchone() is not None
+    return _available[name]
+
+
+def fts_query(tokens):
+    """Sichere FTS5-Abfrage: jedes Wort als Teilstring, alle müssen vorkommen."""
+    return " ".join(f'"{token}"' for token in tokens)
+
+
+def search_recipes(qs, term):
+    """Filtert ``qs`` auf Rezepte, deren Titel oder Zutaten jedes Wort aus ``term`` enthalten."""
+    term = term.strip()
+    if not term:
+        return qs
+    if not fts_available():
+        return qs.filter(Q(title__icontains=term) | Q(ingredients__icontains=term))
+
+    tokens = _TOKEN_RE.findall(term)
+    long_tokens = [token for token in tokens if len(token) >= MIN_FTS_TOKEN]
+    if long_tokens:
+        qs = qs.filter(id__in=RawSQL(
+            f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", [fts_query(long_tokens)]
+        ))
+    for token in tokens:
+        if len(token) < MIN_FTS_TOKEN:
+            qs = qs.filter(Q(title__icontains=token) | Q(ingredients__icontains=token))
+    if not tokens:
+        # nur Satzzeichen o. Ä.
+        qs = qs.filter(Q(title__icontains=term) | Q(ingredients__icontains=term))
+    return qs
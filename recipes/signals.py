@@ -0,0 +1,67 @@
+"""Hält abgeleitete Daten aktuell: die Indizes (``recipes.facets``,
+``recipes.suggest``) und die veröffentlichten Seiten (``recipes.publish``)."""
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from . import facets, publish, suggest
+from .models import Label, Recipe
+
+# nur Änderungen an diesen Feldern betreffen den jeweiligen Index
+FACET_FIELDS = {"duration_minutes", "working_time"}
+SUGGEST_FIELDS = {"title", "ingredients"}
+
+
+def invalidate(*indexes):
+    for index in indexes:
+        index.invalidate()
+        # erneut nach dem Commit: ein zwischendurch gebauter Snapshot kennt die Änderung noch nicht
+        transaction.on_commit(index.invalidate)
+
+
+@receiver(post_save, sender=Recipe)
+def recipe_saved(sender, instance, created, update_fields=None, **kwargs):
+    publish.schedule([instance.pk])
+    if created or update_fields is None:
+        invalidate(facets, suggest)
+        return
+    if FACET_FIELDS & set(update_fields):
+        invalidate(facets)
+    if SUGGEST_FIELDS & set(update_fields):
+        invalidate(suggest)
+
+
+@receiver(post_delete, sender=Recipe)
+def recipe_deleted(sender, instance, **kwargs):
+    publish.schedule([instance.pk])
+    invalidate(facets, suggest)
+
+
+@receiver(post_save, sender=Label)
+def label_saved(sender, instance, **kwargs):
+    publish.schedule(instance.recipe_set.values_list("id", flat=True))
+    invalidate(facets, suggest)
+
+
+@receiver(pre_delete, sender=Label)
+def label_deleting(sender, instance, **kwargs):
+    # nach dem Löschen ist nicht mehr bekannt, welche Rezepte das Label hatten
+    publish.schedule(instance.recipe_set.values_list("id", flat=True))
+
+
+@receiver(post_delete, sender=Label)
+def label_deleted(sender, **kwargs):
+    invalidate(facets, suggest)
+
+
+@receiver(m2m_changed, sender=Recipe.labels.through)
+def recipe_labels_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action == "pre_clear" and reverse:
+        publish.schedule(instance.recipe_set.values_list("id", flat=True))
+    if action in ("post_add", "post_remove", "post_clear"):
+        if not reverse:
+            publish.schedule([instance.pk])
+        elif pk_set:
+            publish.schedule(pk_set)
+        # Labelzahlen der Vorschläge ändern sich mit
+        invalidate(facets, suggest)
@@ -0,0 +1,110 @@
+"""Versionierte Snapshot-Dateien, die sich mehrere Worker-Prozesse teilen.
+
+Ein In-Memory-Index wird als Pickle-Datei in ``SNAPSHOT_DIR`` abgelegt.
+Daneben liegt eine kleine Token-Datei: jede Änderung an den Daten schreibt
+ein neues, zufälliges Token. Ein Snapshot ist gültig, solange er mit dem
+aktuellen Token gebaut wurde – sonst wird er neu aufgebaut (oder, falls
+``update`` angegeben ist, aus dem letzten Stand fortgeschrieben). Da das Token
+*vor* dem Lesen der Datenbank geholt wird, kann ein gleichzeitig
+veralteter Snapshot nie als aktuell gelten.
+"""
+import hashlib
+import os
+import pickle
+import tempfile
+import threading
+import uuid
+from pathlib import Path
+
+from django.conf import settings
+from django.db import connection
+
+
+def snapshot_dir():
+    return Path(getattr(settings, "SNAPSHOT_DIR", settings.BASE_DIR / "var" / "snapshots"))
+
+
+def _atomic_write(path, data):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+
+
+class SnapshotStore:
+    """Hält ein Objekt im Speicher und gleicht es über Dateien mit anderen Prozessen ab.
+
+    ``build`` ist eine Funktion ohne Argumente, die das Objekt aus der
+    Datenbank neu aufbaut. ``update`` (optional) bekommt einen veralteten
+    Stand und liefert einen aktuellen – z. B. indem nur geänderte Zeilen
+    gelesen werden.
+    """
+
+    def __init__(self, name, build, update=None):
+        self.name = name
+        self.build = build
+        self.update = update
+        self._lock = threading.Lock()
+        self._token = None
+        self._value = None
+
+    @property
+    def _basename(self):
+        # je Datenbank eigene Dateien (z. B. Testdatenbank ≠ echte Datenbank)
+        database = hashlib.sha1(str(connection.settings_dict["NAME"]).encode()).hexdigest()[:8]
+        return f"{self.name}-{database}"
+
+    @property
+    def path(self):
+        return snapshot_dir() / f"{self._basename}.pickle"
+
+    @property
+    def token_path(self):
+        return snapshot_dir() / f"{self._basename}.token"
+
+    def current_token(self):
+        try:
+            return self.token_path.read_text()
+        except FileNotFoundError:
+            return self.invalidate()
+
+    def invalidate(self):
+        """Markiert alle Snapshots (in allen Prozessen) als veraltet."""
+        token = uuid.uuid4().hex
+        _atomic_write(self.token_path, token.encode())
+        return token
+
+    def get(self):
+        token = self.current_token()
+        if token == self._token:
+            return self._value
+
+        with self._lock:
+            if token == self._token:
+                return self._value
+
+            stored_token, value = self._load()
+            if stored_token != token:
+                previous = self._value if self._value is not None else value
+                if self.update is not None and previous is not None:
+                    value = self.update(previous)
+                else:
+                    value = self.build()
+                _atomic_write(self.path, pickle.dumps((token, value), protocol=pickle.HIGHEST_PROTOCOL))
+
+            self._token, self._value = token, value
+            return value
+
+    def _load(self):
+        """``(token, objekt)`` aus der Datei, ``(None, None)`` wenn sie fehlt oder kaputt ist."""
+        try:
+            with open(self.path, "rb") as handle:
+                return pickle.load(handle)
+        except (FileNotFoundError, EOFError, pickle.UnpicklingError, ValueError, AttributeError):
+            return None, None
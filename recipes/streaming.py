@@ -0,0 +1,76 @@
+"""Gestreamtes Rendern großer Listen-Seiten.
+
+Das Template wird sofort gerendert, die Platzhalter-Variablen (``slots``)
+aber erst beim Ausliefern gefüllt. Der Seitenkopf geht damit an den Browser,
+bevor das Queryset der Liste überhaupt gelesen ist::
+
+    return render_streaming(request, "recipes/index.html", context,
+                            recipe_cards=lambda: iter_cards(qs))
+
+Im Template steht an der Stelle ``{{ recipe_cards }}``. Kommt ein Slot
+mehrfach vor (z. B. die Rezeptauswahl im Wochenplan), wird er nur einmal
+erzeugt und danach wiederholt.
+
+Unter ASGI bekommt die Antwort einen asynchronen Iterator: einen
+synchronen würde Django dort erst komplett einlesen und die Seite käme doch
+am Stück. Die Slots (Datenbankzugriffe) laufen dabei weiter im Sync-Thread
+des Requests, Stück für Stück.
+"""
+import re
+
+from asgiref.sync import sync_to_async
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
+from django.template.loader import render_to_string
+from django.utils.safestring import mark_safe
+
+SLOT = "<!--stream:{}-->"
+SLOT_PATTERN = re.compile(r"<!--stream:(\w+)-->")
+
+
+async def _aiter(iterator):
+    next_part = sync_to_async(next, thread_sensitive=True)
+    done = object()
+    try:
+        while (part := await next_part(iterator, done)) is not done:
+            yield part
+    finally:
+        # bricht der Client ab, den Generator im selben Thread schließen
+        # (``iter_zip`` beendet dann seinen Thread-Pool)
+        if hasattr(iterator, "close"):
+            await sync_to_async(iterator.close, thread_sensitive=True)()
+
+
+def render_streaming(request, template_name, context, **slots):
+    markers = {name: mark_safe(SLOT.format(name)) for name in slots}
+    # Kopf und Fuß jetzt rendern: CSRF-Token, Session usw. sind dann schon
+    # bekannt, wenn die Middlewares die Antwort sehen
+    html = render_to_string(template_name, {**context, **markers}, request)
+
+    def content():
+        rendered = {}
+        position = 0
+        for match in SLOT_PATTERN.finditer(html):
+            name = match.group(1)
+            if name not in slots:
+                continue
+            yield html[position:match.start()]
+            if name in rendered:
+                yield rendered[name]
+            else:
+                parts = []
+                for part in slots[name]():
+                    parts.append(part)
+                    yield part
+                rendered[name] = "".join(parts)
+            position = match.end()
+        yield html[position:]
+
+    return streaming_response(request, content(), content_type="text/html; charset=utf-8")
+
+
+def streaming_response(request, iterator, **kwargs):
+    """``StreamingHttpResponse``, unter ASGI mit asynchronem Iterator (siehe oben)."""
+    if isinstance(request, ASGIRequest):
+        iterator = _aiter(iterator)
+    return StreamingHttpResponse(iterator, **kwargs)
@@ -0,0 +1,191 @@
+"""Vorschläge beim Tippen im Suchfeld (``api/suggest/``).
+
+Alle Begriffe – Rezepttitel, Labelnamen und Zutaten – liegen normalisiert in
+einem sortierten Array. Eine Präfixsuche ist damit eine binäre Suche plus ein
+kurzer Scan; für kurze Präfixe, bei denen der Scan lang wäre, sind die
+besten Treffer vorberechnet.
+
+Die Volltextsuche (``q``) kennt keine Labels: Label-Vorschläge tragen
+deshalb den passenden Filter (``{"event_labels": 3}``), den die Übersicht
+statt ``q`` setzt.
+
+Der Index wird wie ``recipes.facets`` über ``recipes.snapshots`` zwischen
+Workern geteilt. Nach Änderungen werden nur Rezepte mit neuerem
+``updated_at`` (und gelöschte) neu eingelesen.
+"""
+import re
+from bisect import bisect_left
+from collections import Counter
+
+from django.db.models import Count
+
+from .models import Label, Recipe
+from .snapshots import SnapshotStore
+
+TITLE = "title"
+LABEL = "label"
+INGREDIENT = "ingredient"
+
+# Filter-Parameter der Übersicht je Labeltyp (recipes.facets.apply)
+LABEL_PARAMS = {Label.CATEGORY: "category_labels", Label.EVENT: "event_labels"}
+
+DEFAULT_LIMIT = 8
+MAX_LIMIT = 20
+# Präfixe bis zu dieser Länge haben vorberechnete Treffer ...
+SHORT_PREFIX = 2
+# ... längere (bis PRECOMPUTED_PREFIX) nur, wenn der Scan mehr Treffer hätte als SCAN_LIMIT
+PRECOMPUTED_PREFIX = 5
+SCAN_LIMIT = 128
+
+# Mengenangaben und Einheiten am Anfang einer Zutatenzeile
+QUANTITY = re.compile(r"^[\d½⅓¼¾.,/\-–\s]+")
+UNITS = {
+    "g", "kg", "mg", "ml", "l", "cl", "dl", "el", "tl", "msp", "prise", "prisen",
+    "stk", "stück", "dose", "dosen", "glas", "gläser", "bund", "pck", "päckchen",
+    "packung", "zehe", "zehen", "scheibe", "scheiben", "becher", "tasse", "tassen",
+    "handvoll", "kugel", "kugeln", "zweig", "zweige", "blatt", "blätter", "etwas",
+}
+PARENTHESES = re.compile(r"\([^)]*\)")
+# Zusätze wie "z. B. Penne" oder "oder Öl" gehören nicht zum Namen
+ADDITIONS = re.compile(r"\s(?:z\.\s?b\.|oder|bzw\.|ca\.)\s.*$", re.IGNORECASE)
+
+
+def normalize(text):
+    return " ".join(text.casefold().split())
+
+
+def ingredient_name(line):
+    """``"200 g Nudeln (z. B. Penne), gekocht"`` → ``"Nudeln"``."""
+    name = PARENTHESES.sub(" ", line).split(",")[0]
+    name = ADDITIONS.sub("", QUANTITY.sub("", name)).strip()
+    # "120g" oder "6EL" sind durch QUANTITY schon getrennt; Einheit als erstes Wort entfernen
+    first, _, rest = name.partition(" ")
+    if first.casefold().rstrip(".") in UNITS and rest:
+        name = rest.strip()
+    name = " ".join(name.split())
+    if not 2 <= len(name) <= 40 or not any(char.isalpha() for char in name):
+        return None
+    return name[0].upper() + name[1:]
+
+
+def recipe_terms(title, ingredients):
+    terms = {(TITLE, title.strip())} if title and title.strip() else set()
+    for line in (ingredients or "").splitlines():
+        name = ingredient_name(line)
+        if name:
+            terms.add((INGREDIENT, name))
+    return frozenset(terms)
+
+
+class SuggestIndex:
+    def __init__(self):
+        # recipe_id → (updated_at, Begriffe); daraus ergeben sich die Zähler
+        self.recipes = {}
+        self.counts = Counter()
+        # (label_type, id) → (name, Rezeptzahl); Namen sind nicht eindeutig
+        self.labels = {}
+        self.keys = []
+        self.entries = []
+        self.short = {}
+
+    @classmethod
+    def build(cls):
+        index = cls()
+        rows = Recipe.objects.values_list("id", "updated_at", "title", "ingredients")
+        index._apply(rows, deleted=())
+        return index
+
+    def updated(self):
+        """Neuer Index mit allen seit dem Aufbau geänderten oder gelöschten Rezepten."""
+        index = SuggestIndex()
+        index.recipes = dict(self.recipes)
+        index.counts = Counter(self.counts)
+
+        current = dict(Recipe.objects.values_list("id", "updated_at"))
+        changed = [pk for pk, updated_at in current.items()
+                   if pk not in self.recipes or self.recipes[pk][0] != updated_at]
+        deleted = [pk for pk in self.recipes if pk not in current]
+        rows = Recipe.objects.filter(pk__in=changed).values_list("id", "updated_at", "title", "ingredients") \
+            if changed else []
+        index._apply(rows, deleted)
+        return index
+
+    def _apply(self, rows, deleted):
+        for pk in deleted:
+            self.counts.subtract(self.recipes.pop(pk)[1])
+        for pk, updated_at, title, ingredients in rows:
+            if pk in self.recipes:
+                self.counts.subtract(self.recipes[pk][1])
+            terms = recipe_terms(title, ingredients)
+            self.recipes[pk] = (updated_at, terms)
+            self.counts.update(terms)
+        self.counts = +self.counts
+
+        # Labels sind wenige; ihre Rezeptzahlen werden immer komplett gelesen
+        labels = Label.objects.annotate(count=Count("recipe")).values_list("label_type", "id", "name", "count")
+        self.labels = {(label_type, pk): (name, count) for label_type, pk, name, count in labels}
+        self._sort()
+
+    def _sort(self):
+        # Einträge: (Text, Art, Anzahl, (label_type, id) bzw. None)
+        entries = [(text, kind, count, None) for (kind, text), count in self.counts.items()]
+        entries += [(name, LABEL, count, key) for key, (name, count) in self.labels.items()]
+        pairs = []
+        for entry in entries:
+            words = normalize(entry[0]).split(" ")
+            # auch Wortanfänge im Begriff finden ("bolo" → "Spaghetti Bolognese")
+            for position in range(len(words)):
+                pairs.append((" ".join(words[position:]), entry))
+        pairs.sort(key=lambda pair: pair[0])
+        self.keys = [key for key, _ in pairs]
+        self.entries = [entry for _, entry in pairs]
+
+        prefixes = {}
+        for key, entry in pairs:
+            for length in range(1, min(PRECOMPUTED_PREFIX, len(key)) + 1):
+                prefixes.setdefault(key[:length], set()).add(entry)
+        self.short = {
+            prefix: _best(entries, MAX_LIMIT)
+            for prefix, entries in prefixes.items()
+            if len(prefix) <= SHORT_PREFIX or len(entries) > SCAN_LIMIT
+        }
+
+    def suggest(self, query, limit=DEFAULT_LIMIT):
+        prefix = normalize(query)
+        if not prefix:
+            return []
+        if len(prefix) <= SHORT_PREFIX or prefix in self.short:
+            return self.short.get(prefix, [])[:limit]
+
+        matches = set()
+        position = bisect_left(self.keys, prefix)
+        while position < len(self.keys) and self.keys[position].startswith(prefix):
+            matches.add(self.entries[position])
+            position += 1
+        return _best(matches, limit)
+
+
+def _best(entries, limit):
+    """Häufigste zuerst, bei Gleichstand kürzere und alphabetisch."""
+    return sorted(entries, key=lambda entry: (-entry[2], len(entry[0]), entry[0], entry[1], entry[3] or ()))[:limit]
+
+
+# v3: Labels nach Typ und id statt nach Namen, ältere Snapshot-Dateien nicht mehr laden
+store = SnapshotStore("suggest-v3", SuggestIndex.build, update=SuggestIndex.updated)
+
+
+def invalidate():
+    store.invalidate()
+
+
+def suggestions(query, limit=DEFAULT_LIMIT):
+    index = store.get()
+    results = []
+    for text, kind, count, label in index.suggest(query, limit):
+        result = {"text": text, "kind": kind, "count": count}
+        if label:
+            label_type, pk = label
+            result["label_type"] = label_type
+            result["filter"] = {LABEL_PARAMS[label_type]: pk}
+        results.append(result)
+    return results
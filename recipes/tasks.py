@@ -0,0 +1,35 @@
+"""Hintergrund-Jobs der Rezepte-App."""
+from django.utils import timezone
+
+from . import publish, renditions
+from .jobs import job
+from .models import Recipe
+
+
+@job("recipes.build_renditions", dedupe=lambda recipe_id: f"renditions:{recipe_id}")
+def build_renditions(recipe_id):
+    recipe = Recipe.objects.filter(pk=recipe_id).first()
+    if recipe is None or not recipe.image:
+        return
+
+    result, details = renditions.build_renditions(recipe.image)
+
+    # update() statt save(): keine erneuten Seiteneffekte, und nur wenn das Bild
+    # sich in der Zwischenzeit nicht geändert hat
+    Recipe.objects.filter(pk=recipe_id, image=recipe.image.name).update(
+        renditions=result,
+        updated_at=timezone.now(),
+        **details,
+    )
+    # veröffentlichte Seiten zeigen jetzt die kleineren Bilder
+    publish.schedule([recipe_id])
+
+
+@job("recipes.publish_recipe", dedupe=lambda recipe_id: f"publish:{recipe_id}")
+def publish_recipe(recipe_id):
+    publish.publish_recipe(recipe_id)
+
+
+@job("recipes.publish_index", dedupe=lambda: "publish:index")
+def publish_index():
+    publish.publish_index()
@@ -0,0 +1,154 @@
+// Service Worker für den Kochmodus ohne Netz (views.service_worker)
+//
+// * Bundles, Kochseiten und Bilder aller Rezepte im aktuellen Wochenplan
+//   werden abgelegt (api/cook/offline/) – angestoßen von base.html
+// * Kochseiten und Bundles kommen mit Netz immer frisch vom Server (die
+//   abgelegte Kopie wird dabei aktualisiert), nur ohne Netz aus dem Cache
+// * Abmelden (oder 401 beim Abgleich) löscht alle abgelegten Kochseiten:
+//   sie enthalten Navigationsleiste und CSRF-Token des Benutzers
+// * CSS/JS/Schriften: vom CDN (feste Versionen) erst Cache, dann Netz;
+//   eigene statische Dateien sofort aus dem Cache, im Hintergrund aktualisiert
+const CONFIG = {{ config }};
+const SHELL_CACHE = "rezepte-shell-" + CONFIG.version;
+const COOK_CACHE = "rezepte-cook";
+// höchstens so oft den Wochenplan abgleichen, außer er wurde gerade geändert
+const SYNC_INTERVAL = 5 * 60 * 1000;
+
+const escape = text => text.replace(/[.*+?^${}()|[\]\\]/g, "\\$&");
+const COOK_PAGE = new RegExp("^" + escape(CONFIG.prefix) + "[^/]+/cook/$");
+const COOK_BUNDLE = new RegExp("^" + escape(CONFIG.prefix) + "api/recipes/[^/]+/cook/$");
+
+let lastSync = 0;
+
+self.addEventListener("install", event => {
+    event.waitUntil(
+        caches.open(SHELL_CACHE)
+            // einzeln, damit ein nicht erreichbares CDN nicht alles verhindert
+            .then(cache => Promise.all(CONFIG.shell.map(url => cache.add(url).catch(() => null))))
+            .then(() => self.skipWaiting())
+    );
+});
+
+self.addEventListener("activate", event => {
+    event.waitUntil(
+        caches.keys()
+            .then(keys => Promise.all(
+                keys.filter(key => key.startsWith("rezepte-shell-") && key !== SHELL_CACHE)
+                    .map(key => caches.delete(key))
+            ))
+            .then(() => self.clients.claim())
+            .then(() => sync(true))
+    );
+});
+
+self.addEventListener("message", event => {
+    if (event.data && event.data.type === "sync") {
+        event.waitUntil(sync(event.data.force));
+    } else if (event.data && event.data.type === "logout") {
+        event.waitUntil(forget());
+    }
+});
+
+function forget() {
+    lastSync = 0;
+    return caches.delete(COOK_CACHE);
+}
+
+async function sync(force) {
+    if (!force && Date.now() - lastSync < SYNC_INTERVAL) return;
+    lastSync = Date.now();
+
+    let response;
+    try {
+        response = await fetch(CONFIG.offline, {credentials: "same-origin", cache: "no-store"});
+    } catch (error) {
+        return;  // offline: abgelegte Fassung behalten
+    }
+    if (response.status === 401 || response.status === 403) return forget();
+    if (!response.ok) return;
+    const {recipes} = await response.json();
+
+    const cache = await caches.open(COOK_CACHE);
+    const wanted = new Set();
+    for (const recipe of recipes) {
+        for (const url of [recipe.bundle, recipe.page, recipe.image]) {
+            if (url) wanted.add(new URL(url, self.location.origin).href);
+        }
+    }
+
+    // Nicht mehr geplante Rezepte entfernen, neue/geänderte holen. Der
+    // HTTP-Cache fragt dank ETag nur nach, unveränderte kommen als 304.
+    for (const request of await cache.keys()) {
+        if (!wanted.has(request.url)) await cache.delete(request);
+    }
+    await Promise.all([...wanted].map(url =>
+        fetch(url, {credentials: "same-origin"})
+            .then(fresh => fresh.ok ? cache.put(url, fresh) : null)
+            .catch(() => null)
+    ));
+}
+
+function cookCacheKey(request) {
+    // ?servings= stellt das JS ein, die Seite ist dieselbe
+    const url = new URL(request.url);
+    return url.origin + url.pathname;
+}
+
+async function networkFirst(event, key) {
+    const cache = await caches.open(COOK_CACHE);
+    try {
+        const response = await fetch(event.request);
+        // nur abgelegte Rezepte aktualisieren, was dazugehört bestimmt sync()
+        if (response.ok && await cache.match(key, {ignoreVary: true})) {
+            event.waitUntil(cache.put(key, response.clone()));
+        }
+        return response;
+    } catch (error) {
+        const cached = await cache.match(key, {ignoreVary: true});
+        if (cached) return cached;
+        throw error;
+    }
+}
+
+async function staleWhileRevalidate(event, cacheName, key) {
+    const cache = await caches.open(cacheName);
+    const cached = await cache.match(key, {ignoreVary: true});
+    const network = fetch(event.request)
+        .then(response => {
+            if (response.ok) cache.put(key, response.clone());
+            return response;
+        });
+    if (cached) {
+        event.waitUntil(network.catch(() => null));
+        return cached;
+    }
+    return network;
+}
+
+async function cacheFirst(request) {
+    const cached = await caches.match(request, {ignoreVary: true});
+    if (cached) return cached;
+    const response = await fetch(request);
+    if (response.ok) {
+        const cache = await caches.open(SHELL_CACHE);
+        cache.put(request, response.clone());
+    }
+    return response;
+}
+
+self.addEventListener("fetch", event => {
+    const request = event.request;
+    if (request.method !== "GET") return;
+    const url = new URL(request.url);
+
+    if (url.origin === self.location.origin && (COOK_PAGE.test(url.pathname) || COOK_BUNDLE.test(url.pathname))) {
+        event.respondWith(networkFirst(event, cookCacheKey(request)));
+    } else if (url.origin === self.location.origin && url.pathname.startsWith(CONFIG.static)) {
+        event.respondWith(staleWhileRevalidate(event, SHELL_CACHE, request.url));
+    } else if (url.href.startsWith(CONFIG.cdn)) {
+        event.respondWith(cacheFirst(request));
+    } else if (request.destination === "image") {
+        // Rezeptbilder aus dem Wochenplan liegen im COOK_CACHE
+        event.respondWith(caches.match(request, {ignoreVary: true}).then(cached => cached || fetch(request)));
+    }
+});
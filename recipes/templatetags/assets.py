@@ -0,0 +1,11 @@
+from django import template
+
+from recipes.assets import vendor_url
+
+register = template.Library()
+
+
+@register.simple_tag
+def vendor_static(name):
+    """URL einer Fremdbibliothek: lokal, falls heruntergeladen, sonst CDN."""
+    return vendor_url(name)
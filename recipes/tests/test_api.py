@@ -0,0 +1,61 @@
+import json
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+
+from recipes.models import Recipe
+
+
+class RecipeApiTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.recipes = [Recipe.objects.create(title=f"Rezept {index}") for index in range(5)]
+
+    def test_cursor_pagination_returns_every_recipe_once(self):
+        url = reverse("recipes:api_recipe_list") + "?limit=2&fields=id"
+        seen = []
+        pages = 0
+        while url:
+            data = self.client.get(url).json()
+            seen.extend(item["id"] for item in data["results"])
+            url = data["next"]
+            pages += 1
+        self.assertEqual(seen, [recipe.id for recipe in self.recipes])
+        self.assertEqual(pages, 3)
+
+    def test_invalid_cursor_and_fields_are_rejected(self):
+        url = reverse("recipes:api_recipe_list")
+        self.assertEqual(self.client.get(url, {"cursor": "%%%"}).status_code, 400)
+        self.assertEqual(self.client.get(url, {"fields": "title,geheim"}).status_code, 400)
+
+    def test_etag_answers_304_until_the_recipe_changes(self):
+        url = reverse("recipes:api_recipe_detail", args=[self.recipes[0].slug])
+        etag = self.client.get(url)["ETag"]
+
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        # nach der Komprimierung kommt das ETag schwach zurück
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=f"W/{etag}").status_code, 304)
+
+        self.recipes[0].title = "Neuer Titel"
+        self.recipes[0].save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_weekly_plan_requires_login(self):
+        url = reverse("recipes:api_weekly_plan")
+        self.assertEqual(self.client.get(url).status_code, 401)
+        self.client.force_login(User.objects.create_user("koch"))
+        self.assertEqual(self.client.get(url).status_code, 200)
+
+    def test_export_streams(self):
+        response = self.client.get(reverse("recipes:api_recipe_export"), {"fields": "slug"})
+        self.assertFalse(response.is_async)
+        self.assertEqual(len(json.loads(b"".join(response.streaming_content))), 5)
+
+    async def test_export_streams_under_asgi(self):
+        response = await self.async_client.get(reverse("recipes:api_recipe_export"), {"fields": "slug,ingredients"})
+        self.assertTrue(response.is_async)
+        body = b"".join([part async for part in response.streaming_content])
+        self.assertEqual([row["slug"] for row in json.loads(body)], [recipe.slug for recipe in self.recipes])
@@ -0,0 +1,83 @@
+import gzip
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+from django.conf import settings
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from cookbook import static
+from recipes import assets, checks
+
+NAME = "bootstrap/bootstrap.min.css"
+
+
+class VendorAssetTests(SimpleTestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.vendor_dir = Path(tmp.name)
+        patcher = mock.patch.object(assets, "VENDOR_DIR", self.vendor_dir)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        assets.is_vendored.cache_clear()
+        self.addCleanup(assets.is_vendored.cache_clear)
+
+    def vendor_all(self):
+        for name in assets.VENDOR_ASSETS:
+            (self.vendor_dir / name).parent.mkdir(parents=True, exist_ok=True)
+            (self.vendor_dir / name).write_text("/* lokal */")
+        assets.is_vendored.cache_clear()
+
+    @override_settings(VENDOR_CDN_FALLBACK=False)
+    def test_missing_file_without_fallback_stays_local(self):
+        self.assertEqual(assets.vendor_url(NAME), f"/static/vendor/{NAME}")
+        self.assertEqual(checks.vendor_assets_check(None)[0].id, "recipes.W001")
+        self.assertEqual(checks.vendor_assets_deploy_check(None)[0].id, "recipes.E001")
+
+    @override_settings(DEBUG=True)
+    def test_fallback_is_off_by_default(self):
+        del settings.VENDOR_CDN_FALLBACK
+        self.assertEqual(assets.vendor_url(NAME), f"/static/vendor/{NAME}")
+
+    @override_settings(VENDOR_CDN_FALLBACK=True)
+    def test_missing_file_with_fallback_uses_cdn(self):
+        self.assertEqual(assets.vendor_url(NAME), assets.cdn_url(NAME))
+
+    @override_settings(VENDOR_CDN_FALLBACK=True)
+    def test_vendored_files_pass_the_checks(self):
+        self.vendor_all()
+        self.assertEqual(assets.vendor_url(NAME), f"/static/vendor/{NAME}")
+        self.assertEqual(checks.vendor_assets_check(None), [])
+        self.assertEqual(checks.vendor_assets_deploy_check(None), [])
+
+
+class StaticServeTests(SimpleTestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        root = Path(tmp.name)
+        self.css = b"body { color: #333; }\n" * 50
+        (root / "style.css").write_bytes(self.css)
+        (root / "style.css.gz").write_bytes(gzip.compress(self.css))
+        static_root = override_settings(STATIC_ROOT=root)
+        static_root.enable()
+        self.addCleanup(static_root.disable)
+
+    def get(self, accept_encoding):
+        request = RequestFactory().get("/static/style.css", headers={"accept-encoding": accept_encoding})
+        response = static.serve(request, "style.css")
+        return response, b"".join(response.streaming_content)
+
+    def test_precompressed_file_for_gzip(self):
+        response, body = self.get("gzip, deflate")
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(gzip.decompress(body), self.css)
+        self.assertEqual(response["Vary"], "Accept-Encoding")
+
+    def test_refused_or_missing_encoding_gets_the_plain_file(self):
+        # kein .br vorhanden, gzip mit q=0 abgelehnt
+        for accept_encoding in ("gzip;q=0", "br", "", "x-gzip"):
+            response, body = self.get(accept_encoding)
+            self.assertFalse(response.has_header("Content-Encoding"), accept_encoding)
+            self.assertEqual(body, self.css)
@@ -0,0 +1,121 @@
+import sqlite3
+import tempfile
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+
+from recipes import backups, facets, suggest
+from recipes.models import Label, Recipe
+
+
+class BackupDirMixin:
+    def setUp(self):
+        super().setUp()
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.tmp = Path(tmp.name)
+        self.root = self.tmp / "backups"
+        self.media = self.tmp / "media"
+        (self.media / "recipes").mkdir(parents=True)
+        (self.media / "recipes" / "kuchen.jpg").write_bytes(b"jpeg" * 100)
+        self.database = self.tmp / "db.sqlite3"
+        with sqlite3.connect(self.database) as conn:
+            conn.execute("CREATE TABLE rezept (titel TEXT)")
+            conn.execute("INSERT INTO rezept VALUES ('Apfelkuchen')")
+        conn.close()
+
+
+class SnapshotTests(BackupDirMixin, SimpleTestCase):
+
+    def entry(self, snapshot):
+        return backups.load_manifest(snapshot)["media"]["recipes/kuchen.jpg"]
+
+    def test_corrupted_object_is_copied_again(self):
+        first, copied = backups.create_snapshot(self.root, self.database, self.media)
+        self.assertEqual(copied, 1)
+        target = backups.object_path(self.root, self.entry(first)["sha256"])
+        with open(target, "ab") as handle:
+            handle.write(b"kaputt")
+        self.assertEqual(len(backups.verify_snapshot(self.root, first)), 1)
+
+        second, copied = backups.create_snapshot(self.root, self.database, self.media)
+
+        self.assertEqual(copied, 1)
+        self.assertEqual(backups.verify_snapshot(self.root, second), [])
+        self.assertEqual(target.read_bytes(), b"jpeg" * 100)
+
+    def test_same_size_corruption_needs_verify(self):
+        first, _ = backups.create_snapshot(self.root, self.database, self.media)
+        target = backups.object_path(self.root, self.entry(first)["sha256"])
+        target.write_bytes(b"JPEG" * 100)
+
+        _, copied = backups.create_snapshot(self.root, self.database, self.media)
+        self.assertEqual(copied, 0)
+        _, copied = backups.create_snapshot(self.root, self.database, self.media, verify=True)
+        self.assertEqual(copied, 1)
+        self.assertEqual(target.read_bytes(), b"jpeg" * 100)
+
+    def test_aborted_snapshots_are_removed(self):
+        leftover = self.root / "snapshots" / "2026-01-01T00-00-00-000000.partial"
+        leftover.mkdir(parents=True)
+        backups.create_snapshot(self.root, self.database, self.media)
+        self.assertFalse(leftover.exists())
+
+    def test_database_path_with_uri_characters(self):
+        directory = self.tmp / "a?b#c%20d"
+        directory.mkdir()
+        database = directory / "db.sqlite3"
+        self.database.rename(database)
+
+        snapshot, _ = backups.create_snapshot(self.root, database, self.media)
+
+        conn = sqlite3.connect(snapshot / backups.DATABASE_NAME)
+        self.assertEqual(conn.execute("SELECT titel FROM rezept").fetchall(), [("Apfelkuchen",)])
+        conn.close()
+
+    def test_intact_objects_are_not_copied_again(self):
+        backups.create_snapshot(self.root, self.database, self.media)
+        _, copied = backups.create_snapshot(self.root, self.database, self.media)
+        self.assertEqual(copied, 0)
+
+    def test_restore_brings_back_database_and_media(self):
+        snapshot, _ = backups.create_snapshot(self.root, self.database, self.media)
+        (self.media / "recipes" / "kuchen.jpg").write_bytes(b"anders")
+        with sqlite3.connect(self.database) as conn:
+            conn.execute("DELETE FROM rezept")
+        conn.close()
+
+        restored = backups.restore_snapshot(self.root, snapshot, self.database, self.media)
+
+        self.assertEqual(restored, 1)
+        self.assertEqual((self.media / "recipes" / "kuchen.jpg").read_bytes(), b"jpeg" * 100)
+        conn = sqlite3.connect(self.database)
+        self.assertEqual(conn.execute("SELECT titel FROM rezept").fetchall(), [("Apfelkuchen",)])
+        conn.close()
+
+
+class RestoreCommandTests(BackupDirMixin, TestCase):
+    def test_restore_invalidates_indexes(self):
+        label = Label.objects.create(name="Ostern", label_type=Label.EVENT)
+        recipe = Recipe.objects.create(title="Osterlamm")
+        recipe.labels.add(label)
+        self.assertTrue(facets.store.get().match(event_ids=[label.id]))
+        self.assertIn("Ostern", [item["text"] for item in suggest.suggestions("oste")])
+        backups.create_snapshot(self.root, self.database, self.media)
+
+        def restore(*args, **kwargs):
+            # wie das Zurückspielen per Backup-API: an den Signalen vorbei
+            with connection.cursor() as cursor:
+                cursor.execute("DELETE FROM recipes_recipe_labels")
+                cursor.execute("DELETE FROM recipes_label")
+            return 0
+
+        with mock.patch.object(backups, "restore_snapshot", side_effect=restore):
+            call_command("restore", "--dest", str(self.root), "--noinput", stdout=StringIO())
+
+        self.assertFalse(facets.store.get().match(event_ids=[label.id]))
+        self.assertNotIn("Ostern", [item["text"] for item in suggest.suggestions("oste")])
@@ -0,0 +1,80 @@
+import tempfile
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.test import SimpleTestCase
+
+from cookbook.cache import SQLiteCache
+
+
+class SQLiteCacheTests(SimpleTestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.cache = self.make_cache(Path(tmp.name) / "cache.sqlite3")
+
+    def make_cache(self, path, **options):
+        return SQLiteCache(path, {"TIMEOUT": 60, "OPTIONS": options})
+
+    def test_tests_do_not_use_the_real_cache(self):
+        var = settings.BASE_DIR / "var"
+        for config in settings.CACHES.values():
+            self.assertNotEqual(Path(config["LOCATION"]).parent, var)
+        self.assertNotEqual(Path(settings.SNAPSHOT_DIR).parent, var)
+
+    def test_values_keep_their_type(self):
+        for value in (1, True, 2**70, "1", {"a": [1, 2]}, None):
+            self.cache.set("key", value)
+            self.assertEqual(self.cache.get("key", "fehlt"), value)
+            self.assertIs(type(self.cache.get("key")), type(value))
+
+    def test_many(self):
+        self.cache.set_many({"a": 1, "b": "zwei"})
+        self.assertEqual(self.cache.get_many(["a", "b", "c"]), {"a": 1, "b": "zwei"})
+        self.cache.delete_many(["a", "b"])
+        self.assertEqual(self.cache.get_many(["a", "b"]), {})
+
+    def test_expired_entries_are_gone(self):
+        self.cache.set("key", "wert", timeout=0.01)
+        time.sleep(0.02)
+        self.assertIsNone(self.cache.get("key"))
+        self.assertFalse(self.cache.has_key("key"))
+        self.assertFalse(self.cache.touch("key"))
+
+    def test_add_only_when_missing_or_expired(self):
+        self.assertTrue(self.cache.add("key", "erster"))
+        self.assertFalse(self.cache.add("key", "zweiter"))
+        self.assertEqual(self.cache.get("key"), "erster")
+
+        self.cache.set("old", "alt", timeout=0.01)
+        time.sleep(0.02)
+        self.assertTrue(self.cache.add("old", "neu"))
+        self.assertEqual(self.cache.get("old"), "neu")
+
+    def test_incr(self):
+        self.cache.set("count", 1)
+        self.assertEqual(self.cache.incr("count", 5), 6)
+        self.assertEqual(self.cache.decr("count"), 5)
+        with self.assertRaises(ValueError):
+            self.cache.incr("missing")
+        self.cache.set("text", "a")
+        with self.assertRaises(TypeError):
+            self.cache.incr("text")
+
+    def test_touch_extends_timeout(self):
+        self.cache.set("key", "wert", timeout=0.05)
+        self.assertTrue(self.cache.touch("key", timeout=None))
+        time.sleep(0.06)
+        self.assertEqual(self.cache.get("key"), "wert")
+
+    def test_cull_drops_least_recently_read(self):
+        cache = self.make_cache(self.cache.path.with_name("small.sqlite3"), MAX_ENTRIES=3, CULL_FREQUENCY=3)
+        for index, key in enumerate("abc"):
+            cache.set(key, index)
+        # "b" wurde am längsten nicht gelesen
+        cache._db.execute("UPDATE cache SET accessed = accessed - 100 WHERE key = ?", (cache.make_key("b"),))
+
+        cache.set("d", 3)
+
+        self.assertEqual(sorted(cache.get_many("abcd")), ["a", "c", "d"])
@@ -0,0 +1,12 @@
+from django.test import TestCase
+
+from recipes import cards
+from recipes.models import Recipe
+
+
+class RecipeCardTests(TestCase):
+    def test_query_is_only_inserted_into_links(self):
+        recipe = Recipe.objects.create(title="__query__ <!--query--> Kuchen")
+        html = cards.render_cards([recipe], "q=kuchen&sort=title")[0]
+        self.assertIn("__query__ &lt;!--query--&gt; Kuchen", html)
+        self.assertEqual(html.count("?q=kuchen&amp;sort=title"), 2)
@@ -0,0 +1,82 @@
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+
+from recipes import cook
+from recipes.models import Recipe, WeeklyPlan, WeeklyPlanEntry, current_week_start
+from recipes.views import DAYS
+
+
+class ParseAmountTests(SimpleTestCase):
+    def test_amounts(self):
+        self.assertEqual(cook.parse_amount("200 g Nudeln"), (200.0, "g Nudeln"))
+        self.assertEqual(cook.parse_amount("1/2 TL Salz"), (0.5, "TL Salz"))
+        self.assertEqual(cook.parse_amount("1,5 l Wasser"), (1.5, "l Wasser"))
+        self.assertEqual(cook.parse_amount("3Eier"), (3.0, "Eier"))
+
+    def test_lines_without_amount_stay_unchanged(self):
+        for line in ("Salz und Pfeffer", "1/0 Ei", "1.2.3 Versuch", "/ Schrägstrich"):
+            self.assertEqual(cook.parse_amount(line), (None, line))
+
+
+class CookBundleTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.recipe = Recipe.objects.create(
+            title="Pfannkuchen", servings=4, ingredients="250 g Mehl\n1/2 l Milch\nSalz", steps="Verrühren\n\nBacken",
+        )
+
+    def test_bundle(self):
+        response = self.client.get(reverse("recipes:api_cook_bundle", kwargs={"slug": self.recipe.slug}))
+        data = response.json()
+        self.assertEqual(data["servings"], 4)
+        self.assertEqual([item["amount"] for item in data["ingredients"]], [250.0, 0.5, None])
+        self.assertEqual(data["steps"], ["Verrühren", "Backen"])
+        self.assertEqual(response["ETag"], '"%s"' % data["version"])
+        self.assertEqual(response["Cache-Control"], "no-cache")
+
+    def test_etag_answers_304_until_the_recipe_changes(self):
+        url = reverse("recipes:api_cook_bundle", kwargs={"slug": self.recipe.slug})
+        etag = self.client.get(url)["ETag"]
+
+        self.assertEqual(self.client.get(url, headers={"if-none-match": etag}).status_code, 304)
+        # so kommt das ETag nach der Komprimierung zurück
+        self.assertEqual(self.client.get(url, headers={"if-none-match": "W/" + etag}).status_code, 304)
+
+        self.recipe.steps += "\nServieren"
+        self.recipe.save()
+        self.assertEqual(self.client.get(url, headers={"if-none-match": etag}).status_code, 200)
+
+
+class OfflineEntriesTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("koch")
+        cls.soup = Recipe.objects.create(title="Suppe")
+        cls.bread = Recipe.objects.create(title="Brot")
+        cls.cake = Recipe.objects.create(title="Kuchen")
+
+        plan = WeeklyPlan.for_week(cls.user, current_week_start())
+        for day, recipe in zip(DAYS, (cls.soup, cls.bread, cls.soup)):
+            WeeklyPlanEntry.objects.create(plan=plan, day=day, recipe=recipe)
+        # andere Woche und anderer Benutzer zählen nicht
+        last_week = WeeklyPlan.for_week(cls.user, current_week_start() - timedelta(weeks=1))
+        WeeklyPlanEntry.objects.create(plan=last_week, day=DAYS[0], recipe=cls.cake)
+        other = WeeklyPlan.for_week(User.objects.create_user("gast"), current_week_start())
+        WeeklyPlanEntry.objects.create(plan=other, day=DAYS[0], recipe=cls.cake)
+
+    def test_each_planned_recipe_once(self):
+        entries = cook.offline_entries(self.user)
+        self.assertEqual([entry["slug"] for entry in entries], [self.bread.slug, self.soup.slug])
+        self.assertEqual(entries[0]["page"], reverse("recipes:cook", kwargs={"slug": self.bread.slug}))
+        self.assertEqual(entries[0]["bundle"], reverse("recipes:api_cook_bundle", kwargs={"slug": self.bread.slug}))
+        self.assertIsNone(entries[0]["image"])
+
+    def test_offline_api_requires_login(self):
+        url = reverse("recipes:api_cook_offline")
+        # der Service Worker löscht bei 401 seine abgelegten Kochseiten
+        self.assertEqual(self.client.get(url).status_code, 401)
+        self.client.force_login(self.user)
+        self.assertEqual(len(self.client.get(url).json()["recipes"]), 2)
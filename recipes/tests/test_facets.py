@@ -0,0 +1,134 @@
+import random
+import tempfile
+
+from django.http import QueryDict
+from django.test import SimpleTestCase, TestCase, override_settings
+from unittest import mock
+
+from recipes import facets
+from recipes.models import Label, Recipe
+from recipes.snapshots import SnapshotStore
+
+DURATIONS = (None, 0, 1, 9, 10, 11, 15, 16, 45, 59, 60, 61, 1440, 1441, 5000)
+
+
+def old_filter(params):
+    """Der frühere Filter über JOINs, als Referenz."""
+    qs = Recipe.objects.all()
+    for name, field in (("max_duration", "duration_minutes"), ("max_working_duration", "working_time")):
+        if params.get(name):
+            qs = qs.filter(**{f"{field}__lte": int(params[name])})
+    if params.getlist("category_labels"):
+        qs = qs.filter(labels__id__in=params.getlist("category_labels"), labels__label_type=Label.CATEGORY)
+    if params.getlist("event_labels"):
+        qs = qs.filter(labels__id__in=params.getlist("event_labels"), labels__label_type=Label.EVENT)
+    return set(qs.distinct().values_list("id", flat=True))
+
+
+class DurationIndexTests(SimpleTestCase):
+    def test_at_most_matches_plain_comparison(self):
+        index = facets.DurationIndex()
+        for position, minutes in enumerate(DURATIONS):
+            index.add(position, minutes)
+
+        limits = {-1, *facets.DURATION_BUCKETS, *(edge + 1 for edge in facets.DURATION_BUCKETS),
+                  *(edge - 1 for edge in facets.DURATION_BUCKETS), *(value for value in DURATIONS if value is not None)}
+        for limit in sorted(limits):
+            expected = {position for position, minutes in enumerate(DURATIONS) if minutes is not None and minutes <= limit}
+            self.assertEqual(set(facets._bits(index.at_most(limit))), expected, limit)
+
+
+class FacetApplyTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        rng = random.Random(34)
+        cls.labels = [
+            Label.objects.create(name=f"{label_type}-{index}", label_type=label_type)
+            for label_type in (Label.CATEGORY, Label.EVENT) for index in range(3)
+        ]
+        for index in range(60):
+            recipe = Recipe.objects.create(
+                title=f"Rezept {index}",
+                duration_minutes=rng.choice(DURATIONS),
+                working_time=rng.choice(DURATIONS),
+            )
+            recipe.labels.set(rng.sample(cls.labels, rng.randint(0, 3)))
+
+    def random_params(self, rng):
+        params = QueryDict(mutable=True)
+        for name in ("category_labels", "event_labels"):
+            if rng.random() < 0.5:
+                # auch Labels des jeweils anderen Typs
+                params.setlist(name, [str(label.id) for label in rng.sample(self.labels, rng.randint(1, 3))])
+        for name in ("max_duration", "max_working_duration"):
+            if rng.random() < 0.5:
+                params[name] = str(rng.choice([0, 10, 11, 15, 30, 59, 60, 1440, 2000]))
+        return params
+
+    def test_same_result_as_join_filter(self):
+        rng = random.Random(500)
+        for max_in_list in (facets.MAX_IN_LIST, 5, 0):
+            with mock.patch.object(facets, "MAX_IN_LIST", max_in_list):
+                for _ in range(170):
+                    params = self.random_params(rng)
+                    result = set(facets.apply(Recipe.objects.all(), params).values_list("id", flat=True))
+                    self.assertEqual(result, old_filter(params), (max_in_list, params.urlencode()))
+
+    def test_complement_is_excluded(self):
+        params = QueryDict("max_duration=5000")
+        with mock.patch.object(facets, "MAX_IN_LIST", 5):
+            qs = facets.apply(Recipe.objects.all(), params)
+        self.assertIn("NOT", str(qs.query))
+        self.assertEqual(set(qs.values_list("id", flat=True)), old_filter(params))
+
+    def test_invalid_labels_match_nothing(self):
+        self.assertFalse(facets.apply(Recipe.objects.all(), QueryDict("event_labels=abc")).exists())
+        self.assertEqual(facets.apply(Recipe.objects.all(), QueryDict("max_duration=abc")).count(), 60)
+
+
+class SnapshotStoreTests(SimpleTestCase):
+    databases = {"default"}
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        settings_override = override_settings(SNAPSHOT_DIR=tmp.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.builds = 0
+
+    def build(self):
+        self.builds += 1
+        return {"build": self.builds}
+
+    def test_rebuilds_only_after_invalidate(self):
+        store = SnapshotStore("test", self.build)
+        self.assertEqual(store.get(), {"build": 1})
+        self.assertEqual(store.get(), {"build": 1})
+
+        store.invalidate()
+        self.assertEqual(store.get(), {"build": 2})
+        self.assertEqual(self.builds, 2)
+
+    def test_other_process_loads_the_file(self):
+        SnapshotStore("test", self.build).get()
+        # wie ein zweiter Worker: eigener Speicher, gleiche Dateien
+        other = SnapshotStore("test", self.build)
+        self.assertEqual(other.get(), {"build": 1})
+        self.assertEqual(self.builds, 1)
+
+        SnapshotStore("test", self.build).invalidate()
+        self.assertEqual(other.get(), {"build": 2})
+
+    def test_update_continues_from_the_last_state(self):
+        store = SnapshotStore("test", self.build, update=lambda old: {"build": old["build"], "updated": True})
+        store.get()
+        store.invalidate()
+        self.assertEqual(store.get(), {"build": 1, "updated": True})
+        self.assertEqual(self.builds, 1)
+
+    def test_broken_file_is_rebuilt(self):
+        store = SnapshotStore("test", self.build)
+        store.get()
+        store.path.write_bytes(b"kaputt")
+        self.assertEqual(SnapshotStore("test", self.build).get(), {"build": 2})
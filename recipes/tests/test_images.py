@@ -0,0 +1,87 @@
+import tempfile
+from io import BytesIO, StringIO
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.template.loader import render_to_string
+from django.test import TestCase, override_settings
+from PIL import Image
+
+from recipes.models import Job, Recipe
+
+
+def upload(name="kuchen.png", size=(600, 400)):
+    buffer = BytesIO()
+    Image.new("RGB", size, "orange").save(buffer, "PNG")
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type="image/png")
+
+
+class RecipeImageTests(TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        media = override_settings(MEDIA_ROOT=tmp.name)
+        media.enable()
+        self.addCleanup(media.disable)
+
+    def test_upload_sets_dimensions_before_the_job_runs(self):
+        recipe = Recipe.objects.create(title="Kuchen", image=upload())
+
+        recipe.refresh_from_db()
+        self.assertEqual((recipe.image_width, recipe.image_height), (600, 400))
+        self.assertEqual(recipe.large_size, (600, 400))
+        self.assertEqual(recipe.large_url, recipe.image.url)
+
+        recipe.image = upload("breit.png", (900, 300))
+        recipe.save()
+        recipe.refresh_from_db()
+        self.assertEqual((recipe.image_width, recipe.image_height), (900, 300))
+
+        recipe.image = None
+        recipe.save()
+        self.assertEqual(recipe.large_size, (None, None))
+
+    def test_backfill_images(self):
+        recipe = Recipe.objects.create(title="Kuchen", image=upload())
+        Recipe.objects.create(title="Suppe")
+        Recipe.objects.filter(pk=recipe.pk).update(image_width=None, image_height=None)
+        Job.objects.all().delete()
+
+        out = StringIO()
+        call_command("backfill_images", stdout=out)
+        self.assertIn("1 Rezepte als Jobs eingereiht", out.getvalue())
+        self.assertEqual(Job.objects.get().payload, {"recipe_id": recipe.pk})
+
+        call_command("backfill_images", now=True, stdout=out)
+        recipe.refresh_from_db()
+        self.assertEqual((recipe.image_width, recipe.image_height), (600, 400))
+        self.assertTrue(recipe.image_placeholder.startswith("data:image/webp;base64,"))
+        self.assertEqual(recipe.renditions["sizes"], {"thumb": [480, 320], "large": [600, 400]})
+
+        # vollständige Rezepte werden ohne --all übersprungen
+        call_command("backfill_images", stdout=out)
+        self.assertIn("0 Rezepte als Jobs eingereiht", out.getvalue())
+
+    def test_image_include(self):
+        recipe = Recipe(
+            title="Kuchen",
+            image="recipes/kuchen.png",
+            image_width=600,
+            image_height=400,
+            image_placeholder="data:image/webp;base64,AAAA",
+        )
+        html = render_to_string("recipes/recipe_image.html", {
+            "recipe": recipe, "src": recipe.thumb_url, "size": recipe.thumb_size, "css_class": "card-img-top",
+        })
+        self.assertIn('width="600" height="400"', html)
+        self.assertIn('loading="lazy"', html)
+        self.assertNotIn("fetchpriority", html)
+        self.assertIn("background: url(data:image/webp;base64,AAAA)", html)
+
+        html = render_to_string("recipes/recipe_image.html", {
+            "recipe": Recipe(title="Suppe"), "src": "", "size": (None, None), "loading": "eager",
+        })
+        self.assertNotIn("width=", html)
+        self.assertIn('loading="eager"', html)
+        self.assertIn('fetchpriority="high"', html)
+        self.assertNotIn("background", html)
@@ -0,0 +1,85 @@
+from django.test import TestCase
+from django.utils import timezone
+
+from recipes import jobs, renditions
+from recipes.models import Job
+
+
+@jobs.job("tests.failing", max_attempts=2, dedupe=lambda **payload: f"tests.failing:{payload['key']}")
+def failing(key):
+    raise RuntimeError("kaputt")
+
+
+class JobQueueTests(TestCase):
+    def test_enqueue_returns_the_waiting_job(self):
+        first = failing.enqueue(key=1)
+        self.assertEqual(failing.enqueue(key=1), first)
+        self.assertNotEqual(failing.enqueue(key=2), first)
+
+        # läuft der Job schon, wird neu eingereiht (die Änderung kam danach)
+        self.assertEqual(jobs.claim_next(), first)
+        self.assertNotEqual(failing.enqueue(key=1), first)
+
+    def test_stale_job_can_be_claimed_again(self):
+        job_obj = failing.enqueue(key=1)
+        jobs.claim_next()
+        Job.objects.update(updated_at=timezone.now() - jobs.STALE_AFTER * 2)
+
+        self.assertIsNone(jobs.claim_next())
+        self.assertEqual(jobs.requeue_stale(), 1)
+        claimed = jobs.claim_next()
+        self.assertEqual(claimed, job_obj)
+        self.assertEqual(claimed.attempts, 2)
+
+    def test_retry_then_fail(self):
+        job_obj = failing.enqueue(key=1)
+
+        self.assertFalse(jobs.run_job(jobs.claim_next()))
+        job_obj.refresh_from_db()
+        self.assertEqual(job_obj.status, Job.QUEUED)
+        self.assertGreater(job_obj.run_after, timezone.now())
+        self.assertIn("kaputt", job_obj.last_error)
+
+        Job.objects.update(run_after=timezone.now())
+        self.assertFalse(jobs.run_job(jobs.claim_next()))
+        job_obj.refresh_from_db()
+        self.assertEqual(job_obj.status, Job.FAILED)
+
+    def test_retry_blocked_by_waiting_job_stays_failed(self):
+        job_obj = failing.enqueue(key=1)
+        jobs.claim_next()
+        waiting = failing.enqueue(key=1)
+
+        jobs.run_job(Job.objects.get(id=job_obj.id))
+
+        self.assertEqual(Job.objects.get(id=job_obj.id).status, Job.FAILED)
+        self.assertEqual(Job.objects.get(id=waiting.id).status, Job.QUEUED)
+
+    def test_running_job_with_heartbeat_is_not_requeued(self):
+        long_ago = timezone.now() - jobs.STALE_AFTER * 2
+        alive = Job.objects.create(name="recipes.build_renditions", status=Job.RUNNING)
+        crashed = Job.objects.create(name="recipes.build_renditions", status=Job.RUNNING)
+        Job.objects.update(updated_at=long_ago)
+
+        jobs.beat(alive.id)
+
+        self.assertEqual(jobs.requeue_stale(), 1)
+        self.assertEqual(Job.objects.get(id=alive.id).status, Job.RUNNING)
+        self.assertEqual(Job.objects.get(id=crashed.id).status, Job.QUEUED)
+
+    def test_purge_done_keeps_recent_and_failed_jobs(self):
+        old = timezone.now() - jobs.DONE_RETENTION * 2
+        for status in (Job.DONE, Job.FAILED):
+            Job.objects.create(name="recipes.build_renditions", status=status)
+        Job.objects.update(updated_at=old)
+        recent = Job.objects.create(name="recipes.build_renditions", status=Job.DONE)
+
+        self.assertEqual(jobs.purge_done(), 1)
+        self.assertEqual(set(Job.objects.values_list("status", flat=True)), {Job.DONE, Job.FAILED})
+        self.assertTrue(Job.objects.filter(id=recent.id).exists())
+
+    def test_rendition_paths_differ_by_extension(self):
+        self.assertNotEqual(
+            renditions.rendition_path("recipes/foo.jpg", "thumb"),
+            renditions.rendition_path("recipes/foo.png", "thumb"),
+        )
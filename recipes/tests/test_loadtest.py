@@ -0,0 +1,65 @@
+from http.cookies import SimpleCookie
+from importlib import import_module
+from io import StringIO
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection
+from django.test import SimpleTestCase, TransactionTestCase
+
+from recipes import loadtest
+from recipes.models import Recipe, WeeklyPlan
+
+CORPUS = {"slugs": ["suppe"], "recipe_ids": [1], "label_ids": [(1, "event")], "words": ["Suppe"]}
+
+
+class ReportTests(SimpleTestCase):
+    def test_percentile(self):
+        values = [i / 100 for i in range(1, 101)]
+        self.assertEqual(loadtest.percentile(values, 50), 0.5)
+        self.assertEqual(loadtest.percentile(values, 99), 0.99)
+        self.assertEqual(loadtest.percentile([], 95), 0.0)
+
+    def test_anonymous_scenario_only_reads(self):
+        scenario = loadtest.Scenario(CORPUS, loadtest.DEFAULT_MIX, authenticated=False, seed=1)
+        for _ in range(200):
+            for endpoint, method, *_ in scenario.next_actions():
+                self.assertNotIn(endpoint, loadtest.AUTH_ENDPOINTS)
+                self.assertEqual(method, "GET")
+
+    def test_seed_makes_runs_repeatable(self):
+        first, second = (loadtest.Scenario(CORPUS, loadtest.DEFAULT_MIX, True, seed=7) for _ in range(2))
+        self.assertEqual([first.next_actions() for _ in range(20)], [second.next_actions() for _ in range(20)])
+
+    def test_report(self):
+        stats = loadtest.Stats()
+        stats.record("detail", 0.01, True)
+        stats.record("detail", 0.03, False)
+        report = loadtest.format_report(stats, duration=2)
+        self.assertIn("detail", report)
+        self.assertIn("Gesamt: 2 Anfragen, 1.0 req/s", report)
+
+
+class LoadtestCommandTests(TransactionTestCase):
+    def test_runs_against_a_copy(self):
+        User.objects.create_user("koch")
+        Recipe.objects.create(title="Suppe")
+        database = connection.settings_dict["NAME"]
+
+        out = StringIO()
+        call_command("loadtest", users=2, duration=0.5, username="koch", seed=1, stdout=out)
+
+        self.assertIn("Gesamt:", out.getvalue())
+        self.assertEqual(connection.settings_dict["NAME"], database)
+        self.assertFalse(WeeklyPlan.objects.exists())
+        self.assertEqual(Recipe.objects.get().cooked_count, 0)
+
+    def test_session_is_removed_afterwards(self):
+        User.objects.create_user("koch")
+        sessions = import_module(settings.SESSION_ENGINE).SessionStore()
+
+        with loadtest.logged_in("koch") as (cookie_header, csrf_secret):
+            key = SimpleCookie(cookie_header)[settings.SESSION_COOKIE_NAME].value
+            self.assertTrue(sessions.exists(key))
+        self.assertFalse(sessions.exists(key))
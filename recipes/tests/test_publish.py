@@ -0,0 +1,101 @@
+import fcntl
+import gzip
+import json
+import tempfile
+import threading
+from pathlib import Path
+from unittest import mock
+
+from django.test import TransactionTestCase, override_settings
+
+from recipes import publish
+from recipes.models import Recipe
+
+
+class PublishTests(TransactionTestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = Path(tmp.name) / "publish"
+        root = override_settings(PUBLISH_ROOT=str(self.root))
+        root.enable()
+        self.addCleanup(root.disable)
+
+    def manifest(self):
+        return json.loads((self.root / publish.MANIFEST_NAME).read_text(encoding="utf-8"))
+
+    def test_publish_all_writes_pages_and_manifest(self):
+        recipe = Recipe.objects.create(title="Suppe")
+
+        self.assertEqual(publish.publish_all(), 3)
+
+        pages = self.manifest()["pages"]
+        self.assertEqual(set(pages), {"/recipes/", *publish.recipe_paths(recipe)})
+        detail = pages[recipe.get_absolute_url()]
+        self.assertEqual(detail["owner"], recipe.id)
+        html = (self.root / detail["file"]).read_bytes()
+        self.assertEqual(len(html), detail["size"])
+        self.assertIn(b"Suppe", html)
+        self.assertEqual(gzip.decompress((self.root / (detail["file"] + ".gz")).read_bytes()), html)
+
+    def test_unchanged_pages_are_not_written_again(self):
+        recipe = Recipe.objects.create(title="Suppe")
+        publish.publish_all()
+
+        with mock.patch.object(publish, "_write", wraps=publish._write) as write:
+            publish.publish_recipe(recipe.id)
+            self.assertFalse(write.called)
+
+            recipe.title = "Kürbissuppe"
+            recipe.save()
+            publish.publish_recipe(recipe.id)
+            self.assertEqual(write.call_count, 2)
+
+    def test_pages_of_deleted_recipes_are_removed(self):
+        kept, deleted = Recipe.objects.create(title="Suppe"), Recipe.objects.create(title="Salat")
+        publish.publish_all()
+        detail = self.root / self.manifest()["pages"][deleted.get_absolute_url()]["file"]
+        Recipe.objects.filter(pk=deleted.pk).delete()
+
+        self.assertEqual(publish.publish_all(), 3)
+        self.assertFalse(detail.exists())
+        self.assertFalse(detail.with_name("index.html.gz").exists())
+        # leere Verzeichnisse werden mit aufgeräumt
+        self.assertFalse(detail.parent.exists())
+        self.assertEqual({page["owner"] for page in self.manifest()["pages"].values()}, {"index", kept.id})
+
+        # einzeln: ein Job für ein inzwischen gelöschtes Rezept
+        paths = publish.recipe_paths(kept)
+        Recipe.objects.filter(pk=kept.pk).delete()
+        publish.publish_recipe(kept.id)
+        self.assertFalse(set(paths) & set(self.manifest()["pages"]))
+
+    def test_waits_for_the_lock(self):
+        recipe = Recipe.objects.create(title="Suppe")
+        self.root.mkdir(parents=True)
+        worker = threading.Thread(target=publish.publish_recipe, args=[recipe.id])
+
+        # wie ein zweiter Prozess, der gerade veröffentlicht
+        with open(self.root / ".lock", "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            worker.start()
+            worker.join(0.3)
+            self.assertTrue(worker.is_alive())
+            self.assertFalse((self.root / publish.MANIFEST_NAME).exists())
+        worker.join(5)
+
+        self.assertFalse(worker.is_alive())
+        self.assertEqual(set(self.manifest()["pages"]), set(publish.recipe_paths(recipe)))
+
+    def test_failed_run_releases_the_lock_and_keeps_the_manifest(self):
+        recipe = Recipe.objects.create(title="Suppe")
+        publish.publish_all()
+        before = self.manifest()
+
+        with mock.patch.object(publish, "render_anonymous", side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                publish.publish_recipe(recipe.id)
+        self.assertEqual(self.manifest(), before)
+
+        publish.publish_index()
+        self.assertEqual(set(self.manifest()["pages"]), set(before["pages"]))
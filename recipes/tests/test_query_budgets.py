@@ -0,0 +1,167 @@
+import re
+import sys
+from collections import Counter
+
+from django.contrib import admin
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.template.base import Node
+from django.test import TestCase
+from django.urls import URLPattern, reverse
+
+from recipes import facets, suggest
+from recipes import urls as recipe_urls
+from recipes.models import Job, Label, Recipe, WeeklyPlan, WeeklyPlanEntry, current_week_start
+from recipes.views import DAYS
+
+
+# Maximale Anzahl SQL-Abfragen pro Seite. Die Zahl darf nicht mit der Anzahl
+# der Rezepte wachsen; neue Views müssen hier einen Eintrag bekommen.
+QUERY_BUDGETS = {
+    "recipes:index": 5,
+    "recipes:index_filtered": 5,
+    "recipes:create": 3,
+    "recipes:random": 4,
+    "recipes:weekly_plan": 6,
+    "recipes:job_status": 4,
+    "recipes:export": 4,
+    "recipes:api_recipe_list": 1,
+    "recipes:api_recipe_export": 2,
+    "recipes:api_recipe_detail": 2,
+    "recipes:api_cook_bundle": 1,
+    "recipes:api_label_list": 1,
+    "recipes:api_suggest": 0,
+    "recipes:api_weekly_plan": 4,
+    "recipes:api_cook_offline": 2,
+    "recipes:service_worker": 0,
+    "recipes:cook": 4,
+    "recipes:delete": 3,
+    "recipes:update": 5,
+    "recipes:detail": 4,
+    # Admin-Changelists
+    "admin:changelist": 6,
+}
+
+SMALL_CORPUS = 3
+LARGE_CORPUS = 30
+
+
+class QueryRecorder:
+    """Zeichnet alle SQL-Abfragen samt auslösender Template-Zeile auf."""
+
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        self.queries.append((sql, self._template_location()))
+        return execute(sql, params, many, context)
+
+    @staticmethod
+    def _template_location():
+        frame = sys._getframe(2)
+        while frame is not None:
+            node = frame.f_locals.get("self")
+            # type() statt isinstance(): LazyObjects würden sonst ausgewertet
+            if issubclass(type(node), Node) and getattr(node, "token", None) is not None:
+                origin = getattr(node, "origin", None)
+                name = getattr(origin, "template_name", None) or "?"
+                return f"{name}:{node.token.lineno}"
+            frame = frame.f_back
+        return None
+
+    def report(self):
+        normalized = Counter(re.sub(r"\b\d+\b", "?", sql) for sql, _ in self.queries)
+        lines = [f"{len(self.queries)} Abfragen:"]
+        for sql, location in self.queries:
+            lines.append(f"  [{location or 'View'}] {sql}")
+        duplicated = [(sql, count) for sql, count in normalized.items() if count > 1]
+        if duplicated:
+            lines.append("Mehrfach ausgeführt:")
+            lines.extend(f"  {count}× {sql}" for sql, count in duplicated)
+        return "\n".join(lines)
+
+
+class QueryBudgetTests(TestCase):
+    """Rendert jede Seite mit kleinem und großem Datenbestand und prüft das Abfragebudget."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_superuser("koch", "koch@example.com", "geheim")
+        cls.category = Label.objects.create(name="Pasta", label_type=Label.CATEGORY)
+        cls.event = Label.objects.create(name="Grillen", label_type=Label.EVENT)
+        cls.plan = WeeklyPlan.objects.create(user=cls.user, week_start=current_week_start())
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_login(self.user)
+
+    def seed(self, total):
+        """Füllt den Bestand auf ``total`` Rezepte auf, jeweils mit Labels und Planeinträgen."""
+        for index in range(Recipe.objects.count(), total):
+            recipe = Recipe.objects.create(
+                title=f"Rezept {index}",
+                duration_minutes=10 + index,
+                working_time=5 + index,
+                ingredients="200 g Nudeln\n1 Zwiebel",
+                steps="Kochen\nServieren",
+            )
+            recipe.labels.add(self.category, self.event)
+            WeeklyPlanEntry.objects.create(plan=self.plan, day=DAYS[index % len(DAYS)], recipe=recipe)
+            Job.objects.create(name="recipes.build_renditions", payload={"recipe_id": recipe.pk})
+
+    def pages(self):
+        """(Budget-Name, URL) für alle Routen aus recipes.urls und alle Admin-Changelists."""
+        recipe = Recipe.objects.order_by("id").first()
+        for pattern in recipe_urls.urlpatterns:
+            self.assertIsInstance(pattern, URLPattern)
+            name = f"recipes:{pattern.name}"
+            kwargs = {"slug": recipe.slug} if "slug" in pattern.pattern.converters else {}
+            yield name, reverse(name, kwargs=kwargs)
+
+        yield "recipes:index_filtered", (
+            f"{reverse('recipes:index')}?q=Rezept&max_duration=500"
+            f"&category_labels={self.category.id}&event_labels={self.event.id}"
+        )
+
+        for model in admin.site._registry:
+            opts = model._meta
+            yield "admin:changelist", reverse(f"admin:{opts.app_label}_{opts.model_name}_changelist")
+
+    def measure(self, url):
+        # immer mit kaltem Cache messen, damit beide Läufe vergleichbar sind
+        cache.clear()
+        # die Indizes werden nur nach Änderungen neu aufgebaut, nicht pro Anfrage
+        facets.store.get()
+        suggest.store.get()
+        recorder = QueryRecorder()
+        with connection.execute_wrapper(recorder):
+            response = self.client.get(url)
+            if response.streaming:
+                b"".join(response.streaming_content)
+        self.assertEqual(response.status_code, 200, url)
+        return recorder
+
+    def test_every_view_has_a_budget(self):
+        self.seed(SMALL_CORPUS)
+        missing = {name for name, url in self.pages()} - set(QUERY_BUDGETS)
+        self.assertFalse(missing, f"Kein Abfragebudget für: {', '.join(sorted(missing))}")
+
+    def test_query_budgets_independent_of_corpus_size(self):
+        self.seed(SMALL_CORPUS)
+        small = {url: self.measure(url) for name, url in self.pages()}
+
+        self.seed(LARGE_CORPUS)
+        for name, url in self.pages():
+            large = self.measure(url)
+            with self.subTest(url=url):
+                budget = QUERY_BUDGETS[name]
+                self.assertLessEqual(
+                    len(large.queries), budget,
+                    f"{url} überschreitet das Budget von {budget}.\n{large.report()}",
+                )
+                self.assertEqual(
+                    len(large.queries), len(small[url].queries),
+                    f"{url} braucht mit {LARGE_CORPUS} statt {SMALL_CORPUS} Rezepten mehr Abfragen.\n"
+                    f"{large.report()}",
+                )
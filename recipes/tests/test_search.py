@@ -0,0 +1,36 @@
+from django.test import TestCase
+
+from recipes.models import Recipe
+from recipes.search import fts_available, search_recipes
+
+
+class SearchTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        for title, ingredients in [
+            ("Semmelknödel", "6 Brötchen\n3 Eier"),
+            ("Käsekuchen", "500 g Quark"),
+            ("Apfelkuchen", "4 Äpfel"),
+            ("Schweinebraten", "Bratensoße"),
+            ("Spaghetti", "Tomatensauce\n1 EL Öl"),
+        ]:
+            Recipe.objects.create(title=title, ingredients=ingredients)
+
+    def titles(self, term):
+        return sorted(search_recipes(Recipe.objects.all(), term).values_list("title", flat=True))
+
+    def test_uses_fts_index(self):
+        self.assertTrue(fts_available())
+
+    def test_finds_parts_of_compound_words(self):
+        self.assertEqual(self.titles("knödel"), ["Semmelknödel"])
+        self.assertEqual(self.titles("kuchen"), ["Apfelkuchen", "Käsekuchen"])
+        self.assertEqual(self.titles("SOßE"), ["Schweinebraten"])
+        self.assertEqual(self.titles("sauce"), ["Spaghetti"])
+
+    def test_all_words_must_match(self):
+        self.assertEqual(self.titles("kuchen quark"), ["Käsekuchen"])
+
+    def test_short_words_fall_back_to_icontains(self):
+        self.assertEqual(self.titles("Öl"), ["Spaghetti"])
+        self.assertEqual(self.titles("Öl spag"), ["Spaghetti"])
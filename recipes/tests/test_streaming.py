@@ -0,0 +1,104 @@
+import gzip
+import io
+import zipfile
+
+from django.contrib.auth.models import User
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase
+from django.urls import reverse
+
+from cookbook.middleware import FLUSH_BYTES, CompressionMiddleware, accepted_encodings
+from recipes.models import Recipe
+
+
+class StreamingPageTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("koch")
+        Recipe.objects.bulk_create(Recipe(title=f"Rezept {index}", slug=f"rezept-{index}") for index in range(30))
+
+    def test_wsgi_gets_a_sync_stream(self):
+        self.client.force_login(self.user)
+        response = self.client.get(reverse("recipes:index"))
+        self.assertFalse(response.is_async)
+        self.assertIn("Rezept 29", b"".join(response.streaming_content).decode())
+
+    async def test_asgi_gets_an_async_stream(self):
+        await self.async_client.aforce_login(self.user)
+        response = await self.async_client.get(reverse("recipes:index"), headers={"accept-encoding": "gzip"})
+
+        self.assertTrue(response.is_async)
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        body = b"".join([part async for part in response.streaming_content])
+        html = gzip.decompress(body).decode()
+        self.assertIn("Rezept 0", html)
+        self.assertIn("Rezept 29", html)
+
+    def assert_export(self, body):
+        with zipfile.ZipFile(io.BytesIO(body)) as archive:
+            self.assertIsNone(archive.testzip())
+            names = archive.namelist()
+        self.assertIn("index.html", names)
+        self.assertEqual(len(names), 31)
+
+    def test_wsgi_export_streams(self):
+        self.client.force_login(self.user)
+        response = self.client.get(reverse("recipes:export"))
+        self.assertFalse(response.is_async)
+        self.assert_export(b"".join(response.streaming_content))
+
+    async def test_asgi_export_streams(self):
+        await self.async_client.aforce_login(self.user)
+        response = await self.async_client.get(reverse("recipes:export"))
+
+        self.assertTrue(response.is_async)
+        self.assertEqual(response["Content-Type"], "application/zip")
+        self.assert_export(b"".join([part async for part in response.streaming_content]))
+
+
+class CompressionMiddlewareTests(SimpleTestCase):
+    def compress(self, response, accept_encoding="gzip"):
+        request = RequestFactory().get("/", headers={"accept-encoding": accept_encoding})
+        return CompressionMiddleware(lambda request: response)(request)
+
+    def test_accepted_encodings(self):
+        self.assertEqual(accepted_encodings("gzip, br;q=0.5, deflate;q=0"), {"gzip", "br"})
+        self.assertEqual(accepted_encodings("gzip;q=kaputt"), set())
+
+    def test_strong_etag_becomes_weak(self):
+        response = self.compress(HttpResponse("Kuchen " * 100, headers={"ETag": '"abc"'}))
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(response["ETag"], 'W/"abc"')
+        self.assertEqual(response["Vary"], "Accept-Encoding")
+        self.assertEqual(gzip.decompress(response.content).decode(), "Kuchen " * 100)
+        self.assertEqual(response["Content-Length"], str(len(response.content)))
+
+    def test_refused_encoding_is_not_used(self):
+        response = self.compress(HttpResponse("Kuchen " * 100, headers={"ETag": '"abc"'}), "gzip;q=0")
+        self.assertFalse(response.has_header("Content-Encoding"))
+        self.assertEqual(response["ETag"], '"abc"')
+        self.assertEqual(response["Vary"], "Accept-Encoding")
+
+    def test_compressed_formats_and_short_responses_are_left_alone(self):
+        for response in (
+            HttpResponse(b"\xff" * 1000, content_type="image/jpeg"),
+            HttpResponse(b"PK" * 500, content_type="application/zip"),
+            HttpResponse("kurz"),
+        ):
+            compressed = self.compress(response)
+            self.assertFalse(compressed.has_header("Content-Encoding"))
+            self.assertFalse(compressed.has_header("Vary"))
+
+    def test_svg_is_compressed(self):
+        response = self.compress(HttpResponse("<svg></svg>" * 100, content_type="image/svg+xml"))
+        self.assertEqual(response["Content-Encoding"], "gzip")
+
+    def test_stream_is_flushed_in_pieces(self):
+        parts = [f"<p>Schritt {index}</p>".encode() * 50 for index in range(40)]
+        response = self.compress(StreamingHttpResponse(iter(parts)))
+
+        pieces = [piece for piece in response.streaming_content if piece]
+        self.assertGreater(len(pieces), 1)
+        self.assertEqual(gzip.decompress(b"".join(pieces)), b"".join(parts))
+        self.assertGreater(sum(map(len, parts)), FLUSH_BYTES)
+        self.assertFalse(response.has_header("Content-Length"))
@@ -0,0 +1,41 @@
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+
+from recipes.models import Label, Recipe
+
+
+class LabelSuggestionTests(TestCase):
+    def test_label_suggestion_filters_instead_of_searching(self):
+        label = Label.objects.create(name="Ostern", label_type=Label.EVENT)
+        lamb = Recipe.objects.create(title="Lammbraten")
+        lamb.labels.add(label)
+        Recipe.objects.create(title="Osterbrot")
+
+        response = self.client.get(reverse("recipes:api_suggest"), {"q": "oster"})
+        result = next(item for item in response.json()["results"] if item["kind"] == "label")
+        self.assertEqual(result["text"], "Ostern")
+        self.assertEqual(result["filter"], {"event_labels": label.id})
+
+        self.client.force_login(User.objects.create_user("koch"))
+        response = self.client.get(reverse("recipes:index"), result["filter"])
+        self.assertEqual(response.context["result_count"], 1)
+        self.assertIn("Lammbraten", b"".join(response.streaming_content).decode())
+
+    def test_other_suggestions_have_no_filter(self):
+        Recipe.objects.create(title="Osterbrot")
+        response = self.client.get(reverse("recipes:api_suggest"), {"q": "oster"})
+        self.assertEqual(response.json()["results"], [{"text": "Osterbrot", "kind": "title", "count": 1}])
+
+    def test_labels_with_the_same_name_stay_apart(self):
+        category = Label.objects.create(name="Ostern", label_type=Label.CATEGORY)
+        event = Label.objects.create(name="Ostern", label_type=Label.EVENT)
+        Recipe.objects.create(title="Lammbraten").labels.add(category, event)
+        Recipe.objects.create(title="Eiersalat").labels.add(event)
+
+        response = self.client.get(reverse("recipes:api_suggest"), {"q": "ostern"})
+        self.assertEqual(response.json()["results"], [
+            {"text": "Ostern", "kind": "label", "count": 2, "label_type": "event", "filter": {"event_labels": event.id}},
+            {"text": "Ostern", "kind": "label", "count": 1, "label_type": "category",
+             "filter": {"category_labels": category.id}},
+        ])
@@ -0,0 +1,18 @@
+from django.test import TestCase
+from django.urls import resolve, reverse
+
+from recipes.models import Recipe
+
+
+class SlugRouteTests(TestCase):
+    def test_tool_pages_do_not_hide_recipes(self):
+        for title in ("Jobs", "Export", "Tools"):
+            recipe = Recipe.objects.create(title=title)
+            url = recipe.get_absolute_url()
+            self.assertEqual(resolve(url).url_name, "detail")
+            self.assertEqual(self.client.get(url).context["recipe"], recipe)
+
+    def test_api_export_does_not_hide_recipe(self):
+        recipe = Recipe.objects.create(title="Export")
+        url = reverse("recipes:api_recipe_detail", kwargs={"slug": recipe.slug})
+        self.assertEqual(resolve(url).url_name, "api_recipe_detail")
@@ -0,0 +1,40 @@
+from datetime import timedelta
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+
+from recipes.models import Recipe, WeeklyPlan, WeeklyPlanEntry, current_week_start
+from recipes.views import DAYS
+
+
+class WeeklyPlanViewTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("koch", password="geheim")
+        cls.recipe = Recipe.objects.create(title="Eintopf")
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def test_browsing_weeks_creates_no_plans(self):
+        for week in ("2026-01-05", "2026-01-12", "2026-01-19"):
+            self.assertEqual(self.client.get(reverse("recipes:weekly_plan"), {"week": week}).status_code, 200)
+        self.assertFalse(WeeklyPlan.objects.exists())
+
+    def test_copy_previous_is_idempotent(self):
+        previous = WeeklyPlan.for_week(self.user, current_week_start() - timedelta(weeks=1))
+        WeeklyPlanEntry.objects.create(plan=previous, day=DAYS[0], recipe=self.recipe)
+        WeeklyPlanEntry.objects.create(plan=previous, day=DAYS[2], recipe=self.recipe)
+
+        for _ in range(2):
+            self.client.get(reverse("recipes:weekly_plan"), {"action": "copy_previous"})
+
+        plan = WeeklyPlan.find(self.user, current_week_start())
+        self.assertEqual(sorted(plan.entries.values_list("day", flat=True)), sorted([DAYS[0], DAYS[2]]))
+
+    def test_weeks_at_the_edge_of_the_calendar(self):
+        for week in ("0001-01-01", "9999-12-31"):
+            response = self.client.get(reverse("recipes:weekly_plan"), {"week": week})
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.context["week_start"], current_week_start())
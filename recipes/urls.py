@@ -1,5 +1,5 @@
 from django.urls import path
-from . import views
+from . import api, views
 
 app_name = "recipes"
 
@@ -8,6 +8,18 @@ urlpatterns = [
     path("add/", views.RecipeCreateView.as_view(), name="create"),
     path("random/", views.RandomRecipeView.as_view(), name="random"),
     path('weekly-plan/', views.weekly_plan_view, name='weekly_plan'),
+    # Werkzeuge unter tools/, damit sie keine Rezept-Slugs ("jobs", "export") verdecken
+    path("tools/jobs/", views.job_status_view, name="job_status"),
+    path("tools/export/", views.export_view, name="export"),
+    path("api/recipes/", api.recipe_list, name="api_recipe_list"),
+    path("api/export/", api.recipe_export, name="api_recipe_export"),
+    path("api/recipes/<slug:slug>/", api.recipe_detail, name="api_recipe_detail"),
+    path("api/recipes/<slug:slug>/cook/", api.cook_bundle, name="api_cook_bundle"),
+    path("api/labels/", api.label_list, name="api_label_list"),
+    path("api/suggest/", api.suggest, name="api_suggest"),
+    path("api/weekly-plan/", api.weekly_plan, name="api_weekly_plan"),
+    path("api/cook/offline/", api.cook_offline, name="api_cook_offline"),
+    path("sw.js", views.service_worker, name="service_worker"),
     path("<slug:slug>/cook/", views.RecipeCookView.as_view(), name="cook"),
     path("<slug:slug>/delete/", views.RecipeDeleteView.as_view(), name="delete"),
     path("<slug:slug>/edit/", views.RecipeUpdateView.as_view(), name='update'),
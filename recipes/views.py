@@ -1,14 +1,27 @@
-from django.db.models import F, Q, Case, When, Value, IntegerField
-from django.http import HttpResponseRedirect
+from django.conf import settings
+from django.db.models import F, Q, Case, When, Value, IntegerField, Count
+from django.http import HttpResponse, HttpResponseRedirect
 from django.shortcuts import get_object_or_404, render, redirect
+from django.template.loader import render_to_string
 from django.urls import reverse_lazy, reverse
+from django.utils.html import format_html
+from django.utils.safestring import mark_safe
 from django.views import generic, View
 from django.views.generic import CreateView, DeleteView, TemplateView
-from datetime import date
-import random
-
-from .models import Recipe, Label, WeeklyPlan, WeeklyPlanEntry
+from datetime import date, timedelta
+import hashlib
+import json
+
+from .models import (
+    Job, Recipe, Label, WeeklyPlan, WeeklyPlanEntry,
+    current_week_start, recently_planned_recipe_ids, split_lines, week_start_for,
+)
+from . import cook, export, facets
+from .assets import CDN
+from .cards import iter_cards
 from .forms import RecipeForm
+from .streaming import render_streaming, streaming_response
+from django.contrib.admin.views.decorators import staff_member_required
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.contrib.auth.views import redirect_to_login
@@ -17,41 +30,29 @@ from django.contrib.auth.views import redirect_to_login
 DAYS = ['Montag', 'Dienstag', 'Mittwoch', 'Donnerstag', 'Freitag', 'Samstag', 'Sonntag']
 
 
-def filter_recipes(qs, params):
+def filter_recipes(qs, params, user=None):
     # 🔎 Suche
     query = params.get("q")
     if query:
         qs = qs.filter(
             Q(title__icontains=query) |
             Q(ingredients__icontains=query)
-        ).distinct()
+        )
 
-    # ⏱ Dauer
-    max_duration = params.get("max_duration")
-    if max_duration:
-        try:
-            qs = qs.filter(duration_minutes__lte=int(max_duration))
-        except ValueError:
-            pass
+    # ⏱ Dauer und 🏷 Labels über den Bitmap-Index (kein JOIN, kein DISTINCT)
+    qs = facets.apply(qs, params)
 
-    max_working = params.get("max_working_duration")
-    if max_working:
+    # 📅 Nicht in den letzten Wochen geplant
+    skip_planned = params.get("skip_planned")
+    if skip_planned and user is not None and user.is_authenticated:
         try:
-            qs = qs.filter(working_time__lte=int(max_working))
+            weeks = int(skip_planned)
         except ValueError:
-            pass
-
-    # 🏷 Labels
-    category_ids = params.getlist("category_labels")
-    event_ids = params.getlist("event_labels")
-
-    if category_ids:
-        qs = qs.filter(labels__id__in=category_ids, labels__label_type="category")
-
-    if event_ids:
-        qs = qs.filter(labels__id__in=event_ids, labels__label_type="event")
+            weeks = 0
+        if weeks > 0:
+            qs = qs.exclude(id__in=recently_planned_recipe_ids(user, weeks=weeks))
 
-    return qs.distinct()
+    return qs
 
 
 class RecipeCreateView(LoginRequiredMixin, CreateView):
@@ -101,8 +102,7 @@ class IndexView(generic.ListView):
     context_object_name = "latest_recipe_list"
 
     def get_queryset(self):
-        qs = Recipe.objects.prefetch_related("labels")
-        qs = filter_recipes(qs, self.request.GET)
+        qs = filter_recipes(Recipe.objects.all(), self.request.GET, user=self.request.user)
 
         sort_param = self.request.GET.get("sort", "title")
         if sort_param == "duration":
@@ -127,6 +127,7 @@ class IndexView(generic.ListView):
         context["selected_categories"] = list(map(int, selected_categories))
         context["selected_events"] = list(map(int, selected_events))
 
+        # die Karten selbst werden erst beim Ausliefern gerendert (render_to_response)
         context["result_count"] = self.object_list.count()
 
         # ✅ FILTER STATUS (wichtig!)
@@ -134,12 +135,20 @@ class IndexView(generic.ListView):
             self.request.GET.get("q"),
             self.request.GET.get("max_duration"),
             self.request.GET.get("max_working_duration"),
+            self.request.GET.get("skip_planned"),
             selected_categories,
             selected_events,
         ])
 
         return context
 
+    def render_to_response(self, context, **response_kwargs):
+        query_string = self.request.GET.urlencode()
+        return render_streaming(
+            self.request, self.template_name, context,
+            recipe_cards=lambda: iter_cards(self.object_list, query_string),
+        )
+
 
 
 class DetailView(generic.DetailView):
@@ -148,20 +157,24 @@ class DetailView(generic.DetailView):
     slug_field = "slug"
     slug_url_kwarg = "slug"
 
+    def get_queryset(self):
+        # Labels werden im Template mehrfach abgefragt → einmal vorladen
+        return Recipe.objects.prefetch_related("labels")
+
     def post(self, request, *args, **kwargs):
         if not request.user.is_authenticated:
             return redirect_to_login(request.get_full_path())
         self.object = self.get_object()
         if "cooked" in request.POST:
             self.object.cooked_count = F("cooked_count") + 1
-            self.object.save(update_fields=["cooked_count"])
+            self.object.save(update_fields=["cooked_count", "updated_at"])
         elif "undo_cooked" in request.POST:
             self.object.cooked_count = Case(
                 When(cooked_count__gt=0, then=F("cooked_count") - 1),
                 default=Value(0),
                 output_field=IntegerField(),
             )
-            self.object.save(update_fields=["cooked_count"])
+            self.object.save(update_fields=["cooked_count", "updated_at"])
         return redirect(self.object.get_absolute_url())
 
     def get_context_data(self, **kwargs):
@@ -179,14 +192,8 @@ class DetailView(generic.DetailView):
         except (TypeError, ValueError):
             current_servings = base_servings
 
-        try:
-            ing_list = [line.strip() for line in recipe.ingredients.splitlines() if line.strip()]
-        except BaseException:
-            ing_list = []
-        try:
-            st_list = [line.strip() for line in recipe.steps.splitlines() if line.strip()]
-        except BaseException:
-            st_list = []
+        ing_list = split_lines(recipe.ingredients)
+        st_list = split_lines(recipe.steps)
 
         context.update({
             "recipe": recipe,
@@ -205,13 +212,16 @@ class RecipeCookView(generic.DetailView):
     slug_field = "slug"
     slug_url_kwarg = "slug"
 
+    def get_queryset(self):
+        return Recipe.objects.prefetch_related("labels")
+
     def post(self, request, *args, **kwargs):
         if "cooked" in request.POST and not request.user.is_authenticated:
             return redirect_to_login(request.get_full_path())
         self.object = self.get_object()
         if "cooked" in request.POST and request.user.is_authenticated:
             self.object.cooked_count = F("cooked_count") + 1
-            self.object.save(update_fields=["cooked_count"])
+            self.object.save(update_fields=["cooked_count", "updated_at"])
         elif "back" in request.POST:
             pass
         return redirect(self.object.get_absolute_url())
@@ -230,13 +240,13 @@ class RecipeCookView(generic.DetailView):
         except (TypeError, ValueError):
             current_servings = base_servings
 
-        # Zutaten unverändert übergeben → JS skaliert
+        # Zutaten und Schritte kommen aus dem Bundle, das die Seite auch für
+        # das JS einbettet (skaliert wird dort, offline wie online)
         context.update({
             "recipe": recipe,
             "base_servings": base_servings,
             "current_servings": current_servings,
-            "ingredients_list": [line.strip() for line in recipe.ingredients.splitlines() if line.strip()],
-            "steps_list": [line.strip() for line in recipe.steps.splitlines() if line.strip()],
+            "bundle": cook.bundle(recipe),
         })
         return context
 
@@ -250,14 +260,32 @@ class RandomRecipeView(TemplateView):
         index_view.request = self.request
         qs = index_view.get_queryset()
 
-        context["recipe"] = random.choice(list(qs)) if qs.exists() else None
+        context["recipe"] = qs.prefetch_related("labels").order_by("?").first()
         context["days"] = DAYS
         return context
     
+# Wochen außerhalb dieses Bereichs gibt es nicht: Vor-/Folgewoche und der
+# Rückblick über mehrere Wochen dürfen nicht über date.min/date.max hinauslaufen
+FIRST_WEEK = date(1900, 1, 1)
+LAST_WEEK = date(2999, 12, 31)
+
+
+def requested_week(params):
+    """Liest ``?week=YYYY-MM-DD`` und liefert den zugehörigen Montag."""
+    try:
+        day = date.fromisoformat(params.get("week", ""))
+    except ValueError:
+        return current_week_start()
+    if not FIRST_WEEK <= day <= LAST_WEEK:
+        return current_week_start()
+    return week_start_for(day)
+
+
 @login_required
 def weekly_plan_view(request):
-    week_start = date(2000, 1, 1)
-    plan, _ = WeeklyPlan.objects.get_or_create(week_start=week_start)
+    week_start = requested_week(request.GET)
+    # nur lesen: Blättern durch leere Wochen legt keine Pläne an
+    plan = WeeklyPlan.find(request.user, week_start)
 
     # GET-Parameter kopieren, um sie beim Redirect weiterzugeben
     params = request.GET.copy()
@@ -268,6 +296,7 @@ def weekly_plan_view(request):
 
     if action == "add" and recipe_id and day in DAYS:
         recipe = get_object_or_404(Recipe, id=recipe_id)
+        plan = plan or WeeklyPlan.for_week(request.user, week_start)
         WeeklyPlanEntry.objects.create(plan=plan, day=day, recipe=recipe)
 
         # Entferne Aktions-Parameter, damit die URL sauber bleibt
@@ -280,7 +309,7 @@ def weekly_plan_view(request):
         entry_id = params.get("entry_id")
         comment_text = params.get("comment", "").strip()
         if entry_id:
-            entry = get_object_or_404(WeeklyPlanEntry, id=entry_id)
+            entry = get_object_or_404(WeeklyPlanEntry, id=entry_id, plan__user=request.user)
             entry.comment = comment_text
             entry.save()
 
@@ -293,7 +322,7 @@ def weekly_plan_view(request):
         entry_id = params.get("entry_id")
         new_day = params.get("day")
         if entry_id and new_day in DAYS:
-            entry = get_object_or_404(WeeklyPlanEntry, id=entry_id)
+            entry = get_object_or_404(WeeklyPlanEntry, id=entry_id, plan__user=request.user)
             entry.day = new_day
             entry.save()
 
@@ -306,7 +335,7 @@ def weekly_plan_view(request):
     elif action == "remove":
         entry_id = params.get("entry_id")
         if entry_id:
-            entry = get_object_or_404(WeeklyPlanEntry, id=entry_id)
+            entry = get_object_or_404(WeeklyPlanEntry, id=entry_id, plan__user=request.user)
             entry.delete()
 
             # Filter behalten
@@ -316,23 +345,95 @@ def weekly_plan_view(request):
             return redirect(f"{reverse('recipes:weekly_plan')}?{params.urlencode()}")
     elif action == "clear":
         # Alle Einträge des aktuellen Wochenplans löschen
-        plan.entries.all().delete()
+        if plan is not None:
+            plan.entries.all().delete()
 
         # Filter behalten
         for key in ["action", "recipe_id", "day", "entry_id"]:
             params.pop(key, None)
 
         return redirect(f"{reverse('recipes:weekly_plan')}?{params.urlencode()}")
+    elif action == "copy_previous":
+        # Einträge der Vorwoche in diese Woche übernehmen
+        previous = WeeklyPlan.find(request.user, week_start - timedelta(weeks=1))
+        if previous is not None:
+            plan = plan or WeeklyPlan.for_week(request.user, week_start)
+            plan.copy_entries_from(previous)
 
-    # Tagesweise Einträge als Liste von Tupeln (Tag, Einträge)
-    day_entries_list = [(day_name, plan.entries.filter(day=day_name)) for day_name in DAYS]
+        for key in ["action", "recipe_id", "day", "entry_id"]:
+            params.pop(key, None)
+
+        return redirect(f"{reverse('recipes:weekly_plan')}?{params.urlencode()}")
+
+    # Tagesweise Einträge als Liste von Tupeln (Tag, Einträge) – eine Abfrage für alle Tage
+    entries_by_day = {day_name: [] for day_name in DAYS}
+    for entry in (plan.entries.select_related("recipe") if plan else []):
+        entries_by_day.setdefault(entry.day, []).append(entry)
+    day_entries_list = [(day_name, entries_by_day[day_name]) for day_name in DAYS]
 
     context = {
         "plan": plan,
         "day_entries_list": day_entries_list,
-        "recipes": Recipe.objects.all(),
         "days": DAYS,  # wichtig für das Dropdown in der Vorlage
+        "week_start": week_start,
+        "week_end": week_start + timedelta(days=6),
+        "previous_week": week_start - timedelta(weeks=1),
+        "next_week": week_start + timedelta(weeks=1),
+        "is_current_week": week_start == current_week_start(),
+    }
+    recently_planned = set(recently_planned_recipe_ids(request.user, weeks=8, until=week_start - timedelta(weeks=1)))
+    return render_streaming(
+        request, "recipes/weekly_plan.html", context,
+        recipe_options=lambda: iter_recipe_options(recently_planned),
+    )
+
+
+def iter_recipe_options(recently_planned, batch_size=200):
+    """``<option>``-Liste aller Rezepte für die Auswahl im Wochenplan, blockweise."""
+    recipes = Recipe.objects.only("id", "title").order_by("title").iterator(chunk_size=batch_size)
+    batch = []
+    for recipe in recipes:
+        note = " (kürzlich geplant)" if recipe.id in recently_planned else ""
+        batch.append(format_html('<option value="{}">{}{}</option>', recipe.id, recipe.title, note))
+        if len(batch) == batch_size:
+            yield "".join(batch)
+            batch = []
+    yield "".join(batch)
+
+
+def service_worker(request):
+    """Service Worker für den Kochmodus ohne Netz; liegt unter /recipes/, damit er dort gilt."""
+    shell = cook.shell_urls()
+    config = {
+        "version": hashlib.sha256("\n".join(shell).encode()).hexdigest()[:12],
+        "shell": shell,
+        "offline": reverse("recipes:api_cook_offline"),
+        "prefix": reverse("recipes:index"),
+        "static": settings.STATIC_URL,
+        "cdn": CDN,
     }
-    return render(request, "recipes/weekly_plan.html", context)
+    script = render_to_string("recipes/sw.js", {"config": mark_safe(json.dumps(config))})
+    response = HttpResponse(script, content_type="text/javascript; charset=utf-8")
+    # neue Versionen des Workers sofort bemerken
+    response["Cache-Control"] = "no-cache"
+    return response
 
 
+@staff_member_required
+def job_status_view(request):
+    counts = dict(Job.objects.values_list("status").annotate(n=Count("id")).order_by())
+    context = {
+        "status_counts": [(label, counts.get(status, 0)) for status, label in Job.STATUSES],
+        "jobs": Job.objects.all()[:50],
+    }
+    return render(request, "recipes/job_status.html", context)
+
+
+@login_required
+def export_view(request):
+    """ZIP mit allen (bzw. den gefilterten) Rezepten als statische HTML-Seiten."""
+    qs = filter_recipes(Recipe.objects.order_by("title"), request.GET, request.user)
+    response = streaming_response(request, export.iter_zip(qs), content_type="application/zip")
+    filename = f"rezepte-{date.today():%Y-%m-%d}.zip"
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return response